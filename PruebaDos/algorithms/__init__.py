@@ -1,9 +1,24 @@
 """
 Paquete de algoritmos de compresión
-Contiene implementaciones de Huffman y Shannon-Fano
+Contiene Huffman, Shannon-Fano, codificación por rango, LZ77, la transformación BWT
+y el registro de codificadores
 """
 
-from .huffman import HuffmanCoding, HuffmanNode
+from .huffman import HuffmanCoding, HuffmanNode, HuffmanTree
 from .shannon_fano import ShannonFanoCoding
+from .range_coder import RangeCoding
+from .transforms import BlockTransform
+from .lz77 import LZ77Coding
+from .file_codec import FileCodec
+from .async_api import AsyncCompressor
+from .static_tables import StaticCodeTable, get_static_table
+from .results import (EncodingResult, HuffmanResult, ShannonFanoResult, RangeCoderResult,
+                      LZ77Result)
+from .registry import (Codec, register_codec, get_codec, available_codecs, compare_codecs,
+                       release_results)
 
-__all__ = ['HuffmanCoding', 'HuffmanNode', 'ShannonFanoCoding']
+__all__ = ['HuffmanCoding', 'HuffmanNode', 'HuffmanTree', 'ShannonFanoCoding', 'RangeCoding',
+           'BlockTransform', 'LZ77Coding', 'FileCodec', 'AsyncCompressor', 'StaticCodeTable',
+           'get_static_table', 'EncodingResult', 'HuffmanResult', 'ShannonFanoResult',
+           'RangeCoderResult', 'LZ77Result', 'Codec', 'register_codec', 'get_codec',
+           'available_codecs', 'compare_codecs', 'release_results']
@@ -0,0 +1,126 @@
+"""
+Capa de Funcionalidad - API asíncrona
+Permite usar los compresores desde servicios asyncio sin bloquear el bucle de eventos
+"""
+
+import asyncio
+import atexit
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from .file_codec import FileCodec
+
+
+def _compress_worker(text, algorithm):
+    """Comprime con un codec nuevo en cada llamada (no hay estado compartido)"""
+    return FileCodec(algorithm=algorithm).compress_bytes(text)
+
+
+def _decompress_worker(data):
+    """Descomprime con un codec nuevo en cada llamada"""
+    return FileCodec().decompress_bytes(data)
+
+
+class AsyncCompressor:
+    """
+    Fachada asíncrona sobre FileCodec
+
+    El trabajo se delega a un pool acotado de procesos (o hilos). Un semáforo
+    limita las solicitudes en vuelo: cuando se alcanza el límite, las nuevas
+    llamadas esperan en lugar de acumularse en la cola del pool. El pool se
+    comparte entre bucles de eventos, pero cada bucle tiene su propio semáforo
+    (un asyncio.Semaphore queda ligado al primer bucle que lo usa).
+    """
+
+    def __init__(self, max_workers=None, max_pending=None, use_processes=True):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 2
+        self.use_processes = use_processes
+        self._executor = None
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    def _get_semaphore(self):
+        """Semáforo del bucle de eventos en ejecución (se crea la primera vez)"""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_pending)
+        return semaphore
+
+    def _get_executor(self):
+        """Crea el pool la primera vez que se necesita"""
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='compress')
+        return self._executor
+
+    async def _run(self, function, *args):
+        """Ejecuta una función en el pool respetando el límite de solicitudes"""
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), function, *args)
+
+    async def compress(self, data, algorithm='huffman'):
+        """
+        Comprime un texto sin bloquear el bucle de eventos
+
+        Args:
+            data (str | bytes): Texto a comprimir (los bytes se decodifican como UTF-8)
+            algorithm (str): 'huffman' o 'shannon_fano'
+
+        Returns:
+            bytes: Contenido comprimido en el formato de FileCodec
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode('utf-8')
+        if algorithm not in FileCodec.ALGORITHMS:
+            raise ValueError(f"Algoritmo desconocido: {algorithm}")
+        return await self._run(_compress_worker, data, algorithm)
+
+    async def decompress(self, data):
+        """Descomprime un contenido generado por compress()"""
+        return await self._run(_decompress_worker, bytes(data))
+
+    async def close(self):
+        """Libera el pool de trabajo sin bloquear el bucle de eventos"""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
+
+    def shutdown(self):
+        """Libera el pool de trabajo de forma sincrónica (fuera de un bucle de eventos)"""
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            executor.shutdown()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+
+_default_compressor = None
+
+
+def _get_default():
+    """Compresor compartido por las funciones de módulo (su pool se libera al salir)"""
+    global _default_compressor
+    if _default_compressor is None:
+        _default_compressor = AsyncCompressor()
+        atexit.register(_default_compressor.shutdown)
+    return _default_compressor
+
+
+async def compress(data, algorithm='huffman'):
+    """Comprime un texto usando el compresor asíncrono compartido"""
+    return await _get_default().compress(data, algorithm=algorithm)
+
+
+async def decompress(data):
+    """Descomprime un contenido usando el compresor asíncrono compartido"""
+    return await _get_default().decompress(data)
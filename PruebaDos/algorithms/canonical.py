@@ -0,0 +1,191 @@
+"""
+Capa de Funcionalidad - Códigos canónicos
+Reasigna códigos prefijo en forma canónica y los decodifica byte a byte
+"""
+
+
+def canonical_order(codes):
+    """
+    Ordena los símbolos para la asignación canónica
+
+    Args:
+        codes (dict): Símbolo -> código (solo importa la longitud)
+
+    Returns:
+        list: Tuplas (símbolo, longitud) ordenadas por (longitud, símbolo)
+    """
+    return sorted(((symbol, len(code)) for symbol, code in codes.items()),
+                  key=lambda item: (item[1], item[0]))
+
+
+def canonical_codes(lengths):
+    """
+    Asigna códigos canónicos a partir de las longitudes
+
+    Args:
+        lengths (list): Tuplas (símbolo, longitud) en orden canónico; es el
+            mismo orden en que se guardan en la cabecera, de modo que el
+            decodificador puede reconstruir los códigos sin comparar símbolos
+
+    Returns:
+        dict: Símbolo -> código canónico como cadena de bits
+    """
+    codes = {}
+    code = 0
+    previous_length = 0
+    for symbol, length in lengths:
+        code <<= (length - previous_length)
+        codes[symbol] = format(code, f'0{length}b')
+        code += 1
+        previous_length = length
+    return codes
+
+
+def pack_bits(bits):
+    """
+    Empaqueta una cadena de bits en bytes completos
+
+    Returns:
+        tuple: (bytes empaquetados, bits sobrantes que no completan un byte)
+    """
+    usable = len(bits) - (len(bits) % 8)
+    if usable == 0:
+        return b"", bits
+    packed = int(bits[:usable], 2).to_bytes(usable // 8, 'big')
+    return packed, bits[usable:]
+
+
+def pack_symbols(symbols, codes, chunk_size=65536):
+    """
+    Codifica y empaqueta una secuencia de símbolos por bloques
+
+    Evita construir la cadena de bits completa: como mucho existe la de un bloque.
+
+    Returns:
+        tuple: (bytes empaquetados con relleno de ceros, cantidad de bits útiles)
+    """
+    parts = []
+    pending = ""
+    for start in range(0, len(symbols), chunk_size):
+        bits = pending + "".join([codes[symbol] for symbol in symbols[start:start + chunk_size]])
+        packed, pending = pack_bits(bits)
+        parts.append(packed)
+    payload = b"".join(parts)
+    bit_length = len(payload) * 8 + len(pending)
+    if pending:
+        payload += pack_bits(pending.ljust(8, '0'))[0]
+    return payload, bit_length
+
+
+def unpack_bits(data, bit_length=None):
+    """Convierte bytes a cadena de bits, opcionalmente recortada a bit_length"""
+    if not data:
+        return ""
+    bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b')
+    return bits if bit_length is None else bits[:bit_length]
+
+
+class ByteDecoder:
+    """
+    Decodificador de códigos prefijo que consume un byte por paso
+
+    Los estados son los nodos internos del trie de códigos. La transición de
+    cada (estado, byte) se calcula la primera vez que aparece y se guarda, de
+    modo que el trabajo por byte queda en una consulta de diccionario.
+    """
+
+    def __init__(self, codes):
+        # Trie: hijos por bit (-1 si no existe) y símbolo en las hojas
+        self.zero = [-1]
+        self.one = [-1]
+        self.symbol = [None]
+        for symbol, code in codes.items():
+            node = 0
+            for bit in code:
+                children = self.zero if bit == '0' else self.one
+                if children[node] < 0:
+                    children[node] = len(self.symbol)
+                    self.zero.append(-1)
+                    self.one.append(-1)
+                    self.symbol.append(None)
+                node = children[node]
+            self.symbol[node] = symbol
+        self._transitions = {}
+
+    def _transition(self, state, byte):
+        """Recorre los 8 bits de un byte desde un estado"""
+        emitted = []
+        node = state
+        for shift in range(7, -1, -1):
+            node = self.one[node] if (byte >> shift) & 1 else self.zero[node]
+            if node < 0:
+                raise ValueError("Código inválido en la decodificación")
+            if self.symbol[node] is not None:
+                emitted.append(self.symbol[node])
+                node = 0
+        result = ("".join(emitted), node)
+        self._transitions[(state << 8) | byte] = result
+        return result
+
+    def decode(self, data, state=0):
+        """
+        Decodifica un bloque de bytes
+
+        Args:
+            data (bytes): Bytes a decodificar
+            state (int): Estado con el que terminó el bloque anterior
+
+        Returns:
+            tuple: (texto decodificado, estado final)
+        """
+        transitions = self._transitions
+        pieces = []
+        for byte in data:
+            key = (state << 8) | byte
+            entry = transitions.get(key)
+            if entry is None:
+                entry = self._transition(state, byte)
+            if entry[0]:
+                pieces.append(entry[0])
+            state = entry[1]
+        return "".join(pieces), state
+
+
+class CanonicalDecoder:
+    """
+    Decodificador de códigos canónicos por longitud
+
+    Con códigos canónicos, los de una misma longitud son enteros consecutivos:
+    basta conocer el primero y la cantidad de cada longitud para decodificar
+    sin árbol. A diferencia de ByteDecoder, admite símbolos de cualquier tipo.
+    """
+
+    def __init__(self, codes):
+        by_length = {}
+        for symbol, code in codes.items():
+            by_length.setdefault(len(code), []).append((int(code, 2), symbol))
+        self.max_length = max(by_length, default=0)
+        self.first = [0] * (self.max_length + 1)
+        self.symbols = [[] for _ in range(self.max_length + 1)]
+        for length, entries in by_length.items():
+            entries.sort()
+            self.first[length] = entries[0][0]
+            self.symbols[length] = [symbol for _, symbol in entries]
+
+    def decode_symbol(self, bits, position):
+        """
+        Lee un símbolo de una cadena de bits
+
+        Returns:
+            tuple: (símbolo, posición siguiente)
+        """
+        code = 0
+        for length in range(1, self.max_length + 1):
+            if position >= len(bits):
+                break
+            code = (code << 1) | (bits[position] == '1')
+            position += 1
+            index = code - self.first[length]
+            if 0 <= index < len(self.symbols[length]):
+                return self.symbols[length][index], position
+        raise ValueError("Código inválido en la decodificación")
@@ -0,0 +1,594 @@
+"""
+Capa de Funcionalidad - Archivos comprimidos
+Define el formato de archivo comprimido y lo lee y escribe por bloques
+"""
+
+import math
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.checkpoint import CheckpointFile
+from utils.shared_buffer import SharedBuffer
+from .canonical import ByteDecoder, canonical_codes, canonical_order, pack_bits, unpack_bits
+from .huffman import HuffmanCoding
+from .shannon_fano import ShannonFanoCoding
+
+# Decodificadores por tabla en cada proceso de trabajo (se arman una sola vez)
+_worker_decoders = {}
+
+
+def _decode_streams_worker(source, lengths, tasks):
+    """
+    Decodifica en un proceso de trabajo un lote de sub-flujos
+
+    Args:
+        source (tuple): ('file', ruta) o ('shm', nombre, tamaño) con los bytes comprimidos
+        lengths (tuple): Tabla canónica (símbolo, longitud)
+        tasks (list): (desplazamiento, bytes, símbolos) de cada sub-flujo
+
+    Returns:
+        list: Texto de cada sub-flujo, en el orden de tasks
+    """
+    decoder = _worker_decoders.get(lengths)
+    if decoder is None:
+        _worker_decoders.clear()
+        decoder = _worker_decoders[lengths] = ByteDecoder(canonical_codes(list(lengths)))
+
+    if source[0] == 'file':
+        with open(source[1], 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return [FileCodec._decode_stream(decoder, mm[offset:offset + size], count)
+                    for offset, size, count in tasks]
+
+    buffer = SharedBuffer.attach(*source[1:])
+    try:
+        view = buffer.view()
+        return [FileCodec._decode_stream(decoder, view[offset:offset + size], count)
+                for offset, size, count in tasks]
+    finally:
+        buffer.close()
+
+
+class FileCodec:
+    """
+    Compresor de archivos con códigos canónicos
+
+    Formato (enteros little-endian):
+        magic 'PDC1' | versión u8 | algoritmo u8 | flags u8 | reservado u8 |
+        cantidad de símbolos u64 | entradas de la tabla u32 |
+        por entrada: longitud del código u8, longitud UTF-8 u8, símbolo UTF-8 |
+        bits del mensaje empaquetados (el último byte se completa con ceros)
+
+    La tabla guarda solo las longitudes en orden canónico; los códigos se
+    reconstruyen con canonical_codes().
+
+    Con verify_rate > 0 los bloques se decodifican a partir de los bytes recién
+    escritos y se comparan por CRC32 con el texto original. Con 1.0 se verifican
+    todos; con valores menores, uno de cada 1/verify_rate bloques (siempre el
+    primero), de modo que el costo se reparte sin hacer una segunda pasada completa.
+
+    Con streams > 1 (flag FLAG_MULTISTREAM, cantidad de flujos en el byte
+    reservado) cada bloque se reparte en N sub-flujos intercalados: el símbolo
+    i del bloque va al sub-flujo i % N. Todos comparten la tabla de códigos y
+    cada uno se completa hasta el byte, así que se decodifican por separado.
+    Cada bloque empieza con su tabla de saltos:
+        símbolos del bloque u32 | bytes de cada sub-flujo u32 x N | sub-flujos
+    Con decode_workers > 1 los sub-flujos se reparten entre procesos.
+    """
+
+    MAGIC = b'PDC1'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBBBBQI')
+    ALGORITHMS = {'huffman': 0, 'shannon_fano': 1}
+    FLAG_MULTISTREAM = 1
+    MAX_STREAMS = 255
+
+    def __init__(self, algorithm='huffman', chunk_size=1 << 20, encoding='utf-8', verify_rate=0.0,
+                 streams=1, decode_workers=None):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Algoritmo desconocido: {algorithm}")
+        if not 0.0 <= verify_rate <= 1.0:
+            raise ValueError("verify_rate debe estar entre 0 y 1")
+        if not 1 <= streams <= self.MAX_STREAMS:
+            raise ValueError(f"streams debe estar entre 1 y {self.MAX_STREAMS}")
+        self.streams = streams
+        self.decode_workers = decode_workers
+        self.algorithm = algorithm
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.verify_rate = verify_rate
+        self.last_verification = None
+
+    def build_table(self, frequencies):
+        """Calcula la tabla canónica (símbolo, longitud) para unas frecuencias"""
+        if not frequencies:
+            return []
+        engine = HuffmanCoding() if self.algorithm == 'huffman' else ShannonFanoCoding()
+        return canonical_order(engine.build_codes(frequencies))
+
+    @staticmethod
+    def table_size(symbols):
+        """Bytes que ocupa la tabla de códigos en la cabecera para un alfabeto"""
+        return sum(2 + len(symbol.encode('utf-8')) for symbol in symbols)
+
+    def serialize_header(self, symbol_count, lengths, flags=0):
+        """Serializa la cabecera con la tabla de longitudes"""
+        streams = 0
+        if self.streams > 1:
+            flags |= self.FLAG_MULTISTREAM
+            streams = self.streams
+        parts = [self.HEADER.pack(self.MAGIC, self.VERSION, self.ALGORITHMS[self.algorithm],
+                                  flags, streams, symbol_count, len(lengths))]
+        for symbol, length in lengths:
+            raw = symbol.encode('utf-8')
+            parts.append(struct.pack('<BB', length, len(raw)))
+            parts.append(raw)
+        return b"".join(parts)
+
+    @classmethod
+    def parse_header(cls, buffer):
+        """
+        Lee la cabecera de un archivo comprimido
+
+        Args:
+            buffer: bytes, memoryview o mmap con el contenido del archivo
+
+        Returns:
+            dict: algorithm, flags, streams, symbol_count, lengths, payload_offset
+        """
+        if len(buffer) < cls.HEADER.size:
+            raise ValueError("Archivo comprimido inválido: cabecera incompleta")
+        magic, version, algorithm_id, flags, streams, symbol_count, entries = \
+            cls.HEADER.unpack_from(buffer, 0)
+        if magic != cls.MAGIC:
+            raise ValueError("Archivo comprimido inválido: firma desconocida")
+        if version != cls.VERSION:
+            raise ValueError(f"Versión de formato no soportada: {version}")
+        if not flags & cls.FLAG_MULTISTREAM:
+            streams = 1
+        elif streams < 1:
+            raise ValueError("Archivo comprimido inválido: cantidad de sub-flujos")
+
+        algorithms = {value: name for name, value in cls.ALGORITHMS.items()}
+        offset = cls.HEADER.size
+        lengths = []
+        for _ in range(entries):
+            length, size = struct.unpack_from('<BB', buffer, offset)
+            offset += 2
+            lengths.append((bytes(buffer[offset:offset + size]).decode('utf-8'), length))
+            offset += size
+
+        return {
+            'algorithm': algorithms.get(algorithm_id, 'unknown'),
+            'flags': flags,
+            'streams': streams,
+            'symbol_count': symbol_count,
+            'lengths': lengths,
+            'payload_offset': offset
+        }
+
+    def _encode_chunks(self, chunks, codes, write, start=0, pending="", on_block=None):
+        """
+        Codifica bloques de texto y escribe los bytes completos a medida que se generan
+
+        Args:
+            start (int): Índice del primer bloque (al reanudar un trabajo)
+            pending (str): Bits que quedaron sin escribir antes del primer bloque
+            on_block (callable): Se llama con (índice, bits pendientes) después de
+                escribir cada bloque
+
+        Returns:
+            dict | None: Resumen de la verificación (None si verify_rate es 0)
+        """
+        decoder = ByteDecoder(codes) if self.verify_rate > 0 and codes else None
+        report = None
+        if decoder is not None:
+            report = {'blocks': 0, 'verified_blocks': 0, 'verified_symbols': 0,
+                      'encode_seconds': 0.0, 'verify_seconds': 0.0}
+            started = time.perf_counter()
+
+        for index, chunk in enumerate(chunks, start):
+            if self.streams > 1:
+                block = self._encode_block(chunk, codes)
+                write(block)
+            else:
+                offset = len(pending)
+                bits = pending + "".join([codes[char] for char in chunk])
+                packed, pending = pack_bits(bits)
+                if packed:
+                    write(packed)
+            if decoder is not None:
+                report['blocks'] += 1
+                if self._should_verify(index):
+                    verify_start = time.perf_counter()
+                    if self.streams > 1:
+                        decoded, _ = self._decode_block(decoder, block, 0, self.streams)
+                        self._compare_crc(index, chunk, decoded)
+                    else:
+                        self._verify_block(decoder, index, chunk, packed, pending, offset)
+                    report['verify_seconds'] += time.perf_counter() - verify_start
+                    report['verified_blocks'] += 1
+                    report['verified_symbols'] += len(chunk)
+            if on_block is not None:
+                on_block(index, pending)
+        if pending:
+            write(pack_bits(pending.ljust(8, '0'))[0])
+
+        if report is not None:
+            total = time.perf_counter() - started
+            report['encode_seconds'] = total - report['verify_seconds']
+            report['overhead'] = (report['verify_seconds'] / report['encode_seconds']
+                                  if report['encode_seconds'] > 0 else 0.0)
+        self.last_verification = report
+        return report
+
+    def _should_verify(self, index):
+        """Indica si el bloque index entra en la muestra de verificación"""
+        rate = self.verify_rate
+        return math.ceil((index + 1) * rate) > math.ceil(index * rate)
+
+    def _verify_block(self, decoder, index, chunk, packed, pending, offset):
+        """
+        Decodifica un bloque a partir de los bytes escritos y compara su CRC32
+
+        Args:
+            packed (bytes): Bytes escritos para el bloque
+            pending (str): Bits del bloque que quedaron para el siguiente byte
+            offset (int): Bits del bloque anterior al comienzo de packed
+        """
+        bits = (unpack_bits(packed) + pending)[offset:]
+        data, _ = pack_bits(bits + '0' * (-len(bits) % 8))
+        decoded, _ = decoder.decode(data)
+        self._compare_crc(index, chunk, decoded)
+
+    @staticmethod
+    def _compare_crc(index, chunk, decoded):
+        """Compara el CRC32 de un bloque con el de su decodificación"""
+        expected = zlib.crc32(chunk.encode('utf-8', 'surrogatepass'))
+        actual = zlib.crc32(decoded[:len(chunk)].encode('utf-8', 'surrogatepass'))
+        if actual != expected:
+            raise ValueError(f"Verificación fallida en el bloque {index}: "
+                             f"CRC32 {actual:08x} != {expected:08x}")
+
+    def _encode_block(self, chunk, codes):
+        """Codifica un bloque en sub-flujos intercalados precedidos por su tabla de saltos"""
+        packed = []
+        for stream in range(self.streams):
+            bits = "".join([codes[char] for char in chunk[stream::self.streams]])
+            packed.append(pack_bits(bits + '0' * (-len(bits) % 8))[0])
+        jump = struct.pack(f'<I{self.streams}I', len(chunk), *map(len, packed))
+        return jump + b"".join(packed)
+
+    @staticmethod
+    def _block_layout(buffer, offset, streams):
+        """
+        Lee la tabla de saltos de un bloque con sub-flujos
+
+        Returns:
+            tuple: (símbolos del bloque, [(desplazamiento, bytes, símbolos)] por
+                   sub-flujo, desplazamiento del bloque siguiente)
+        """
+        jump = struct.Struct(f'<I{streams}I')
+        if offset + jump.size > len(buffer):
+            raise ValueError("Archivo comprimido truncado")
+        count, *sizes = jump.unpack_from(buffer, offset)
+        position = offset + jump.size
+        tasks = []
+        for stream, size in enumerate(sizes):
+            tasks.append((position, size, len(range(stream, count, streams))))
+            position += size
+        if position > len(buffer):
+            raise ValueError("Archivo comprimido truncado")
+        return count, tasks, position
+
+    @staticmethod
+    def _decode_stream(decoder, data, count):
+        """Decodifica un sub-flujo completo y descarta los símbolos del relleno"""
+        text, _ = decoder.decode(data)
+        if len(text) < count:
+            raise ValueError("Archivo comprimido truncado")
+        return text[:count]
+
+    @staticmethod
+    def _interleave(parts, count):
+        """Vuelve a intercalar los sub-flujos de un bloque"""
+        if len(parts) == 1:
+            return parts[0]
+        out = [""] * count
+        for stream, part in enumerate(parts):
+            out[stream::len(parts)] = part
+        return "".join(out)
+
+    @classmethod
+    def _decode_block(cls, decoder, buffer, offset, streams):
+        """Decodifica el bloque que empieza en offset; devuelve (texto, siguiente offset)"""
+        count, tasks, end = cls._block_layout(buffer, offset, streams)
+        parts = [cls._decode_stream(decoder, buffer[start:start + size], symbols)
+                 for start, size, symbols in tasks]
+        return cls._interleave(parts, count), end
+
+    def _iter_blocks(self, buffer, header, source=None):
+        """
+        Decodifica uno a uno los bloques con sub-flujos a partir de la cabecera
+
+        Entrega (texto, desplazamiento del bloque siguiente) por bloque, desde
+        header['payload_offset'] hasta completar header['symbol_count'].
+        Con decode_workers > 1 y un origen que los procesos puedan abrir (source,
+        ver _decode_streams_worker), los sub-flujos de todos los bloques se
+        reparten en lotes entre procesos; los bloques se entregan en orden.
+        """
+        streams = header['streams']
+        layouts = []
+        offset = header['payload_offset']
+        remaining = header['symbol_count']
+        while remaining > 0:
+            count, tasks, offset = self._block_layout(buffer, offset, streams)
+            if count == 0:
+                raise ValueError("Archivo comprimido inválido: bloque vacío")
+            layouts.append((count, tasks, offset))
+            remaining -= count
+
+        workers = self.decode_workers or 1
+        if workers <= 1 or source is None or not layouts:
+            decoder = ByteDecoder(canonical_codes(header['lengths']))
+            for count, tasks, end in layouts:
+                parts = [self._decode_stream(decoder, buffer[start:start + size], symbols)
+                         for start, size, symbols in tasks]
+                yield self._interleave(parts, count), end
+            return
+
+        # Lotes de tamaño parecido en bytes, varios por proceso para repartir la carga
+        tasks = [task for _, block_tasks, _ in layouts for task in block_tasks]
+        target = max(1, sum(size for _, size, _ in tasks) // (workers * 4))
+        batches = [[]]
+        batch_bytes = 0
+        for task in tasks:
+            if batch_bytes >= target:
+                batches.append([])
+                batch_bytes = 0
+            batches[-1].append(task)
+            batch_bytes += task[1]
+
+        lengths = tuple(header['lengths'])
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as pool:
+            results = pool.map(_decode_streams_worker, [source] * len(batches),
+                               [lengths] * len(batches), batches)
+            decoded = (part for batch in results for part in batch)
+            for count, block_tasks, end in layouts:
+                yield self._interleave([next(decoded) for _ in block_tasks], count), end
+
+    def _read_chunks(self, path, position=None):
+        """
+        Lee un archivo de texto en bloques de chunk_size caracteres
+
+        Yields:
+            tuple: (bloque, posición de lectura tras el bloque), donde la posición
+                   sirve como position para seguir leyendo desde ese punto
+        """
+        with open(path, 'r', encoding=self.encoding, newline='') as f:
+            if position is not None:
+                f.seek(position)
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield chunk, f.tell()
+
+    def compress_bytes(self, text):
+        """
+        Comprime un texto en memoria y devuelve el contenido del archivo
+
+        Si verify_rate > 0, el resumen de la verificación queda en last_verification.
+        """
+        frequencies = Counter(text)
+        lengths = self.build_table(frequencies)
+        parts = [self.serialize_header(len(text), lengths)]
+        chunks = (text[i:i + self.chunk_size] for i in range(0, len(text), self.chunk_size))
+        self._encode_chunks(chunks, canonical_codes(lengths), parts.append)
+        return b"".join(parts)
+
+    def decompress_bytes(self, data):
+        """Descomprime el contenido de un archivo comprimido en memoria"""
+        header = self.parse_header(data)
+        if header['streams'] > 1:
+            if (self.decode_workers or 1) <= 1:
+                return "".join(text for text, _ in self._iter_blocks(memoryview(data), header))
+            # Los procesos leen los sub-flujos de memoria compartida, sin copiarlos
+            with SharedBuffer.create(data) as buffer:
+                blocks = self._iter_blocks(memoryview(data), header, ('shm',) + buffer.descriptor())
+                return "".join(text for text, _ in blocks)
+
+        decoder = ByteDecoder(canonical_codes(header['lengths']))
+        payload = memoryview(data)[header['payload_offset']:]
+        text, _ = decoder.decode(payload)
+        if len(text) < header['symbol_count']:
+            raise ValueError("Archivo comprimido truncado")
+        return text[:header['symbol_count']]
+
+    def compress_file(self, src, dst, checkpoint=None):
+        """
+        Comprime un archivo de texto en dos pasadas por bloques
+
+        La primera pasada cuenta frecuencias y la segunda codifica, de modo que
+        la memoria usada no depende del tamaño del archivo.
+
+        Con checkpoint, después de cada bloque se guarda en ese archivo el
+        progreso (frecuencias parciales en la primera pasada; tabla, bloque,
+        posición de entrada, bytes de salida y bits pendientes en la segunda).
+        Si al empezar hay un punto de control del mismo trabajo, se reanuda
+        desde ahí y el resultado es idéntico al de una ejecución sin cortes.
+
+        Returns:
+            dict: Tamaños de entrada, cabecera y salida (y 'verification' si
+                verify_rate > 0, 'resumed_block' si se reanudó la codificación)
+        """
+        store = CheckpointFile(checkpoint) if checkpoint else None
+        identity = None
+        state = None
+        if store is not None:
+            identity = CheckpointFile.identity(
+                src, mode='compress', algorithm=self.algorithm, chunk_size=self.chunk_size,
+                streams=self.streams, encoding=self.encoding)
+            state = store.load(identity)
+            if state is not None and state['stage'] == 'encode' and \
+                    not self._output_reaches(dst, state['output_offset']):
+                state = None
+
+        resumed_block = None
+        if state is None or state['stage'] == 'count':
+            frequencies = Counter(state['frequencies'] if state else {})
+            for chunk, position in self._read_chunks(src, state and state['input_offset']):
+                frequencies.update(chunk)
+                if store is not None:
+                    store.save(identity, {'stage': 'count', 'input_offset': position,
+                                          'frequencies': dict(frequencies)})
+
+            lengths = self.build_table(frequencies)
+            symbol_count = sum(frequencies.values())
+            header = self.serialize_header(symbol_count, lengths)
+            with open(dst, 'wb') as out:
+                out.write(header)
+                self._commit(out)
+            state = {'stage': 'encode', 'symbol_count': symbol_count, 'lengths': lengths,
+                     'block': 0, 'input_offset': None, 'output_offset': len(header),
+                     'pending': ""}
+            if store is not None:
+                store.save(identity, state)
+        else:
+            lengths = [tuple(entry) for entry in state['lengths']]
+            symbol_count = state['symbol_count']
+            header = self.serialize_header(symbol_count, lengths)
+            resumed_block = state['block']
+
+        with open(dst, 'r+b') as out:
+            # Lo escrito después del último punto de control se descarta y se rehace
+            out.truncate(state['output_offset'])
+            out.seek(state['output_offset'])
+            reader = self._read_chunks(src, state['input_offset'])
+            progress = {'input_offset': state['input_offset']}
+
+            def chunks():
+                for chunk, position in reader:
+                    progress['input_offset'] = position
+                    yield chunk
+
+            def on_block(index, pending):
+                self._commit(out)
+                store.save(identity, {'stage': 'encode', 'symbol_count': symbol_count,
+                                      'lengths': lengths, 'block': index + 1,
+                                      'input_offset': progress['input_offset'],
+                                      'output_offset': out.tell(), 'pending': pending})
+
+            verification = self._encode_chunks(chunks(), canonical_codes(lengths), out.write,
+                                               start=state['block'], pending=state['pending'],
+                                               on_block=on_block if store is not None else None)
+            output_bytes = out.tell()
+
+        if store is not None:
+            store.clear()
+
+        info = {
+            'symbols': symbol_count,
+            'header_bytes': len(header),
+            'payload_bytes': output_bytes - len(header),
+            'output_bytes': output_bytes
+        }
+        if verification is not None:
+            info['verification'] = verification
+        if resumed_block is not None:
+            info['resumed_block'] = resumed_block
+        return info
+
+    def decompress_file(self, src, dst, checkpoint=None):
+        """
+        Descomprime un archivo mapeándolo en memoria y escribiendo por bloques
+
+        El archivo comprimido se lee con mmap de a chunk_size bytes y el texto
+        se escribe en cuanto se decodifica, así que el pico de memoria depende
+        del tamaño de bloque y no del tamaño original.
+
+        Con checkpoint, después de cada bloque se guarda la posición de lectura,
+        el estado del decodificador, los símbolos restantes y los bytes de
+        salida, y un trabajo interrumpido se reanuda desde el último bloque.
+
+        Returns:
+            dict: Cantidad de símbolos escritos y tamaño comprimido
+        """
+        store = CheckpointFile(checkpoint) if checkpoint else None
+        identity = None
+        state = None
+        if store is not None:
+            identity = CheckpointFile.identity(src, mode='decompress', encoding=self.encoding)
+            state = store.load(identity)
+            if state is not None and not self._output_reaches(dst, state['output_offset']):
+                state = None
+
+        with open(src, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            header = self.parse_header(mm)
+            if state is None:
+                state = {'offset': header['payload_offset'], 'decoder_state': 0,
+                         'remaining': header['symbol_count'], 'output_offset': 0}
+            else:
+                os.truncate(dst, state['output_offset'])
+            offset = state['offset']
+            remaining = state['remaining']
+            decoder_state = state['decoder_state']
+
+            with open(dst, 'a' if state['output_offset'] else 'w',
+                      encoding=self.encoding, newline='') as out:
+
+                def on_block():
+                    if store is not None:
+                        self._commit(out)
+                        store.save(identity, {'offset': offset, 'decoder_state': decoder_state,
+                                              'remaining': remaining,
+                                              'output_offset': out.tell()})
+
+                if header['streams'] > 1:
+                    pending = dict(header, payload_offset=offset, symbol_count=remaining)
+                    for text, offset in self._iter_blocks(mm, pending, ('file', src)):
+                        out.write(text)
+                        remaining -= len(text)
+                        on_block()
+                else:
+                    decoder = ByteDecoder(canonical_codes(header['lengths']))
+                    while remaining > 0 and offset < len(mm):
+                        chunk = mm[offset:offset + self.chunk_size]
+                        offset += len(chunk)
+                        text, decoder_state = decoder.decode(chunk, decoder_state)
+                        if len(text) > remaining:
+                            # Los bits de relleno del último byte pueden generar símbolos extra
+                            text = text[:remaining]
+                        out.write(text)
+                        remaining -= len(text)
+                        on_block()
+
+            if remaining:
+                raise ValueError("Archivo comprimido truncado")
+            if store is not None:
+                store.clear()
+
+            return {
+                'symbols': header['symbol_count'],
+                'input_bytes': len(mm)
+            }
+
+    @staticmethod
+    def _commit(out):
+        """Asegura en disco lo escrito antes de guardar un punto de control"""
+        out.flush()
+        os.fsync(out.fileno())
+
+    @staticmethod
+    def _output_reaches(path, size):
+        """Indica si la salida de un trabajo interrumpido conserva al menos size bytes"""
+        try:
+            return os.path.getsize(path) >= size
+        except OSError:
+            return False
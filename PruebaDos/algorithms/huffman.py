@@ -3,12 +3,16 @@ Capa de Funcionalidad - Algoritmo de Huffman
 Implementa la codificación y decodificación usando el algoritmo de Huffman
 """
 
-import heapq
-from collections import defaultdict, Counter
+from array import array
 from utils.frequency_calculator import FrequencyCalculator
+from utils.profiler import PhaseTimer
+from .canonical import pack_bits, pack_symbols
+from .results import HuffmanResult
 
 class HuffmanNode:
-    """Nodo del árbol de Huffman"""
+    """Nodo del árbol de Huffman (el codificador usa la forma compacta HuffmanTree)"""
+    __slots__ = ('char', 'freq', 'left', 'right')
+    
     def __init__(self, char=None, freq=0, left=None, right=None):
         self.char = char
         self.freq = freq
@@ -16,7 +20,11 @@ class HuffmanNode:
         self.right = right
         
     def __lt__(self, other):
-        return self.freq < other.freq
+        # Desempate estable, el mismo de build_tree_sorted: a igual frecuencia,
+        # las hojas primero (por carácter) y luego los nodos internos
+        if self.freq != other.freq:
+            return self.freq < other.freq
+        return (self.char is None, self.char or '') < (other.char is None, other.char or '')
     
     def __eq__(self, other):
         if other is None:
@@ -25,177 +33,302 @@ class HuffmanNode:
             return False
         return self.freq == other.freq
 
+class HuffmanTree:
+    """
+    Árbol de Huffman almacenado en arreglos paralelos
+    
+    Cada nodo es un índice entero. En las hojas left/right valen -1 y symbol es
+    el índice del carácter en alphabet; en los nodos internos symbol vale -1.
+    """
+    __slots__ = ('left', 'right', 'symbol', 'freq', 'alphabet', 'root')
+    
+    def __init__(self):
+        self.left = array('l')
+        self.right = array('l')
+        self.symbol = array('l')
+        self.freq = array('q')
+        self.alphabet = []
+        self.root = -1
+        
+    def __len__(self):
+        return len(self.freq)
+        
+    def add_leaf(self, char, freq):
+        """Agrega una hoja y devuelve su índice"""
+        self.symbol.append(len(self.alphabet))
+        self.alphabet.append(char)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.freq.append(freq)
+        return len(self.freq) - 1
+        
+    def add_internal(self, left, right):
+        """Agrega un nodo interno que une dos nodos y devuelve su índice"""
+        self.symbol.append(-1)
+        self.left.append(left)
+        self.right.append(right)
+        self.freq.append(self.freq[left] + self.freq[right])
+        return len(self.freq) - 1
+        
+    def is_leaf(self, node):
+        """Indica si el nodo es una hoja"""
+        return self.symbol[node] >= 0
+        
+    def char(self, node):
+        """Carácter de una hoja (None para nodos internos)"""
+        index = self.symbol[node]
+        return self.alphabet[index] if index >= 0 else None
+        
+    def iter_preorder(self):
+        """Recorre el árbol en preorden sin recursión: (nodo, profundidad, camino)"""
+        if self.root < 0:
+            return
+        left, right = self.left, self.right
+        stack = [(self.root, 0, "")]
+        while stack:
+            node, depth, path = stack.pop()
+            yield node, depth, path
+            if left[node] >= 0:
+                # Se apila primero el hijo derecho para visitar antes el izquierdo
+                stack.append((right[node], depth + 1, path + "1"))
+                stack.append((left[node], depth + 1, path + "0"))
+
 class HuffmanCoding:
     """Implementación del algoritmo de Huffman"""
     
     def __init__(self):
-        self.root = None
+        self.tree = None
         self.codes = {}
         self.reverse_codes = {}
         
     def build_tree(self, frequencies):
-        """Construye el árbol de Huffman usando cola de prioridad"""
+        """
+        Construye el árbol de Huffman de forma determinista
+        
+        Las hojas se ordenan por (frecuencia, símbolo), de modo que los empates
+        se resuelven siempre igual sin depender del orden del diccionario ni de
+        la versión de Python. Luego se combinan con dos colas en tiempo lineal.
+        """
         if not frequencies:
+            self.tree = None
             return None
-            
-        # Caso especial: solo un carácter
-        if len(frequencies) == 1:
-            char, freq = list(frequencies.items())[0]
-            self.root = HuffmanNode(char, freq)
-            return self.root
-        
-        # Crear heap con nodos hoja
-        heap = []
-        for char, freq in frequencies.items():
-            node = HuffmanNode(char, freq)
-            heapq.heappush(heap, node)
-            
-        # Construir árbol combinando nodos
-        while len(heap) > 1:
-            # Tomar los dos nodos con menor frecuencia
-            left = heapq.heappop(heap)
-            right = heapq.heappop(heap)
-            
-            # Crear nodo interno
-            merged_freq = left.freq + right.freq
-            merged = HuffmanNode(freq=merged_freq, left=left, right=right)
-            
-            # Agregar de vuelta al heap
-            heapq.heappush(heap, merged)
-            
-        self.root = heap[0] if heap else None
-        return self.root
         
-    def generate_codes(self, node=None, code=""):
-        """Genera los códigos de Huffman recursivamente"""
-        if node is None:
-            node = self.root
-            
-        if node is None:
-            return
+        sorted_frequencies = sorted(frequencies.items(), key=lambda item: (item[1], item[0]))
+        return self.build_tree_sorted(sorted_frequencies)
         
-        # Caso especial: árbol con un solo nodo (un carácter)
-        if node.char is not None and node.left is None and node.right is None:
-            self.codes[node.char] = "0"  # Asignar código "0" para un solo carácter
-            self.reverse_codes["0"] = node.char
-            return
-            
-        # Si es nodo hoja (tiene carácter)
-        if node.char is not None:
-            self.codes[node.char] = code
-            self.reverse_codes[code] = node.char
+    def build_tree_sorted(self, sorted_frequencies):
+        """
+        Construye el árbol en O(n) con dos colas a partir de frecuencias ya ordenadas
+        
+        Args:
+            sorted_frequencies (list): Tuplas (símbolo, frecuencia) en orden ascendente
+                de frecuencia; el orden dado es el criterio de desempate
+                
+        Returns:
+            HuffmanTree: Árbol construido (también queda en self.tree)
+        """
+        if not sorted_frequencies:
+            self.tree = None
+            return None
+        
+        tree = HuffmanTree()
+        for char, freq in sorted_frequencies:
+            tree.add_leaf(char, freq)
+        
+        # Cola 1: hojas (índices 0..n-1). Cola 2: nodos internos, que se crean
+        # con frecuencias no decrecientes (índices n en adelante).
+        freq = tree.freq
+        leaf_count = len(tree)
+        next_leaf = 0
+        next_merged = leaf_count
+        
+        while (leaf_count - next_leaf) + (len(tree) - next_merged) > 1:
+            children = []
+            for _ in range(2):
+                # Ante empate se toma la hoja, lo que minimiza la profundidad
+                if next_leaf < leaf_count and (next_merged >= len(tree) or
+                                               freq[next_leaf] <= freq[next_merged]):
+                    children.append(next_leaf)
+                    next_leaf += 1
+                else:
+                    children.append(next_merged)
+                    next_merged += 1
+            tree.add_internal(children[0], children[1])
+        
+        # Caso especial: con un solo carácter la raíz es la única hoja
+        tree.root = len(tree) - 1
+        self.tree = tree
+        return tree
+        
+    def generate_codes(self):
+        """Genera los códigos de Huffman recorriendo el árbol compacto"""
+        tree = self.tree
+        if tree is None:
             return
-            
-        # Recursión para nodos internos
-        if node.left is not None:
-            self.generate_codes(node.left, code + "0")
-        if node.right is not None:
-            self.generate_codes(node.right, code + "1")
-        
-    def encode(self, text):
-        """Codifica el texto usando Huffman"""
+        
+        for node, depth, path in tree.iter_preorder():
+            if tree.is_leaf(node):
+                # Un árbol de una sola hoja usa el código "0"
+                code = path or "0"
+                char = tree.char(node)
+                self.codes[char] = code
+                self.reverse_codes[code] = char
+        
+    def build_codes(self, frequencies):
+        """Construye el árbol y devuelve los códigos para una tabla de frecuencias"""
+        self.build_tree(frequencies)
+        self.codes = {}
+        self.reverse_codes = {}
+        self.generate_codes()
+        return self.codes
+        
+    def encode(self, text, timer=None, static_table=None, frequencies=None):
+        """
+        Codifica el texto usando Huffman
+        
+        Args:
+            text (str): Texto a codificar
+            timer (PhaseTimer): Temporizador donde acumular las fases (opcional)
+            static_table (str | StaticCodeTable): Tabla preentrenada a usar en lugar
+                de construir un árbol
+            frequencies (dict): Frecuencias ya calculadas del texto (se comparten
+                entre codificadores y no se modifican)
+        """
         if not text:
             return None
+        
+        if timer is None:
+            timer = PhaseTimer()
+        
+        if static_table is not None:
+            return self._encode_static(text, static_table, timer, frequencies)
             
         # Calcular frecuencias
-        freq_calc = FrequencyCalculator()
-        frequencies = freq_calc.calculate_frequencies(text)
+        if frequencies is None:
+            with timer.phase('frequencies'):
+                freq_calc = FrequencyCalculator()
+                frequencies = freq_calc.calculate_frequencies(text)
         
         # Construir árbol
-        self.build_tree(frequencies)
+        with timer.phase('build_tree'):
+            self.build_tree(frequencies)
         
         # Limpiar códigos anteriores
         self.codes = {}
         self.reverse_codes = {}
         
         # Generar códigos
-        self.generate_codes()
+        with timer.phase('generate_codes'):
+            self.generate_codes()
         
         # Verificar que se generaron códigos
         if not self.codes:
             raise ValueError("No se pudieron generar códigos de Huffman")
         
-        # Codificar texto
-        encoded_text = ""
-        for char in text:
-            if char in self.codes:
-                encoded_text += self.codes[char]
-            else:
-                raise ValueError(f"Carácter '{char}' no encontrado en códigos")
+        # Codificar texto (empaquetado por bloques, sin la cadena de bits completa)
+        with timer.phase('encoding'):
+            try:
+                payload, bit_length = pack_symbols(text, self.codes)
+            except KeyError as e:
+                raise ValueError(f"Carácter '{e.args[0]}' no encontrado en códigos")
             
-        return {
-            'original_text': text,
-            'encoded_text': encoded_text,
-            'frequencies': frequencies,
-            'codes': self.codes.copy(),
-            'reverse_codes': self.reverse_codes.copy(),
-            'tree': self.root,
-            'algorithm': 'Huffman'
-        }
-        
-    def decode(self, encoded_text, root=None):
-        """Decodifica el texto usando el árbol de Huffman"""
-        if root is None:
-            root = self.root
+        return HuffmanResult(text, frequencies, self.codes, payload, bit_length, self.tree,
+                             timings=dict(timer.phases))
+        
+    def _encode_static(self, text, static_table, timer, frequencies=None):
+        """Codifica con una tabla estática (sin frecuencias ni árbol)"""
+        from .static_tables import get_static_table
+        
+        table = get_static_table(static_table)
+        
+        # Los códigos son la vista de solo lectura de la tabla en caché (sin copiarla);
+        # si no llegan frecuencias, el resultado las cuenta solo cuando se piden
+        self.tree = None
+        self.codes = table.view
+        self.reverse_codes = table.reverse_codes
+        
+        with timer.phase('encoding'):
+            bits = table.encode(text)
+            payload = pack_bits(bits + '0' * (-len(bits) % 8))[0]
+        
+        return HuffmanResult(text, frequencies, table.view, payload, len(bits), None,
+                             static_table=table.name, timings=dict(timer.phases))
+        
+    def decode(self, encoded_text, tree=None, static_table=None):
+        """Decodifica el texto usando el árbol de Huffman o una tabla estática"""
+        if static_table is not None:
+            from .static_tables import get_static_table
+            return get_static_table(static_table).decode(encoded_text)
+        
+        if tree is None:
+            tree = self.tree
             
-        if not encoded_text or root is None:
+        if not encoded_text or tree is None:
             return ""
         
+        root = tree.root
+        
         # Caso especial: árbol con un solo nodo
-        if root.char is not None and root.left is None and root.right is None:
+        if tree.is_leaf(root):
             # Cada bit representa el mismo carácter
-            return root.char * len(encoded_text)
-            
-        decoded_text = ""
+            return tree.char(root) * len(encoded_text)
+        
+        left, right, symbol, alphabet = tree.left, tree.right, tree.symbol, tree.alphabet
+        decoded_chars = []
         current = root
         
         for bit in encoded_text:
             if bit == "0":
-                current = current.left
+                current = left[current]
             elif bit == "1":
-                current = current.right
+                current = right[current]
             else:
                 raise ValueError(f"Bit inválido: {bit}")
                 
             # Si llegamos a una hoja
-            if current is None:
-                raise ValueError("Código inválido en la decodificación")
-                
-            if current.char is not None:
-                decoded_text += current.char
+            index = symbol[current]
+            if index >= 0:
+                decoded_chars.append(alphabet[index])
                 current = root
                 
-        return decoded_text
+        return "".join(decoded_chars)
     
-    def get_tree_info(self):
-        """Obtiene información detallada del árbol para visualización"""
-        if not self.root:
-            return None
+    def iter_tree_info(self, tree=None):
+        """
+        Recorre el árbol en preorden sin recursión y devuelve la información de cada nodo
         
-        def traverse_tree(node, depth=0, path=""):
-            if not node:
-                return []
-            
-            info = {
+        Args:
+            tree (HuffmanTree): Árbol a recorrer (por defecto, el último construido)
+        """
+        if tree is None:
+            tree = self.tree
+        if not tree:
+            return
+        
+        left, right = tree.left, tree.right
+        stack = [(tree.root, -1, 0, "")]
+        while stack:
+            node, parent, depth, path = stack.pop()
+            char = tree.char(node)
+            yield {
                 'depth': depth,
-                'char': node.char,
-                'freq': node.freq,
-                'is_leaf': node.char is not None,
-                'id': id(node),
+                'char': char,
+                'freq': tree.freq[node],
+                'is_leaf': char is not None,
+                'id': node,
+                'parent': parent,
                 'path': path,
-                'code': self.codes.get(node.char, "") if node.char else ""
+                'code': self.codes.get(char, "") if char is not None else ""
             }
-            
-            result = [info]
-            
-            if node.left:
-                result.extend(traverse_tree(node.left, depth + 1, path + "0"))
-            if node.right:
-                result.extend(traverse_tree(node.right, depth + 1, path + "1"))
-            
-            return result
-        
-        return traverse_tree(self.root)
+            if left[node] >= 0:
+                stack.append((right[node], node, depth + 1, path + "1"))
+                stack.append((left[node], node, depth + 1, path + "0"))
+    
+    def get_tree_info(self):
+        """Obtiene información detallada del árbol para visualización"""
+        if not self.tree:
+            return None
+        return list(self.iter_tree_info())
     
     def print_codes(self):
         """Imprime los códigos generados (para debugging)"""
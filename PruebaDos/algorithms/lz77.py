@@ -0,0 +1,364 @@
+"""
+Capa de Funcionalidad - LZ77 con Huffman
+Búsqueda de coincidencias con cadenas hash y tablas canónicas separadas (estilo deflate)
+"""
+
+import struct
+from array import array
+
+from utils.frequency_calculator import FrequencyCalculator
+from utils.profiler import PhaseTimer
+from .canonical import CanonicalDecoder, canonical_codes, canonical_order, pack_bits, unpack_bits
+from .huffman import HuffmanCoding
+from .results import LZ77Result
+
+MIN_MATCH = 3
+MAX_MATCH = 258
+
+# Nivel -> (posiciones revisadas por cadena, longitud suficiente, búsqueda perezosa)
+LEVELS = {
+    1: (4, 8, False),
+    2: (8, 16, False),
+    3: (32, 32, False),
+    4: (16, 16, True),
+    5: (32, 32, True),
+    6: (128, 128, True),
+    7: (256, MAX_MATCH, True),
+    8: (1024, MAX_MATCH, True),
+    9: (4096, MAX_MATCH, True),
+}
+
+# Los símbolos de la tabla de literales son enteros: el punto de código de cada
+# carácter, o END_OF_BLOCK y los códigos de longitud por encima de Unicode
+END_OF_BLOCK = 0x110000
+LENGTH_BASE = END_OF_BLOCK + 1
+
+
+def bucket(value):
+    """
+    Código, bits extra y valor extra de un entero >= 1 (como las distancias de deflate)
+
+    Los valores 1-4 tienen código propio; a partir de ahí cada par de códigos
+    cubre el doble de valores que el anterior.
+    """
+    value -= 1
+    if value < 4:
+        return value, 0, 0
+    bits = value.bit_length()
+    extra = bits - 2
+    return 2 * bits - 2 + ((value >> extra) & 1), extra, value & ((1 << extra) - 1)
+
+
+def bucket_base(code):
+    """Valor mínimo y bits extra de un código de bucket()"""
+    if code < 4:
+        return code + 1, 0
+    extra = code // 2 - 1
+    return ((2 | (code & 1)) << extra) + 1, extra
+
+
+def _match_length(text, older, newer, limit):
+    """Longitud del prefijo común entre text[older:] y text[newer:], hasta limit"""
+    length = 0
+    step = 32
+    while length + step <= limit and \
+            text[older + length:older + length + step] == text[newer + length:newer + length + step]:
+        length += step
+    while length < limit and text[older + length] == text[newer + length]:
+        length += 1
+    return length
+
+
+class LZ77Coding:
+    """
+    LZ77 con cadenas hash y codificación Huffman de los tokens
+
+    Cada posición se indexa por sus MIN_MATCH primeros caracteres; head guarda
+    la última aparición de cada clave y prev enlaza con la anterior, de modo
+    que las candidatas se recorren de la más cercana a la más lejana hasta
+    salir de la ventana o agotar el límite del nivel. Con búsqueda perezosa
+    se prueba también la posición siguiente antes de aceptar una coincidencia.
+
+    Literales y longitudes comparten una tabla y las distancias usan otra;
+    ambas son canónicas. Formato serializado (enteros little-endian):
+        magic 'LZH1' | versión u8 | nivel u8 | ventana u32 | caracteres u64 |
+        entradas de literales u32 | entradas de distancias u32 |
+        por literal: longitud del código u8, longitud UTF-8 u8 (0 si es un
+        código de longitud o el fin de bloque, seguido de su índice u8), símbolo |
+        por distancia: longitud del código u8, código u8 | bits empaquetados
+    """
+
+    MAGIC = b'LZH1'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBBIQII')
+
+    def __init__(self, level=6, window_size=32768):
+        if level not in LEVELS:
+            raise ValueError(f"Nivel de compresión inválido: {level} (1-9)")
+        if window_size < 1:
+            raise ValueError("window_size debe ser positivo")
+        self.level = level
+        self.window_size = window_size
+
+    def _find_match(self, text, position, head, prev, max_chain, nice_length):
+        """Mejor coincidencia (longitud, distancia) para position, o (0, 0)"""
+        limit = min(MAX_MATCH, len(text) - position)
+        best_length = 0
+        best_distance = 0
+        if limit < MIN_MATCH:
+            return best_length, best_distance
+        candidate = head.get(text[position:position + MIN_MATCH], -1)
+        chain = max_chain
+        while candidate >= 0 and chain:
+            distance = position - candidate
+            if distance > self.window_size:
+                break
+            # Descarte rápido: debe superar a la mejor en su último carácter
+            if text[candidate + best_length] == text[position + best_length]:
+                length = _match_length(text, candidate, position, limit)
+                if length > best_length:
+                    best_length = length
+                    best_distance = distance
+                    if length >= nice_length or length == limit:
+                        break
+            candidate = prev[candidate]
+            chain -= 1
+        if best_length < MIN_MATCH:
+            return 0, 0
+        return best_length, best_distance
+
+    def tokenize(self, text):
+        """
+        Divide el texto en literales y coincidencias
+
+        Returns:
+            list: Caracteres (literales) y tuplas (longitud, distancia)
+        """
+        max_chain, nice_length, lazy = LEVELS[self.level]
+        head = {}
+        prev = array('q', [-1]) * len(text)
+
+        def insert(position):
+            key = text[position:position + MIN_MATCH]
+            if len(key) == MIN_MATCH:
+                prev[position] = head.get(key, -1)
+                head[key] = position
+
+        tokens = []
+        position = 0
+        while position < len(text):
+            length, distance = self._find_match(text, position, head, prev, max_chain,
+                                                nice_length)
+            insert(position)
+            if length and lazy and length < nice_length and position + 1 < len(text):
+                next_length, next_distance = self._find_match(text, position + 1, head, prev,
+                                                              max_chain, nice_length)
+                if next_length > length:
+                    # Conviene emitir un literal y tomar la coincidencia siguiente
+                    tokens.append(text[position])
+                    position += 1
+                    length, distance = next_length, next_distance
+                    insert(position)
+            if not length:
+                tokens.append(text[position])
+                position += 1
+                continue
+            tokens.append((length, distance))
+            for inner in range(position + 1, position + length):
+                insert(inner)
+            position += length
+        return tokens
+
+    @staticmethod
+    def _build_table(frequencies):
+        """Códigos canónicos de Huffman para unas frecuencias de símbolos"""
+        if not frequencies:
+            return {}
+        return canonical_codes(canonical_order(HuffmanCoding().build_codes(frequencies)))
+
+    def encode(self, text, timer=None, frequencies=None):
+        """
+        Codifica un texto con LZ77 y Huffman
+
+        Args:
+            text (str): Texto a codificar
+            timer (PhaseTimer): Temporizador donde acumular las fases (opcional)
+            frequencies (dict): Frecuencias ya calculadas del texto (opcional; solo
+                se usan para las estadísticas)
+
+        Returns:
+            LZ77Result: Resultado con el mensaje empaquetado y ambas tablas
+        """
+        if timer is None:
+            timer = PhaseTimer()
+
+        with timer.phase('frequencies'):
+            if frequencies is None:
+                frequencies = FrequencyCalculator.calculate_frequencies(text)
+
+        with timer.phase('match_finding'):
+            tokens = self.tokenize(text)
+
+        with timer.phase('generate_codes'):
+            literal_counts = {END_OF_BLOCK: 1}
+            distance_counts = {}
+            for token in tokens:
+                if isinstance(token, str):
+                    symbol = ord(token)
+                    literal_counts[symbol] = literal_counts.get(symbol, 0) + 1
+                    continue
+                symbol = LENGTH_BASE + bucket(token[0] - MIN_MATCH + 1)[0]
+                literal_counts[symbol] = literal_counts.get(symbol, 0) + 1
+                code = bucket(token[1])[0]
+                distance_counts[code] = distance_counts.get(code, 0) + 1
+            literal_codes = self._build_table(literal_counts)
+            distance_codes = self._build_table(distance_counts)
+
+        with timer.phase('encoding'):
+            payload, bit_length = self._pack(tokens, literal_codes, distance_codes)
+
+        matches = sum(1 for token in tokens if not isinstance(token, str))
+        return LZ77Result(text, frequencies, payload, bit_length, literal_codes, distance_codes,
+                          self.level, self.window_size, matches=matches,
+                          literals=len(tokens) - matches, timings=dict(timer.phases))
+
+    @staticmethod
+    def _pack(tokens, literal_codes, distance_codes, chunk_size=65536):
+        """Escribe los tokens con sus bits extra; empaqueta por bloques como pack_symbols"""
+        parts = []
+        pieces = []
+        pending = ""
+        for token in tokens:
+            if isinstance(token, str):
+                pieces.append(literal_codes[ord(token)])
+            else:
+                code, extra, value = bucket(token[0] - MIN_MATCH + 1)
+                pieces.append(literal_codes[LENGTH_BASE + code])
+                if extra:
+                    pieces.append(format(value, f'0{extra}b'))
+                code, extra, value = bucket(token[1])
+                pieces.append(distance_codes[code])
+                if extra:
+                    pieces.append(format(value, f'0{extra}b'))
+            if len(pieces) >= chunk_size:
+                packed, pending = pack_bits(pending + "".join(pieces))
+                parts.append(packed)
+                pieces = []
+        pieces.append(literal_codes[END_OF_BLOCK])
+        packed, pending = pack_bits(pending + "".join(pieces))
+        parts.append(packed)
+
+        payload = b"".join(parts)
+        bit_length = len(payload) * 8 + len(pending)
+        if pending:
+            payload += pack_bits(pending.ljust(8, '0'))[0]
+        return payload, bit_length
+
+    @staticmethod
+    def decode(payload, bit_length, literal_codes, distance_codes):
+        """
+        Decodifica el mensaje de encode()
+
+        Args:
+            payload (bytes): Bits empaquetados
+            bit_length (int): Cantidad de bits útiles
+            literal_codes (dict): Tabla de literales y longitudes
+            distance_codes (dict): Tabla de distancias
+
+        Returns:
+            str: Texto decodificado
+        """
+        bits = unpack_bits(payload, bit_length)
+        literals = CanonicalDecoder(literal_codes)
+        distances = CanonicalDecoder(distance_codes)
+        out = []
+        position = 0
+        while True:
+            symbol, position = literals.decode_symbol(bits, position)
+            if symbol < END_OF_BLOCK:
+                out.append(chr(symbol))
+                continue
+            if symbol == END_OF_BLOCK:
+                return "".join(out)
+
+            base, extra = bucket_base(symbol - LENGTH_BASE)
+            length = base + MIN_MATCH - 1
+            if extra:
+                length += int(bits[position:position + extra], 2)
+                position += extra
+            code, position = distances.decode_symbol(bits, position)
+            distance, extra = bucket_base(code)
+            if extra:
+                distance += int(bits[position:position + extra], 2)
+                position += extra
+
+            start = len(out) - distance
+            if start < 0:
+                raise ValueError("Distancia fuera del texto decodificado")
+            if distance >= length:
+                out.extend(out[start:start + length])
+            else:
+                # Coincidencia solapada: se copia carácter a carácter
+                for index in range(start, start + length):
+                    out.append(out[index])
+
+    @classmethod
+    def table_size(cls, literal_codes, distance_codes):
+        """Bytes que ocupan ambas tablas en la cabecera"""
+        size = 2 * len(distance_codes)
+        for symbol in literal_codes:
+            size += 2 + (len(chr(symbol).encode('utf-8', 'surrogatepass'))
+                         if symbol < END_OF_BLOCK else 1)
+        return size
+
+    def to_bytes(self, results):
+        """Serializa un resultado de encode() con su cabecera y sus tablas"""
+        literal_codes = results['literal_codes']
+        distance_codes = results['distance_codes']
+        parts = [self.HEADER.pack(self.MAGIC, self.VERSION, results['level'],
+                                  results['window_size'], len(results['original_text']),
+                                  len(literal_codes), len(distance_codes))]
+        for symbol, length in canonical_order(literal_codes):
+            if symbol < END_OF_BLOCK:
+                raw = chr(symbol).encode('utf-8', 'surrogatepass')
+                parts.append(struct.pack('<BB', length, len(raw)) + raw)
+            else:
+                parts.append(struct.pack('<BBB', length, 0, symbol - END_OF_BLOCK))
+        for code, length in canonical_order(distance_codes):
+            parts.append(struct.pack('<BB', length, code))
+        parts.append(results.payload)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decodifica bytes generados por to_bytes()"""
+        if len(data) < cls.HEADER.size:
+            raise ValueError("Datos demasiado cortos para la cabecera")
+        magic, version, _, _, _, literal_entries, distance_entries = \
+            cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError("Formato de archivo no reconocido")
+        if version != cls.VERSION:
+            raise ValueError(f"Versión no soportada: {version}")
+
+        offset = cls.HEADER.size
+        literal_lengths = []
+        for _ in range(literal_entries):
+            length, size = struct.unpack_from('<BB', data, offset)
+            offset += 2
+            if size:
+                symbol = ord(bytes(data[offset:offset + size]).decode('utf-8', 'surrogatepass'))
+                offset += size
+            else:
+                symbol = END_OF_BLOCK + data[offset]
+                offset += 1
+            literal_lengths.append((symbol, length))
+        distance_lengths = []
+        for _ in range(distance_entries):
+            length, code = struct.unpack_from('<BB', data, offset)
+            offset += 2
+            distance_lengths.append((code, length))
+
+        payload = bytes(data[offset:])
+        return cls.decode(payload, len(payload) * 8, canonical_codes(literal_lengths),
+                          canonical_codes(distance_lengths))
@@ -0,0 +1,352 @@
+"""
+Capa de Funcionalidad - Codificación por rango
+Codificador aritmético con aritmética entera de 32 bits y salida en bytes
+"""
+
+import struct
+from bisect import bisect_right
+
+from utils.frequency_calculator import FrequencyCalculator
+from utils.profiler import PhaseTimer
+from .results import RangeCoderResult
+
+MASK32 = 0xFFFFFFFF
+# El rango se renormaliza (se emite un byte) cuando baja de 2^24
+TOP = 1 << 24
+# Total del modelo estático; se escalan las frecuencias si lo superan
+MODEL_BITS = 16
+# Modelo adaptativo: incremento por símbolo visto y total máximo antes de reescalar
+ADAPTIVE_INCREMENT = 24
+ADAPTIVE_LIMIT = 1 << 16
+
+
+class _RangeEncoder:
+    """Codificador por rango con propagación de acarreo (estilo LZMA)"""
+
+    __slots__ = ('low', 'range', 'cache', 'cache_size', 'out')
+
+    def __init__(self):
+        self.low = 0
+        self.range = MASK32
+        self.cache = 0
+        self.cache_size = 1
+        self.out = bytearray()
+
+    def encode(self, start, size, total):
+        r = self.range // total
+        self.low += r * start
+        self.range = r * size
+        while self.range < TOP:
+            self.range <<= 8
+            self._shift_low()
+
+    def _shift_low(self):
+        low = self.low
+        if low < 0xFF000000 or low > MASK32:
+            # El byte pendiente ya es definitivo: se emite junto con los 0xFF retenidos
+            carry = low >> 32
+            self.out.append((self.cache + carry) & 0xFF)
+            self.out.extend(((0xFF + carry) & 0xFF,) * (self.cache_size - 1))
+            self.cache_size = 0
+            self.cache = (low >> 24) & 0xFF
+        self.cache_size += 1
+        self.low = (low & 0x00FFFFFF) << 8
+
+    def finish(self):
+        """Vacía el estado y devuelve los bytes (sin el primero, que siempre es 0)"""
+        for _ in range(5):
+            self._shift_low()
+        # El decodificador completa con ceros, así que los ceros finales sobran
+        return bytes(self.out[1:]).rstrip(b"\0")
+
+
+class _RangeDecoder:
+    """Decodificador complementario de _RangeEncoder"""
+
+    __slots__ = ('data', 'pos', 'range', 'code', 'r')
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 4
+        self.range = MASK32
+        self.code = int.from_bytes(bytes(data[:4]).ljust(4, b'\0'), 'big')
+        self.r = 1
+
+    def value(self, total):
+        """Frecuencia acumulada en la que cae el código actual"""
+        self.r = self.range // total
+        return min(self.code // self.r, total - 1)
+
+    def consume(self, start, size):
+        """Descarta el intervalo del símbolo decodificado"""
+        self.code -= self.r * start
+        self.range = self.r * size
+        while self.range < TOP:
+            byte = self.data[self.pos] if self.pos < len(self.data) else 0
+            self.pos += 1
+            self.code = ((self.code << 8) | byte) & MASK32
+            self.range <<= 8
+
+
+class _AdaptiveModel:
+    """
+    Modelo de frecuencias adaptativo
+
+    Empieza con frecuencia 1 por símbolo y suma ADAPTIVE_INCREMENT a cada
+    símbolo visto; al superar ADAPTIVE_LIMIT divide todo por dos. Las
+    frecuencias acumuladas se mantienen en un árbol de Fenwick.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.frequencies = [1] * size
+        self._rebuild()
+
+    def _rebuild(self):
+        tree = [0] * (self.size + 1)
+        for index, freq in enumerate(self.frequencies, 1):
+            tree[index] += freq
+            parent = index + (index & -index)
+            if parent <= self.size:
+                tree[parent] += tree[index]
+        self.tree = tree
+        self.total = sum(self.frequencies)
+        self._step = 1 << (self.size.bit_length() - 1) if self.size else 0
+
+    def start(self, index):
+        """Frecuencia acumulada de los símbolos anteriores a index"""
+        tree = self.tree
+        total = 0
+        while index > 0:
+            total += tree[index]
+            index -= index & -index
+        return total
+
+    def find(self, value):
+        """Índice del símbolo cuyo intervalo contiene value y el inicio de ese intervalo"""
+        tree = self.tree
+        index = 0
+        start = 0
+        step = self._step
+        while step:
+            candidate = index + step
+            if candidate <= self.size and start + tree[candidate] <= value:
+                index = candidate
+                start += tree[candidate]
+            step >>= 1
+        return index, start
+
+    def update(self, index):
+        """Suma el incremento al símbolo index y reescala si hace falta"""
+        self.frequencies[index] += ADAPTIVE_INCREMENT
+        self.total += ADAPTIVE_INCREMENT
+        if self.total > ADAPTIVE_LIMIT:
+            self.frequencies = [(freq + 1) // 2 for freq in self.frequencies]
+            self._rebuild()
+            return
+        tree = self.tree
+        position = index + 1
+        while position <= self.size:
+            tree[position] += ADAPTIVE_INCREMENT
+            position += position & -position
+
+
+class RangeCoding:
+    """
+    Codificador por rango (codificación aritmética entera)
+
+    Con el modelo estático se usan las frecuencias de FrequencyCalculator,
+    escaladas a un total de 2^MODEL_BITS si lo superan, de modo que el
+    mensaje ocupa casi exactamente la entropía del texto. Con adaptive=True
+    el modelo se aprende mientras se codifica y solo se transmite el alfabeto.
+
+    Formato serializado (enteros little-endian):
+        magic 'RNG1' | versión u8 | flags u8 (bit 0: adaptativo) |
+        cantidad de símbolos u64 | entradas del modelo u32 |
+        por entrada: frecuencia - 1 u16 (solo modelo estático), longitud UTF-8 u8,
+        símbolo UTF-8 | bytes del codificador
+    """
+
+    MAGIC = b'RNG1'
+    VERSION = 1
+    HEADER = struct.Struct('<4sBBQI')
+    FLAG_ADAPTIVE = 1
+
+    def __init__(self, adaptive=False):
+        self.adaptive = adaptive
+
+    @staticmethod
+    def build_model(frequencies, model_bits=MODEL_BITS):
+        """
+        Modelo estático: lista de (símbolo, frecuencia) con total <= 2^model_bits
+
+        Las frecuencias se escalan proporcionalmente (cada símbolo conserva al
+        menos 1) y el exceso de redondeo se descuenta de los más frecuentes.
+        """
+        model = sorted(frequencies.items())
+        limit = 1 << model_bits
+        if len(model) > limit:
+            raise ValueError(f"El alfabeto supera los {limit} símbolos del modelo")
+        total = sum(freq for _, freq in model)
+        if total <= limit:
+            return model
+
+        scaled = {symbol: max(1, freq * limit // total) for symbol, freq in model}
+        excess = sum(scaled.values()) - limit
+        for symbol in sorted(scaled, key=scaled.get, reverse=True):
+            if excess <= 0:
+                break
+            cut = min(excess, scaled[symbol] - 1)
+            scaled[symbol] -= cut
+            excess -= cut
+        return [(symbol, scaled[symbol]) for symbol, _ in model]
+
+    @staticmethod
+    def table_size(model, adaptive=False):
+        """Bytes que ocupa el modelo en la cabecera"""
+        entry = 1 if adaptive else 3
+        return sum(entry + len(symbol.encode('utf-8')) for symbol, _ in model)
+
+    def encode(self, text, timer=None, frequencies=None):
+        """
+        Codifica un texto
+
+        Args:
+            text (str): Texto a codificar
+            timer (PhaseTimer): Temporizador donde acumular las fases (opcional)
+            frequencies (dict): Frecuencias ya calculadas del texto (opcional)
+
+        Returns:
+            RangeCoderResult: Resultado con el mensaje en bytes y el modelo
+        """
+        if timer is None:
+            timer = PhaseTimer()
+
+        with timer.phase('frequencies'):
+            if frequencies is None:
+                frequencies = FrequencyCalculator.calculate_frequencies(text)
+
+        with timer.phase('model'):
+            if self.adaptive:
+                model = [(symbol, 1) for symbol in sorted(frequencies)]
+            else:
+                model = self.build_model(frequencies)
+
+        with timer.phase('encoding'):
+            if self.adaptive:
+                payload = self._encode_adaptive(text, model)
+            else:
+                payload = self._encode_static(text, model)
+
+        return RangeCoderResult(text, frequencies, payload, model, self.adaptive,
+                                timings=dict(timer.phases))
+
+    @staticmethod
+    def _encode_static(text, model):
+        total = 0
+        intervals = {}
+        for symbol, freq in model:
+            intervals[symbol] = (total, freq)
+            total += freq
+
+        encoder = _RangeEncoder()
+        encode = encoder.encode
+        for char in text:
+            start, size = intervals[char]
+            encode(start, size, total)
+        return encoder.finish()
+
+    @staticmethod
+    def _encode_adaptive(text, model):
+        indices = {symbol: index for index, (symbol, _) in enumerate(model)}
+        adaptive = _AdaptiveModel(len(model))
+
+        encoder = _RangeEncoder()
+        for char in text:
+            index = indices[char]
+            encoder.encode(adaptive.start(index), adaptive.frequencies[index], adaptive.total)
+            adaptive.update(index)
+        return encoder.finish()
+
+    def decode(self, data, model, symbol_count):
+        """
+        Decodifica los bytes de encode()
+
+        Args:
+            data (bytes): Bytes del codificador (payload del resultado)
+            model (list): Modelo (símbolo, frecuencia) usado al codificar
+            symbol_count (int): Cantidad de símbolos del texto original
+
+        Returns:
+            str: Texto decodificado
+        """
+        if symbol_count == 0:
+            return ""
+        decoder = _RangeDecoder(data)
+        symbols = [symbol for symbol, _ in model]
+        out = []
+        append = out.append
+
+        if self.adaptive:
+            adaptive = _AdaptiveModel(len(model))
+            for _ in range(symbol_count):
+                index, start = adaptive.find(decoder.value(adaptive.total))
+                decoder.consume(start, adaptive.frequencies[index])
+                adaptive.update(index)
+                append(symbols[index])
+            return "".join(out)
+
+        starts = []
+        sizes = []
+        total = 0
+        for _, freq in model:
+            starts.append(total)
+            sizes.append(freq)
+            total += freq
+        value = decoder.value
+        consume = decoder.consume
+        for _ in range(symbol_count):
+            index = bisect_right(starts, value(total)) - 1
+            consume(starts[index], sizes[index])
+            append(symbols[index])
+        return "".join(out)
+
+    def to_bytes(self, results):
+        """Serializa un resultado de encode() con su cabecera y su modelo"""
+        model = results['model']
+        flags = self.FLAG_ADAPTIVE if self.adaptive else 0
+        parts = [self.HEADER.pack(self.MAGIC, self.VERSION, flags,
+                                  len(results['original_text']), len(model))]
+        for symbol, freq in model:
+            raw = symbol.encode('utf-8')
+            if not self.adaptive:
+                parts.append(struct.pack('<H', freq - 1))
+            parts.append(struct.pack('<B', len(raw)))
+            parts.append(raw)
+        parts.append(results.payload)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decodifica bytes generados por to_bytes()"""
+        if len(data) < cls.HEADER.size:
+            raise ValueError("Datos demasiado cortos para la cabecera")
+        magic, version, flags, symbol_count, entries = cls.HEADER.unpack_from(data, 0)
+        if magic != cls.MAGIC:
+            raise ValueError("Formato de archivo no reconocido")
+        if version != cls.VERSION:
+            raise ValueError(f"Versión no soportada: {version}")
+
+        coder = cls(adaptive=bool(flags & cls.FLAG_ADAPTIVE))
+        offset = cls.HEADER.size
+        model = []
+        for _ in range(entries):
+            freq = 1
+            if not coder.adaptive:
+                freq = struct.unpack_from('<H', data, offset)[0] + 1
+                offset += 2
+            size = data[offset]
+            offset += 1
+            model.append((bytes(data[offset:offset + size]).decode('utf-8'), freq))
+            offset += size
+        return coder.decode(memoryview(data)[offset:], model, symbol_count)
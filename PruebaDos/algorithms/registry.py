@@ -0,0 +1,467 @@
+"""
+Capa de Funcionalidad - Registro de codificadores
+Interfaz común para los codificadores y comparación de varios sobre el mismo texto
+"""
+
+import abc
+import inspect
+import multiprocessing
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from utils.frequency_calculator import FrequencyCalculator
+from utils.profiler import PhaseTimer
+from utils.shared_buffer import SharedBuffer
+from utils.statistics import StatisticsCalculator
+
+from .file_codec import FileCodec
+from .huffman import HuffmanCoding
+from .lz77 import LZ77Coding
+from .range_coder import RangeCoding
+from .shannon_fano import ShannonFanoCoding
+from .transforms import BlockTransform
+
+_CODECS = {}
+
+# Desde este tamaño (caracteres) compare_codecs usa procesos en lugar de hilos
+PROCESS_THRESHOLD = 1 << 20
+
+
+def register_codec(cls):
+    """Registra una clase de codificador bajo su atributo name (usable como decorador)"""
+    if not cls.name:
+        raise ValueError("El codificador debe definir name")
+    if inspect.isabstract(cls):
+        missing = ", ".join(sorted(cls.__abstractmethods__))
+        raise TypeError(f"El codificador {cls.name} no implementa: {missing}")
+    _CODECS[cls.name] = cls
+    return cls
+
+
+def get_codec(name):
+    """Crea una instancia del codificador registrado con ese nombre"""
+    try:
+        return _CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Codificador desconocido: {name}") from None
+
+
+def available_codecs():
+    """Nombres de los codificadores registrados, en orden de registro"""
+    return list(_CODECS)
+
+
+class Codec(abc.ABC):
+    """
+    Interfaz común de un codificador
+
+    Las subclases definen name (clave del registro), label (nombre visible) y
+    encode/decode. encode recibe las frecuencias ya calculadas para que varios
+    codificadores compartan la misma tabla.
+    """
+
+    name = None
+    label = None
+    has_tree = False
+    # False si no codifica símbolo a símbolo con un modelo fijo (sin eficiencia comparable)
+    per_symbol = True
+
+    @abc.abstractmethod
+    def encode(self, text, frequencies=None, timer=None):
+        """Codifica un texto y devuelve su resultado (acceso tipo diccionario)"""
+
+    @abc.abstractmethod
+    def decode(self, results):
+        """Recupera el texto original a partir de un resultado de encode()"""
+
+    def statistics(self, results, original_bytes=None):
+        """Estadísticas de compresión de un resultado"""
+        return StatisticsCalculator().calculate_statistics(
+            results['original_text'], results['frequencies'], results['codes'], original_bytes
+        )
+
+    def export_tree(self, results, filename):
+        """
+        Exporta el árbol de codificación a SVG o DOT (según la extensión)
+
+        Raises:
+            ValueError: Si el codificador no tiene árbol (has_tree es False)
+        """
+        raise ValueError(f"{self.label} no tiene árbol de codificación")
+
+    def tree_figure(self, results):
+        """Figura de matplotlib con el árbol de codificación (None si no tiene)"""
+        return None
+
+    def tree_layout(self, results):
+        """Disposición en caché del árbol de codificación (None si no tiene, ver TreeVisualizer)"""
+        return None
+
+
+@register_codec
+class HuffmanCodec(Codec):
+    name = 'huffman'
+    label = 'Huffman'
+    has_tree = True
+
+    def encode(self, text, frequencies=None, timer=None):
+        return HuffmanCoding().encode(text, timer=timer, frequencies=frequencies)
+
+    def decode(self, results):
+        return HuffmanCoding().decode(results['encoded_text'], tree=results['tree'])
+
+    def export_tree(self, results, filename):
+        from utils.tree_exporter import TreeExporter
+        TreeExporter().export_huffman(results, filename)
+
+    def tree_figure(self, results):
+        if not results.get('tree'):
+            return None
+        from utils.tree_visualizer import TreeVisualizer
+        return TreeVisualizer().visualize_huffman_tree(results['tree'])
+
+    def tree_layout(self, results):
+        if not results.get('tree'):
+            return None
+        from utils.tree_visualizer import TreeVisualizer
+        return TreeVisualizer().huffman_layout(results['tree'])
+
+
+@register_codec
+class ShannonFanoCodec(Codec):
+    name = 'shannon_fano'
+    label = 'Shannon-Fano'
+    has_tree = True
+
+    def encode(self, text, frequencies=None, timer=None):
+        return ShannonFanoCoding().encode(text, timer=timer, frequencies=frequencies)
+
+    def decode(self, results):
+        return ShannonFanoCoding().decode(results['encoded_text'], results['codes'])
+
+    def export_tree(self, results, filename):
+        from utils.tree_exporter import TreeExporter
+        TreeExporter().export_shannon_fano(results, filename)
+
+    def tree_figure(self, results):
+        from utils.tree_visualizer import TreeVisualizer
+        return TreeVisualizer().visualize_shannon_fano_tree(results)
+
+    def tree_layout(self, results):
+        if not results.get('codes'):
+            return None
+        from utils.tree_visualizer import TreeVisualizer
+        return TreeVisualizer().shannon_fano_layout(results['codes'])
+
+
+@register_codec
+class RangeCodec(Codec):
+    name = 'range'
+    label = 'Rango'
+    adaptive = False
+
+    def encode(self, text, frequencies=None, timer=None):
+        return RangeCoding(self.adaptive).encode(text, timer=timer, frequencies=frequencies)
+
+    def decode(self, results):
+        return RangeCoding(self.adaptive).decode(results.payload, results['model'],
+                                                 len(results['original_text']))
+
+    def statistics(self, results, original_bytes=None):
+        # Sin tabla de códigos: se mide el mensaje real y el modelo serializado
+        return StatisticsCalculator().calculate_stream_statistics(
+            results['original_text'], results['frequencies'], len(results.payload) * 8,
+            RangeCoding.table_size(results['model'], self.adaptive), RangeCoding.HEADER.size,
+            original_bytes, per_symbol=self.per_symbol
+        )
+
+
+@register_codec
+class AdaptiveRangeCodec(RangeCodec):
+    name = 'range_adaptive'
+    label = 'Rango adaptativo'
+    adaptive = True
+    per_symbol = False
+
+
+@register_codec
+class LZ77Codec(Codec):
+    name = 'lz77'
+    label = 'LZ77+Huffman'
+    level = 6
+    window_size = 32768
+    per_symbol = False
+
+    def encode(self, text, frequencies=None, timer=None):
+        return LZ77Coding(self.level, self.window_size).encode(text, timer=timer,
+                                                                frequencies=frequencies)
+
+    def decode(self, results):
+        return LZ77Coding.decode(results.payload, results.bit_length, results['literal_codes'],
+                                 results['distance_codes'])
+
+    def statistics(self, results, original_bytes=None):
+        # Longitud promedio por carácter de entrada: puede quedar por debajo de la entropía
+        return StatisticsCalculator().calculate_stream_statistics(
+            results['original_text'], results['frequencies'], results.bit_length,
+            LZ77Coding.table_size(results['literal_codes'], results['distance_codes']),
+            LZ77Coding.HEADER.size, original_bytes, per_symbol=self.per_symbol
+        )
+
+
+class TransformCodec(Codec):
+    """
+    Codificador interno precedido por la transformación BWT -> MTF -> RLE
+
+    El resultado es el del codificador interno sobre los símbolos
+    transformados, con los metadatos de cada bloque en 'transform_blocks' y
+    una referencia al texto original en 'source_text'.
+    """
+
+    inner = None
+    block_size = 1 << 16
+
+    def encode(self, text, frequencies=None, timer=None):
+        if timer is None:
+            timer = PhaseTimer()
+        with timer.phase('transform'):
+            transformed, blocks = BlockTransform(self.block_size).forward(text)
+        # Las frecuencias del texto no sirven: se cuentan las de los símbolos transformados
+        results = get_codec(self.inner).encode(transformed, timer=timer)
+        results.algorithm = self.label
+        results['transform_blocks'] = blocks
+        results['source_text'] = text
+        return results
+
+    def decode(self, results):
+        transformed = get_codec(self.inner).decode(results)
+        return BlockTransform.inverse(transformed, results['transform_blocks'])
+
+    def statistics(self, results, original_bytes=None):
+        blocks = results['transform_blocks']
+        if original_bytes is None:
+            original_bytes = StatisticsCalculator.encoded_size(results['source_text'])
+        stats = StatisticsCalculator().calculate_stream_statistics(
+            results['original_text'], results['frequencies'], results.bit_length,
+            FileCodec.table_size(results['codes']) + BlockTransform.metadata_size(blocks),
+            FileCodec.HEADER.size, original_bytes
+        )
+        # Los caracteres son los del texto original, no los símbolos transformados
+        stats['total_chars'] = len(results['source_text'])
+        stats['transformed_symbols'] = len(results['original_text'])
+        stats['entropy_before'] = sum(block['entropy_before'] for block in blocks)
+        stats['entropy_after'] = sum(block['entropy_after'] for block in blocks)
+        stats['transform_blocks'] = blocks
+        return stats
+
+
+@register_codec
+class BWTHuffmanCodec(TransformCodec):
+    name = 'bwt_huffman'
+    label = 'BWT+Huffman'
+    inner = 'huffman'
+
+
+@register_codec
+class BWTShannonFanoCodec(TransformCodec):
+    name = 'bwt_shannon_fano'
+    label = 'BWT+Shannon-Fano'
+    inner = 'shannon_fano'
+
+
+def _run_codec(codec, text, frequencies, original_bytes, trace_memory=False):
+    """Codifica con un temporizador propio y calcula las estadísticas del resultado"""
+    codec_timer = PhaseTimer(trace_memory=trace_memory)
+    codec_timer.start()
+    try:
+        results = codec.encode(text, frequencies=frequencies, timer=codec_timer)
+        with codec_timer.phase('statistics'):
+            results['statistics'] = codec.statistics(results, original_bytes)
+    finally:
+        codec_timer.stop()
+    return results, codec_timer
+
+
+# Canal de los procesos de trabajo de compare_codecs: cola donde se anuncian los
+# bloques de salida y un evento por codificador con el que el proceso principal
+# confirma que ya los abrió
+_output_channel = None
+
+
+def _init_output_channel(ready, acks):
+    global _output_channel
+    _output_channel = (ready, acks)
+
+
+def _encode_shared(name, source, frequencies, original_bytes, trace_memory=False):
+    """
+    Codifica en un proceso de trabajo leyendo el texto de memoria compartida
+
+    El mensaje empaquetado se escribe en un bloque compartido nuevo, que se
+    anuncia por la cola del canal y se mantiene abierto hasta que el proceso
+    principal confirma que lo abrió: en Windows el bloque desaparece cuando se
+    cierra su último handle. Al proceso principal vuelven además los metadatos (códigos,
+    estadísticas, tiempos y memoria por fase). Las claves que referencian el texto de entrada se
+    quitan antes de devolver el resultado y el proceso principal las repone.
+    original_text solo se quita si es el texto de entrada: en TransformCodec
+    son los símbolos transformados y viajan con el resultado.
+    """
+    buffer = SharedBuffer.attach(*source)
+    try:
+        text = buffer.read_text()
+    finally:
+        buffer.close()
+
+    results, codec_timer = _run_codec(get_codec(name), text, frequencies, original_bytes,
+                                      trace_memory)
+
+    output = SharedBuffer.create(results.payload)
+    try:
+        ready, acks = _output_channel
+        ready.put((name, output.descriptor()))
+        acks[name].wait()
+    finally:
+        output.close()
+    results.payload = b""
+    restore_text = results.original_text is text
+    if restore_text:
+        results.original_text = None
+    text_keys = [key for key, value in results._extras.items() if value is text]
+    for key in text_keys:
+        del results[key]
+    return results, codec_timer, text_keys, restore_text
+
+
+def release_results(results):
+    """
+    Libera la memoria compartida de los resultados de compare_codecs()
+
+    Libera la memoria sin esperar a que se descarten los resultados; después
+    de llamarla los mensajes codificados ya no se pueden leer.
+    """
+    for item in results.values():
+        buffer = item.get('shared_buffer')
+        if buffer is not None:
+            item.payload = b""
+            buffer.close()
+
+
+def compare_codecs(text, names=None, timer=None, max_workers=None, use_processes=None):
+    """
+    Codifica un texto con varios codificadores a la vez
+
+    Las frecuencias y el tamaño original se calculan una sola vez y se
+    comparten (solo lectura) entre los trabajadores. Cada codificador mide
+    sus fases en un temporizador propio que luego se suma a timer con el
+    nombre del codificador como prefijo.
+
+    Con procesos, el texto se pasa por memoria compartida y cada mensaje
+    codificado vuelve en su propio bloque compartido: el resultado lo expone
+    como memoryview sin copiarlo y guarda el bloque en 'shared_buffer'. El
+    bloque se libera al descartar el resultado o antes, con release_results().
+
+    Args:
+        text (str): Texto a codificar
+        names (list): Codificadores a ejecutar (por defecto, todos los registrados)
+        timer (PhaseTimer): Temporizador donde acumular las fases (opcional)
+        max_workers (int): Trabajadores (por defecto, uno por codificador)
+        use_processes (bool): Usar procesos en lugar de hilos (por defecto, solo
+            para textos de al menos PROCESS_THRESHOLD caracteres)
+
+    Returns:
+        dict: Nombre -> resultado, con 'statistics' ya calculado, en el orden de names
+    """
+    names = list(names or available_codecs())
+    codecs = {name: get_codec(name) for name in names}
+    if timer is None:
+        timer = PhaseTimer()
+    if use_processes is None:
+        use_processes = len(text) >= PROCESS_THRESHOLD
+
+    with timer.phase('frequencies'):
+        frequencies = FrequencyCalculator.calculate_frequencies(text)
+        original_bytes = StatisticsCalculator.encoded_size(text)
+
+    workers = max_workers or len(names) or 1
+    trace_memory = timer.trace_memory
+    results = {}
+    if not use_processes:
+        # tracemalloc es global al proceso: con hilos concurrentes no se podría
+        # atribuir la memoria a cada codificador
+        if trace_memory:
+            workers = 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='codec') as pool:
+            futures = {name: pool.submit(_run_codec, codec, text, frequencies, original_bytes,
+                                         trace_memory)
+                       for name, codec in codecs.items()}
+            for name, future in futures.items():
+                results[name], codec_timer = future.result()
+                timer.add(codec_timer.phases, prefix=f'{name}.', memory=codec_timer.memory)
+        return results
+
+    with timer.phase('shared_input'):
+        source = SharedBuffer.from_text(text)
+    ready = multiprocessing.Queue()
+    acks = {name: multiprocessing.Event() for name in names}
+    outputs = {}
+    try:
+        with ProcessPoolExecutor(max_workers=min(workers, os.cpu_count() or 1),
+                                 initializer=_init_output_channel,
+                                 initargs=(ready, acks)) as pool:
+            try:
+                futures = [pool.submit(_encode_shared, name, source.descriptor(), frequencies,
+                                       original_bytes, trace_memory)
+                           for name in names]
+                # Abrir cada bloque de salida en cuanto se anuncia y liberar al trabajador
+                while len(outputs) < len(names):
+                    try:
+                        name, descriptor = ready.get(timeout=0.05)
+                    except queue.Empty:
+                        for future in futures:
+                            if future.done() and future.exception() is not None:
+                                raise future.exception()
+                        continue
+                    buffer = SharedBuffer.attach(*descriptor)
+                    # Ya está mapeado aquí: se quita el nombre y la memoria se libera al cerrar
+                    buffer.unlink()
+                    outputs[name] = buffer
+                    acks[name].set()
+
+                for name, future in zip(names, futures):
+                    item, codec_timer, text_keys, restore_text = future.result()
+                    buffer = outputs.pop(name)
+                    item.payload = buffer.view()
+                    if restore_text:
+                        item.original_text = text
+                    for key in text_keys:
+                        item[key] = text
+                    item['shared_buffer'] = buffer
+                    results[name] = item
+                    timer.add(codec_timer.phases, prefix=f'{name}.', memory=codec_timer.memory)
+            except BaseException:
+                # Los trabajadores que esperan confirmación deben poder terminar
+                for event in acks.values():
+                    event.set()
+                raise
+    except BaseException:
+        # No dejar bloques huérfanos: los ya recibidos y los anunciados que nadie abrió
+        release_results(results)
+        for buffer in outputs.values():
+            buffer.close()
+        while True:
+            try:
+                _, descriptor = ready.get(timeout=0.05)
+            except queue.Empty:
+                break
+            try:
+                orphan = SharedBuffer.attach(*descriptor)
+            except FileNotFoundError:
+                continue
+            orphan.close()
+            orphan.unlink()
+        raise
+    finally:
+        source.close()
+        source.unlink()
+    return results
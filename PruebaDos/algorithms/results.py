@@ -0,0 +1,189 @@
+"""
+Capa de Funcionalidad - Resultados de codificación
+Objetos livianos con campos perezosos y acceso tipo diccionario
+"""
+
+from .canonical import unpack_bits
+
+
+class EncodingResult:
+    """
+    Resultado de una codificación
+
+    Guarda una referencia al texto de entrada (no una copia) y el mensaje
+    codificado empaquetado en bytes. Las vistas derivadas, como la cadena de
+    bits, los códigos inversos o la información del árbol, se calculan al
+    accederlas; también las frecuencias si el codificador no las necesitó. Admite results['clave'], get(), 'clave' in results y
+    asignación de claves adicionales, como 'statistics'.
+    """
+
+    __slots__ = ('algorithm', 'original_text', '_frequencies', 'codes', 'payload',
+                 'bit_length', '_reverse_codes', '_extras')
+
+    # Claves calculadas a partir de los atributos (subclases agregan las suyas)
+    LAZY_KEYS = ('encoded_text', 'reverse_codes')
+
+    def __init__(self, algorithm, original_text, frequencies, codes, payload, bit_length,
+                 **extras):
+        self.algorithm = algorithm
+        self.original_text = original_text
+        self._frequencies = frequencies
+        self.codes = codes
+        self.payload = payload
+        self.bit_length = bit_length
+        self._reverse_codes = None
+        self._extras = extras
+
+    @property
+    def frequencies(self):
+        """Frecuencias de símbolos (se cuentan al primer acceso si no vinieron dadas)"""
+        if self._frequencies is None and self.original_text is not None:
+            from utils.frequency_calculator import FrequencyCalculator
+            self._frequencies = FrequencyCalculator.calculate_frequencies(self.original_text)
+        return self._frequencies
+
+    @property
+    def encoded_text(self):
+        """Mensaje codificado como cadena de bits (se arma en cada acceso)"""
+        return unpack_bits(self.payload, self.bit_length)
+
+    def encoded_prefix(self, bits):
+        """Primeros bits del mensaje codificado sin desempaquetar el resto"""
+        bits = min(bits, self.bit_length)
+        return unpack_bits(self.payload[:(bits + 7) // 8], bits)
+
+    @property
+    def reverse_codes(self):
+        """Código -> símbolo (se construye una vez, al primer acceso)"""
+        if self._reverse_codes is None:
+            self._reverse_codes = {code: char for char, code in self.codes.items()}
+        return self._reverse_codes
+
+    def _field_names(self):
+        return ('algorithm', 'original_text', 'frequencies', 'codes') + self.LAZY_KEYS
+
+    def keys(self):
+        """Claves disponibles, como en un diccionario"""
+        return list(self._field_names()) + list(self._extras)
+
+    def __getitem__(self, key):
+        if key in self._extras:
+            return self._extras[key]
+        if key in self._field_names():
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in self._field_names():
+            raise KeyError(f"La clave '{key}' es de solo lectura")
+        self._extras[key] = value
+
+    def __delitem__(self, key):
+        if key in self._field_names():
+            raise KeyError(f"La clave '{key}' es de solo lectura")
+        del self._extras[key]
+
+    def __contains__(self, key):
+        return key in self._extras or key in self._field_names()
+
+    def get(self, key, default=None):
+        """Valor de una clave o default si no existe"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        """Pares (clave, valor); materializa las vistas perezosas"""
+        return [(key, self[key]) for key in self.keys()]
+
+    def to_dict(self):
+        """Copia como diccionario común (materializa las vistas perezosas)"""
+        return dict(self.items())
+
+
+class HuffmanResult(EncodingResult):
+    """Resultado de Huffman: agrega el árbol compacto y su información"""
+
+    __slots__ = ('tree',)
+
+    LAZY_KEYS = EncodingResult.LAZY_KEYS + ('tree', 'tree_info')
+
+    def __init__(self, original_text, frequencies, codes, payload, bit_length, tree, **extras):
+        super().__init__('Huffman', original_text, frequencies, codes, payload, bit_length,
+                         **extras)
+        self.tree = tree
+
+    @property
+    def tree_info(self):
+        """Información por nodo del árbol (se recorre en cada acceso)"""
+        from .huffman import HuffmanCoding
+        coder = HuffmanCoding()
+        coder.codes = self.codes
+        return list(coder.iter_tree_info(self.tree)) if self.tree else None
+
+
+class ShannonFanoResult(EncodingResult):
+    """Resultado de Shannon-Fano: símbolos ordenados y estructura del árbol perezosos"""
+
+    __slots__ = ()
+
+    LAZY_KEYS = EncodingResult.LAZY_KEYS + ('sorted_symbols', 'tree_structure')
+
+    def __init__(self, original_text, frequencies, codes, payload, bit_length, **extras):
+        super().__init__('Shannon-Fano', original_text, frequencies, codes, payload, bit_length,
+                         **extras)
+
+    @property
+    def sorted_symbols(self):
+        """Símbolos ordenados por frecuencia descendente"""
+        return sorted(self.frequencies.items(), key=lambda x: x[1], reverse=True)
+
+    @property
+    def tree_structure(self):
+        """Árbol de códigos para visualización (se construye en cada acceso)"""
+        from .shannon_fano import ShannonFanoCoding
+        return ShannonFanoCoding()._build_tree_structure(self.sorted_symbols, self.codes)
+
+
+class RangeCoderResult(EncodingResult):
+    """
+    Resultado del codificador por rango
+
+    No tiene tabla de códigos: el mensaje es un único número escrito en bytes.
+    Guarda el modelo de frecuencias que necesita el decodificador.
+    """
+
+    __slots__ = ('model', 'adaptive')
+
+    LAZY_KEYS = EncodingResult.LAZY_KEYS + ('model', 'adaptive')
+
+    def __init__(self, original_text, frequencies, payload, model, adaptive=False, **extras):
+        algorithm = 'Rango adaptativo' if adaptive else 'Rango'
+        super().__init__(algorithm, original_text, frequencies, {}, payload, len(payload) * 8,
+                         **extras)
+        self.model = model
+        self.adaptive = adaptive
+
+
+class LZ77Result(EncodingResult):
+    """
+    Resultado de LZ77 con Huffman
+
+    No hay un código por carácter: el mensaje alterna literales y pares
+    (longitud, distancia) codificados con dos tablas canónicas separadas.
+    """
+
+    __slots__ = ('literal_codes', 'distance_codes', 'level', 'window_size')
+
+    LAZY_KEYS = EncodingResult.LAZY_KEYS + ('literal_codes', 'distance_codes', 'level',
+                                            'window_size')
+
+    def __init__(self, original_text, frequencies, payload, bit_length, literal_codes,
+                 distance_codes, level, window_size, **extras):
+        super().__init__('LZ77+Huffman', original_text, frequencies, {}, payload, bit_length,
+                         **extras)
+        self.literal_codes = literal_codes
+        self.distance_codes = distance_codes
+        self.level = level
+        self.window_size = window_size
@@ -1,3 +1,8 @@
+from utils.profiler import PhaseTimer
+from .canonical import pack_symbols
+from .results import ShannonFanoResult
+
+
 class ShannonFanoCoding:
     def __init__(self):
         self.codes = {}
@@ -21,7 +26,8 @@ class ShannonFanoCoding:
             code_prefix (str): Prefijo del código actual.
         """
         if len(symbols) == 1:
-            self.codes[symbols[0][0]] = code_prefix
+            # Un alfabeto de un solo símbolo usa el código "0"
+            self.codes[symbols[0][0]] = code_prefix or '0'
             return
 
         total_frequency = sum(freq for _, freq in symbols)
@@ -42,41 +48,78 @@ class ShannonFanoCoding:
         self.shannon_fano(left_symbols, code_prefix + '0')
         self.shannon_fano(right_symbols, code_prefix + '1')
 
-    def encode(self, text):
+    def build_codes(self, frequencies):
+        """Calcula los códigos Shannon-Fano para una tabla de frecuencias"""
+        sorted_symbols = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
+        self.codes = {}
+        if sorted_symbols:
+            self.shannon_fano(sorted_symbols)
+        return self.codes
+
+    def encode(self, text, timer=None, frequencies=None):
         """
         Codifica un texto utilizando el algoritmo de Shannon-Fano.
 
         Args:
             text (str): El texto a codificar.
+            timer (PhaseTimer): Temporizador donde acumular las fases (opcional).
+            frequencies (dict): Frecuencias ya calculadas del texto (opcional).
 
         Returns:
-            dict: Un diccionario que contiene el texto original, el texto codificado,
-                  las frecuencias de los símbolos, los códigos asignados y el nombre del algoritmo.
+            ShannonFanoResult: Resultado con acceso tipo diccionario al texto original,
+                  el texto codificado, las frecuencias de los símbolos, los códigos
+                  asignados, los tiempos por fase y el nombre del algoritmo.
         """
-        frequencies = self.calculate_frequencies(text)
-        sorted_symbols = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
+        if timer is None:
+            timer = PhaseTimer()
+
+        with timer.phase('frequencies'):
+            if frequencies is None:
+                frequencies = self.calculate_frequencies(text)
+            sorted_symbols = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
 
         # Inicializar el diccionario de códigos
         self.codes = {}
 
         # Aplicar el algoritmo de Shannon-Fano
-        self.shannon_fano([(symbol, freq) for symbol, freq in sorted_symbols])
-
-        # Codificar el texto
-        encoded_text = ''.join(self.codes[char] for char in text)
-
-        # Construir representación del árbol para visualización
-        tree_structure = self._build_tree_structure(sorted_symbols, self.codes)
-
-        return {
-            'original_text': text,
-            'encoded_text': encoded_text,
-            'frequencies': frequencies,
-            'codes': self.codes.copy(),
-            'sorted_symbols': sorted_symbols,
-            'tree_structure': tree_structure,
-            'algorithm': 'Shannon-Fano'
-        }
+        with timer.phase('generate_codes'):
+            self.shannon_fano([(symbol, freq) for symbol, freq in sorted_symbols])
+
+        # Codificar el texto (empaquetado por bloques)
+        with timer.phase('encoding'):
+            payload, bit_length = pack_symbols(text, self.codes)
+
+        # sorted_symbols y tree_structure se construyen al accederlos
+        return ShannonFanoResult(text, frequencies, self.codes, payload, bit_length,
+                                 timings=dict(timer.phases))
+
+    def decode(self, encoded_text, codes=None):
+        """
+        Decodifica una cadena de bits generada con encode().
+
+        Args:
+            encoded_text (str): Bits a decodificar.
+            codes (dict): Códigos a usar (por defecto, los de la última codificación).
+
+        Returns:
+            str: El texto decodificado.
+        """
+        if codes is None:
+            codes = self.codes
+        reverse_codes = {code: char for char, code in codes.items()}
+        decoded_chars = []
+        current = ""
+        for bit in encoded_text:
+            if bit != "0" and bit != "1":
+                raise ValueError(f"Bit inválido: {bit}")
+            current += bit
+            char = reverse_codes.get(current)
+            if char is not None:
+                decoded_chars.append(char)
+                current = ""
+        if current:
+            raise ValueError("Código incompleto al final del mensaje")
+        return "".join(decoded_chars)
 
     def _build_tree_structure(self, sorted_symbols, codes):
         """Construye una representación del árbol para visualización"""
@@ -0,0 +1,214 @@
+"""
+Capa de Funcionalidad - Tablas de códigos estáticas
+Entrena tablas a partir de un corpus para codificar mensajes cortos sin construir un árbol
+"""
+
+import json
+import os
+from collections import Counter
+from collections.abc import Mapping
+
+from .canonical import canonical_codes, canonical_order, pack_bits, unpack_bits
+from .huffman import HuffmanCoding
+from .shannon_fano import ShannonFanoCoding
+
+# Símbolo de escape: al tener más de un carácter no puede coincidir con un símbolo real
+ESCAPE = '<ESC>'
+# Bits del literal que sigue al escape (alcanza para cualquier punto de código Unicode)
+LITERAL_BITS = 21
+
+DEFAULT_DIRECTORY = os.environ.get(
+    'PRUEBADOS_TABLES', os.path.join(os.path.expanduser('~'), '.pruebados', 'tables')
+)
+
+
+class StaticCodesView(Mapping):
+    """
+    Vista de solo lectura de los códigos de una tabla estática
+
+    Recorre solo los símbolos de la tabla, pero al consultar un carácter
+    ausente devuelve su código efectivo (escape + literal), así que la
+    longitud de cualquier código coincide con los bits que genera encode().
+    No copia la tabla: se crea una vez por tabla y la comparten los resultados.
+    """
+
+    __slots__ = ('_table',)
+
+    def __init__(self, table):
+        self._table = table
+
+    def __getitem__(self, char):
+        code = self._table.codes.get(char)
+        if code is None:
+            if not isinstance(char, str) or len(char) != 1:
+                raise KeyError(char)
+            code = self._table.escape_code + format(ord(char), f'0{LITERAL_BITS}b')
+        return code
+
+    def __iter__(self):
+        return iter(self._table.codes)
+
+    def __len__(self):
+        return len(self._table.codes)
+
+
+class StaticCodeTable:
+    """
+    Tabla de códigos prefijo fija entrenada con un corpus
+
+    Los símbolos que no están en la tabla se codifican como el código de
+    escape seguido del punto de código en LITERAL_BITS bits.
+    """
+
+    def __init__(self, name, lengths, algorithm='huffman'):
+        """
+        Args:
+            name (str): Nombre de la tabla
+            lengths (list): Tuplas (símbolo, longitud) en orden canónico
+            algorithm (str): Algoritmo con el que se entrenó
+        """
+        self.name = name
+        self.algorithm = algorithm
+        self.lengths = lengths
+        self.codes = canonical_codes(lengths)
+        self.reverse_codes = {code: symbol for symbol, code in self.codes.items()}
+        self.escape_code = self.codes[ESCAPE]
+        # Vista de solo lectura compartida por todos los resultados de esta tabla
+        self.view = StaticCodesView(self)
+
+    @classmethod
+    def train(cls, name, corpus, algorithm='huffman', escape_weight=1):
+        """
+        Entrena una tabla con un corpus de muestra
+
+        Args:
+            name (str): Nombre de la tabla
+            corpus (iterable): Textos de muestra
+            algorithm (str): 'huffman' o 'shannon_fano'
+            escape_weight (int): Frecuencia asignada al símbolo de escape
+
+        Returns:
+            StaticCodeTable: Tabla entrenada
+        """
+        frequencies = Counter()
+        for text in corpus:
+            frequencies.update(text)
+        frequencies[ESCAPE] = max(1, escape_weight)
+
+        engine = HuffmanCoding() if algorithm == 'huffman' else ShannonFanoCoding()
+        codes = engine.build_codes(dict(frequencies))
+        return cls(name, canonical_order(codes), algorithm)
+
+    def encode(self, text):
+        """Codifica un texto como cadena de bits usando la tabla fija"""
+        codes = self.codes
+        escape = self.escape_code
+        parts = []
+        for char in text:
+            code = codes.get(char)
+            if code is None:
+                code = escape + format(ord(char), f'0{LITERAL_BITS}b')
+            parts.append(code)
+        return "".join(parts)
+
+    def decode(self, encoded_text, count=None):
+        """
+        Decodifica una cadena de bits generada con encode()
+
+        Args:
+            encoded_text (str): Bits a decodificar
+            count (int): Cantidad de símbolos a leer (ignora bits de relleno)
+        """
+        reverse_codes = self.reverse_codes
+        decoded_chars = []
+        current = ""
+        i = 0
+        total = len(encoded_text)
+        while i < total and (count is None or len(decoded_chars) < count):
+            current += encoded_text[i]
+            i += 1
+            symbol = reverse_codes.get(current)
+            if symbol is None:
+                continue
+            if symbol == ESCAPE:
+                literal = encoded_text[i:i + LITERAL_BITS]
+                if len(literal) < LITERAL_BITS:
+                    raise ValueError("Literal de escape incompleto")
+                symbol = chr(int(literal, 2))
+                i += LITERAL_BITS
+            decoded_chars.append(symbol)
+            current = ""
+        return "".join(decoded_chars)
+
+    def pack(self, text):
+        """Empaqueta un registro: cantidad de símbolos (varint) y bits rellenados a byte"""
+        count = len(text)
+        prefix = bytearray()
+        while True:
+            byte = count & 0x7F
+            count >>= 7
+            prefix.append(byte | (0x80 if count else 0))
+            if not count:
+                break
+        bits = self.encode(text)
+        packed, pending = pack_bits(bits + '0' * (-len(bits) % 8))
+        return bytes(prefix) + packed
+
+    def unpack(self, data):
+        """Desempaqueta un registro generado por pack()"""
+        count = 0
+        shift = 0
+        offset = 0
+        while True:
+            byte = data[offset]
+            offset += 1
+            count |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                break
+        return self.decode(unpack_bits(data[offset:]), count)
+
+    def to_dict(self):
+        """Representación serializable de la tabla"""
+        return {
+            'name': self.name,
+            'algorithm': self.algorithm,
+            'lengths': [[symbol, length] for symbol, length in self.lengths]
+        }
+
+    def save(self, directory=None):
+        """Guarda la tabla como JSON y devuelve la ruta del archivo"""
+        directory = directory or DEFAULT_DIRECTORY
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'{self.name}.json')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Carga una tabla guardada con save()"""
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        lengths = [(symbol, length) for symbol, length in data['lengths']]
+        return cls(data['name'], lengths, data.get('algorithm', 'huffman'))
+
+
+_loaded_tables = {}
+
+
+def get_static_table(table, directory=None):
+    """
+    Obtiene una tabla por nombre (cargándola una sola vez) o la devuelve tal cual
+
+    Args:
+        table (str | StaticCodeTable): Nombre de la tabla o tabla ya cargada
+        directory (str): Directorio de tablas (por defecto DEFAULT_DIRECTORY)
+    """
+    if isinstance(table, StaticCodeTable):
+        return table
+    directory = directory or DEFAULT_DIRECTORY
+    key = (directory, table)
+    if key not in _loaded_tables:
+        _loaded_tables[key] = StaticCodeTable.load(os.path.join(directory, f'{table}.json'))
+    return _loaded_tables[key]
@@ -0,0 +1,263 @@
+"""
+Capa de Funcionalidad - Transformaciones previas a la codificación
+Burrows-Wheeler (con arreglo de sufijos), move-to-front y run-length por bloques
+"""
+
+import math
+import struct
+from collections import Counter
+
+# Símbolos de las corridas de ceros (numeración biyectiva en base 2, como bzip2)
+RUN_A = 0
+RUN_B = 1
+
+
+def suffix_array(sequence):
+    """
+    Arreglo de sufijos por duplicación de prefijos
+
+    En cada ronda se ordena por el par (rango del sufijo, rango del sufijo que
+    empieza k posiciones después), duplicando k hasta que todos los rangos son
+    distintos. Con textos poco repetitivos bastan pocas rondas.
+
+    Args:
+        sequence (list): Enteros no negativos
+
+    Returns:
+        list: Posiciones de los sufijos en orden lexicográfico
+    """
+    n = len(sequence)
+    if n == 0:
+        return []
+    rank = list(sequence)
+    order = sorted(range(n), key=rank.__getitem__)
+    k = 1
+    while True:
+        width = max(rank) + 2
+        key = [rank[i] * width + (rank[i + k] + 1 if i + k < n else 0) for i in range(n)]
+        order.sort(key=key.__getitem__)
+
+        new_rank = [0] * n
+        current = 0
+        previous = key[order[0]]
+        for index in order:
+            if key[index] != previous:
+                current += 1
+                previous = key[index]
+            new_rank[index] = current
+        rank = new_rank
+        if current == n - 1:
+            return order
+        k *= 2
+
+
+def bwt(block):
+    """
+    Transformada de Burrows-Wheeler de un bloque
+
+    Se agrega un centinela menor que todos los símbolos, de modo que ordenar
+    rotaciones equivale a ordenar sufijos. El centinela no se emite: se guarda
+    su posición (índice primario).
+
+    Returns:
+        tuple: (texto transformado, índice primario)
+    """
+    if not block:
+        return "", 0
+    order = suffix_array([ord(char) + 1 for char in block] + [0])
+    out = []
+    primary = 0
+    for row, start in enumerate(order):
+        if start == 0:
+            primary = row
+        else:
+            out.append(block[start - 1])
+    return "".join(out), primary
+
+
+def inverse_bwt(transformed, primary):
+    """Recupera el bloque original a partir de la salida de bwt()"""
+    if not transformed:
+        return ""
+    # Última columna con el centinela (None) en su posición
+    last = list(transformed)
+    last.insert(primary, None)
+
+    # Primera fila de cada símbolo en la primera columna (la fila 0 es del centinela)
+    counts = Counter(transformed)
+    first = {}
+    row = 1
+    for char in sorted(counts):
+        first[char] = row
+        row += counts[char]
+
+    # LF: fila de la rotación anterior
+    seen = {}
+    lf = [0] * len(last)
+    for index, char in enumerate(last):
+        if char is None:
+            continue
+        lf[index] = first[char] + seen.get(char, 0)
+        seen[char] = seen.get(char, 0) + 1
+
+    out = []
+    index = 0
+    for _ in range(len(transformed)):
+        out.append(last[index])
+        index = lf[index]
+    out.reverse()
+    return "".join(out)
+
+
+def move_to_front(block, alphabet):
+    """Índices move-to-front de cada símbolo sobre el alfabeto ordenado"""
+    table = list(alphabet)
+    out = []
+    for char in block:
+        index = table.index(char)
+        out.append(index)
+        if index:
+            del table[index]
+            table.insert(0, char)
+    return out
+
+
+def inverse_move_to_front(indices, alphabet):
+    """Símbolos correspondientes a unos índices move-to-front"""
+    table = list(alphabet)
+    out = []
+    for index in indices:
+        char = table[index]
+        out.append(char)
+        if index:
+            del table[index]
+            table.insert(0, char)
+    return "".join(out)
+
+
+def run_length_encode(indices):
+    """
+    Codifica las corridas de ceros con RUN_A/RUN_B y desplaza el resto en uno
+
+    Una corrida de r ceros se escribe en base 2 biyectiva (dígitos 1 y 2,
+    menos significativo primero), así que ocupa unos log2(r) símbolos.
+    """
+    out = []
+    run = 0
+    for index in indices:
+        if index == 0:
+            run += 1
+            continue
+        if run:
+            _emit_run(out, run)
+            run = 0
+        out.append(index + 1)
+    if run:
+        _emit_run(out, run)
+    return out
+
+
+def _emit_run(out, run):
+    while run > 0:
+        if run & 1:
+            out.append(RUN_A)
+            run = (run - 1) >> 1
+        else:
+            out.append(RUN_B)
+            run = (run - 2) >> 1
+
+
+def run_length_decode(symbols):
+    """Inversa de run_length_encode()"""
+    out = []
+    run = 0
+    weight = 1
+    for symbol in symbols:
+        if symbol <= RUN_B:
+            run += weight << symbol
+            weight <<= 1
+            continue
+        if run:
+            out.extend([0] * run)
+            run = 0
+            weight = 1
+        out.append(symbol - 1)
+    if run:
+        out.extend([0] * run)
+    return out
+
+
+def _entropy_bits(symbols):
+    """Entropía de orden 0 total (bits) de una secuencia"""
+    total = len(symbols)
+    if total == 0:
+        return 0.0
+    return -sum(count * math.log2(count / total) for count in Counter(symbols).values())
+
+
+class BlockTransform:
+    """
+    Transformación por bloques BWT -> MTF -> RLE
+
+    Cada bloque se transforma de forma independiente y su salida se expresa
+    como símbolos chr(n), de modo que cualquier codificador de texto (Huffman,
+    Shannon-Fano) puede codificarla. Los metadatos de cada bloque (índice
+    primario, alfabeto y longitudes) son necesarios para invertirla.
+
+    Metadatos serializados por bloque (enteros little-endian):
+        índice primario u32 | longitud del bloque u32 | símbolos transformados u32 |
+        tamaño del alfabeto u32 | alfabeto UTF-8
+    """
+
+    BLOCK_HEADER = struct.Struct('<IIII')
+
+    def __init__(self, block_size=1 << 16):
+        if block_size <= 0:
+            raise ValueError("block_size debe ser positivo")
+        self.block_size = block_size
+
+    def forward(self, text):
+        """
+        Transforma un texto bloque por bloque
+
+        Returns:
+            tuple: (símbolos transformados como str, lista de bloques) donde cada
+                   bloque tiene primary, alphabet, length, symbols, entropy_before y
+                   entropy_after (bits totales de orden 0 antes y después)
+        """
+        parts = []
+        blocks = []
+        for offset in range(0, len(text), self.block_size):
+            block = text[offset:offset + self.block_size]
+            alphabet = "".join(sorted(set(block)))
+            transformed, primary = bwt(block)
+            symbols = run_length_encode(move_to_front(transformed, alphabet))
+            parts.append("".join(map(chr, symbols)))
+            blocks.append({
+                'primary': primary,
+                'alphabet': alphabet,
+                'length': len(block),
+                'symbols': len(symbols),
+                'entropy_before': _entropy_bits(block),
+                'entropy_after': _entropy_bits(symbols)
+            })
+        return "".join(parts), blocks
+
+    @staticmethod
+    def inverse(transformed, blocks):
+        """Recupera el texto original a partir de forward()"""
+        out = []
+        offset = 0
+        for block in blocks:
+            symbols = [ord(char) for char in transformed[offset:offset + block['symbols']]]
+            offset += block['symbols']
+            indices = run_length_decode(symbols)
+            out.append(inverse_bwt(inverse_move_to_front(indices, block['alphabet']),
+                                   block['primary']))
+        return "".join(out)
+
+    @classmethod
+    def metadata_size(cls, blocks):
+        """Bytes que ocupan los metadatos de los bloques al serializarlos"""
+        return sum(cls.BLOCK_HEADER.size + len(block['alphabet'].encode('utf-8', 'surrogatepass'))
+                   for block in blocks)
@@ -3,6 +3,7 @@ Aplicación de Compresión de Datos - Huffman y Shannon-Fano
 Punto de entrada principal de la aplicación
 """
 
+import argparse
 import tkinter as tk
 import sys
 import os
@@ -10,10 +11,168 @@ import os
 # Agregar el directorio actual al path para importaciones
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from ui.main_window import MainWindow
+def parse_args(argv=None):
+    """Interpreta los argumentos de línea de comandos"""
+    parser = argparse.ArgumentParser(
+        description="Compresión de datos con Huffman y Shannon-Fano"
+    )
+    parser.add_argument('--batch', metavar='DIR',
+                        help='Procesa todos los archivos de DIR sin abrir la interfaz')
+    parser.add_argument('--csv', metavar='ARCHIVO', help='Reporte CSV del lote')
+    parser.add_argument('--json', metavar='ARCHIVO',
+                        help='Reporte JSON del lote o de --memory-report')
+    parser.add_argument('--pdf', metavar='ARCHIVO',
+                        help='Reporte PDF del lote o de --memory-report')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Cantidad de procesos de trabajo (por defecto, uno por CPU)')
+    parser.add_argument('--no-recursive', action='store_true',
+                        help='No procesar subdirectorios')
+    parser.add_argument('--compress', nargs=2, metavar=('ORIGEN', 'DESTINO'),
+                        help='Comprime un archivo de texto')
+    parser.add_argument('--decompress', nargs=2, metavar=('ORIGEN', 'DESTINO'),
+                        help='Descomprime un archivo generado con --compress')
+    parser.add_argument('--algorithm', choices=['huffman', 'shannon_fano'], default='huffman',
+                        help='Algoritmo para --compress (por defecto, huffman)')
+    parser.add_argument('--verify', type=float, nargs='?', const=1.0, default=0.0, metavar='TASA',
+                        help='Con --compress, decodifica y compara por CRC32 una fracción de '
+                             'los bloques (por defecto, todos)')
+    parser.add_argument('--streams', type=int, default=1, metavar='N',
+                        help='Con --compress, reparte cada bloque en N sub-flujos intercalados '
+                             'que --decompress puede decodificar en paralelo con --workers')
+    parser.add_argument('--checkpoint', action='store_true',
+                        help='Con --compress o --decompress, guarda el progreso en DESTINO.ckpt '
+                             'después de cada bloque y reanuda desde ahí un trabajo interrumpido')
+    parser.add_argument('--fuzz', type=int, metavar='CASOS',
+                        help='Ejecuta pruebas de ida y vuelta con CASOS textos aleatorios')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Semilla para --fuzz (permite reproducir un fallo)')
+    parser.add_argument('--estimate', metavar='ARCHIVO',
+                        help='Estima por muestreo si conviene comprimir ARCHIVO y con qué algoritmo')
+    parser.add_argument('--memory-report', metavar='ARCHIVO',
+                        help='Mide el pico y la memoria retenida de cada fase al procesar '
+                             'ARCHIVO (con --json guarda el reporte)')
+    parser.add_argument('--serve', metavar='DIRECCION',
+                        help="Inicia el servidor local de compresión en 'host:puerto' o 'unix:/ruta'")
+    return parser.parse_args(argv)
+
+def run_estimate(args):
+    """Muestra la estimación por muestreo de un archivo"""
+    from utils.statistics import StatisticsCalculator
+    
+    estimate = StatisticsCalculator().estimate_statistics(path=args.estimate)
+    if estimate is None:
+        print("El archivo está vacío")
+        return
+    
+    def interval(values):
+        return f"{values['estimate']:.4f} [{values['low']:.4f}, {values['high']:.4f}]"
+    
+    print(f"Muestra: {estimate['sampled_bytes']} de {estimate['total_bytes']} bytes "
+          f"({estimate['seconds'] * 1000:.1f} ms)")
+    print(f"Entropía: {interval(estimate['entropy'])} bits/símbolo")
+    print(f"Huffman: {interval(estimate['huffman_avg_length'])} bits/símbolo")
+    print(f"Shannon-Fano: {interval(estimate['shannon_fano_avg_length'])} bits/símbolo")
+    winner = estimate['winner']
+    print(f"Mejor algoritmo: {winner} (tasa estimada "
+          f"{interval(estimate[f'{winner}_compression_ratio'])}%)")
+    print("Conviene comprimir" if estimate['worth_compressing'] else "No conviene comprimir")
+
+def run_memory_report(args):
+    """Procesa un archivo completo midiendo la memoria de cada fase"""
+    import json
+    from utils.profiler import profile_pipeline
+    
+    with open(args.memory_report, encoding='utf-8') as f:
+        text = f.read()
+    report = profile_pipeline(text, pdf_path=args.pdf)
+    
+    print(f"Entrada: {report['input_bytes']} bytes ({report['input_chars']} caracteres)")
+    print(f"{'Fase':<40} {'Tiempo (ms)':>12} {'Pico (KiB)':>12} {'Retenida (KiB)':>15} {'Pico/byte':>10}")
+    memory = report.get('memory', {})
+    for name, entry in sorted(memory.items(), key=lambda item: item[1]['peak_bytes'], reverse=True):
+        print(f"{name:<40} {report['phases'][name] * 1000:>12.2f} {entry['peak_bytes'] / 1024:>12.1f} "
+              f"{entry['retained_bytes'] / 1024:>15.1f} {entry['peak_per_input_byte']:>10.2f}")
+    print(f"Pico total: {report['memory_peak_bytes'] / 1024:.1f} KiB")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+def run_fuzz(args):
+    """Ejecuta las pruebas de ida y vuelta y muestra los fallos"""
+    from utils.roundtrip_fuzzer import RoundTripFuzzer
+    
+    report = RoundTripFuzzer(seed=args.seed).run(args.fuzz)
+    for failure in report['failures']:
+        print(f"[FALLO] {failure['check']} semilla={failure['seed']} "
+              f"distribución={failure['distribution']} alfabeto={failure['alphabet']} "
+              f"tamaño={failure['size']}: {failure['error']}")
+    print(f"{report['cases']} casos en {report['seconds']:.2f} s "
+          f"(semilla {report['seed']}): {len(report['failures'])} fallos")
+    return 1 if report['failures'] else 0
+
+def run_server(args):
+    """Atiende solicitudes de compresión hasta que se interrumpa"""
+    from utils.compression_server import CompressionServer
+    
+    server = CompressionServer(args.serve, workers=args.workers)
+    print(f"Servidor de compresión escuchando en {server.server_address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Servidor detenido")
+
+def run_file_command(args):
+    """Comprime o descomprime un archivo por bloques"""
+    from algorithms.file_codec import FileCodec
+    
+    codec = FileCodec(algorithm=args.algorithm, verify_rate=args.verify, streams=args.streams,
+                      decode_workers=args.workers or os.cpu_count())
+    if args.compress:
+        src, dst = args.compress
+        info = codec.compress_file(src, dst, checkpoint=dst + '.ckpt' if args.checkpoint else None)
+        if 'resumed_block' in info:
+            print(f"Reanudado desde el bloque {info['resumed_block']}")
+        print(f"{info['symbols']} símbolos -> {info['output_bytes']} bytes "
+              f"(cabecera: {info['header_bytes']} bytes)")
+        if 'verification' in info:
+            verification = info['verification']
+            print(f"Verificados {verification['verified_blocks']} de {verification['blocks']} "
+                  f"bloques en {verification['verify_seconds'] * 1000:.1f} ms "
+                  f"({verification['overhead'] * 100:.1f}% del tiempo de codificación)")
+    else:
+        src, dst = args.decompress
+        info = codec.decompress_file(src, dst,
+                                     checkpoint=dst + '.ckpt' if args.checkpoint else None)
+        print(f"{info['input_bytes']} bytes -> {info['symbols']} símbolos")
+
+def run_batch(args):
+    """Procesa un directorio completo y muestra el resumen"""
+    from utils.batch_processor import BatchProcessor
+    
+    processor = BatchProcessor(max_workers=args.workers, recursive=not args.no_recursive)
+    
+    def progress(entry):
+        print(f"[{entry['status']}] {entry['path']}")
+    
+    report = processor.process_directory(
+        args.batch, csv_path=args.csv, json_path=args.json, pdf_path=args.pdf,
+        progress=progress
+    )
+    
+    summary = report['summary']
+    print(f"\nArchivos procesados: {summary['files_ok']} de {summary['files_total']}")
+    print(f"Tamaño total: {summary['total_bytes']} bytes en {summary['wall_seconds']:.2f} s "
+          f"({summary['throughput_mb_s']:.2f} MB/s)")
+    print(f"Tasa de compresión Huffman: {summary['huffman_compression_ratio']:.2f}%")
+    print(f"Tasa de compresión Shannon-Fano: {summary['shannon_fano_compression_ratio']:.2f}%")
+    print("Referencia: " + ", ".join(
+        f"{name} {summary[f'{name}_compression_ratio']:.2f}%" for name in ('zlib', 'bz2', 'lzma')
+    ))
 
 def main():
     """Función principal que inicia la aplicación"""
+    from ui.main_window import MainWindow
+    
     try:
         root = tk.Tk()
         root.state('zoomed')  # Maximizar ventana en Windows
@@ -57,6 +216,10 @@ def test_algorithms():
         print(f"Códigos: {sf_result['codes']}")
         print(f"Texto codificado: {sf_result['encoded_text']}")
         
+        decoded = sf.decode(sf_result['encoded_text'])
+        print(f"Texto decodificado: '{decoded}'")
+        print(f"¿Coincide?: {decoded == test_text}")
+        
         print("\n¡Pruebas completadas exitosamente!")
         
     except Exception as e:
@@ -68,4 +231,18 @@ def test_algorithms():
 # test_algorithms()
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.batch:
+        run_batch(args)
+    elif args.compress or args.decompress:
+        run_file_command(args)
+    elif args.estimate:
+        run_estimate(args)
+    elif args.fuzz:
+        sys.exit(run_fuzz(args))
+    elif args.memory_report:
+        run_memory_report(args)
+    elif args.serve:
+        run_server(args)
+    else:
+        main()
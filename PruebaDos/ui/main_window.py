@@ -1,16 +1,18 @@
+import base64
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import pandas as pd
 
 from algorithms.huffman import HuffmanCoding
 from algorithms.shannon_fano import ShannonFanoCoding
-from utils.frequency_calculator import FrequencyCalculator
+from algorithms.registry import compare_codecs, get_codec
+from utils.frequency_calculator import FrequencyCalculator, IncrementalFrequencyCounter
 from utils.statistics import StatisticsCalculator
 from utils.visualizer import DataVisualizer
 from utils.pdf_exporter import PDFExporter
-from utils.tree_visualizer import TreeVisualizer
+from utils.profiler import PhaseTimer
+from ui.tree_canvas import TreeCanvas
 
 class MainWindow:
     def __init__(self, master):
@@ -18,10 +20,21 @@ class MainWindow:
         master.title("Compresión de Huffman y Shannon-Fano")
 
         self.text_data = ""
-        self.huffman_results = None
-        self.shannon_fano_results = None
+        self.results = {}
+        self.baseline_results = None
+        self.pdf_exporter = PDFExporter()
+        self.export_future = None
+        self.timer = PhaseTimer()
+        self.live_counter = IncrementalFrequencyCounter()
+        self.live_after_id = None
+        self.live_lengths = {}
+        self.data_visualizer = DataVisualizer()
+        self.chart_image = None
+        self.chart_image_key = None
+        self.tree_views = {}
 
         self.create_widgets()
+        self.install_text_proxy()
 
     def create_widgets(self):
         # Sección de entrada de texto
@@ -41,6 +54,14 @@ class MainWindow:
         self.clear_button = ttk.Button(self.action_section, text="Limpiar", command=self.clear_text)
         self.clear_button.pack(side=tk.LEFT, padx=5)
 
+        self.export_button = ttk.Button(self.action_section, text="Exportar PDF", command=self.export_pdf)
+        self.export_button.pack(side=tk.LEFT, padx=5)
+
+        self.profile_var = tk.BooleanVar(value=False)
+        self.profile_check = ttk.Checkbutton(self.action_section, text="Perfilado detallado",
+                                             variable=self.profile_var)
+        self.profile_check.pack(side=tk.LEFT, padx=5)
+
         # Sección de resultados
         self.results_section = ttk.Frame(self.master)
         self.results_section.pack(fill="both", expand=True, padx=10, pady=10)
@@ -55,6 +76,16 @@ class MainWindow:
         self.stats_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.stats_frame, text="Estadísticas")
 
+        # Estadísticas en vivo (se actualizan mientras se escribe)
+        self.live_stats_frame = ttk.LabelFrame(self.stats_frame, text="Estadísticas en vivo", padding="10")
+        self.live_stats_frame.pack(fill="x", padx=10, pady=5)
+        self.live_stats_label = ttk.Label(self.live_stats_frame, text="Sin texto", justify=tk.LEFT)
+        self.live_stats_label.pack(anchor="w")
+
+        # Resultados del último procesamiento
+        self.stats_content = ttk.Frame(self.stats_frame)
+        self.stats_content.pack(fill="both", expand=True)
+
         # Pestaña de información general
         self.info_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.info_frame, text="Información General")
@@ -71,6 +102,10 @@ class MainWindow:
         self.trees_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.trees_frame, text="Árboles de Codificación")
 
+        # Pestaña de gráficos
+        self.charts_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.charts_frame, text="Gráficos")
+
     def compress_text(self):
         self.text_data = self.text_area.get("1.0", tk.END).strip()
         if not self.text_data:
@@ -89,81 +124,278 @@ class MainWindow:
     def clear_text(self):
         self.text_area.delete("1.0", tk.END)
         self.text_data = ""
-        self.huffman_results = None
-        self.shannon_fano_results = None
+        self.results = {}
+        self.baseline_results = None
         self.update_results()
 
-    def update_results(self):
-        self.update_stats()
-        self.update_info()
-        self.update_encoded_messages()
-        self.update_decoding_process()
-        self.update_trees()
-
-    def update_stats(self):
-        # Limpiar frame
-        for widget in self.stats_frame.winfo_children():
-            widget.destroy()
+    def install_text_proxy(self):
+        """
+        Intercepta las inserciones y borrados del área de texto
+
+        Se renombra el comando Tcl del widget y se reemplaza por un proxy, de modo
+        que cada cambio se aplica como delta sobre las frecuencias en vivo.
+        """
+        widget_name = str(self.text_area)
+        self.text_area_command = widget_name + "_orig"
+        self.master.tk.call("rename", widget_name, self.text_area_command)
+        self.master.tk.createcommand(widget_name, self.text_proxy)
+
+    def text_proxy(self, command, *args):
+        """Reenvía los comandos al widget real registrando los cambios de texto"""
+        tk_call = self.master.tk.call
+        original = self.text_area_command
+        changed = False
+
+        if command in ("delete", "replace") and args:
+            # Texto que se va a quitar; Tk nunca borra el salto de línea final
+            end = args[1] if len(args) > 1 else f"{args[0]} +1c"
+            if tk_call(original, "compare", end, ">", "end-1c"):
+                end = "end-1c"
+            self.live_counter.remove(tk_call(original, "get", args[0], end))
+            changed = True
+
+        result = tk_call((original, command) + args)
+
+        if command == "insert" and len(args) > 1:
+            # insert índice texto ?etiquetas texto etiquetas ...?
+            self.live_counter.add("".join(args[1::2]))
+            changed = True
+        elif command == "replace" and len(args) > 2:
+            self.live_counter.add("".join(args[2::2]))
+
+        if changed:
+            self.schedule_live_stats()
+        return result
+
+    def schedule_live_stats(self, delay=300):
+        """Agrupa los cambios y recalcula las estadísticas en vivo tras una pausa"""
+        if self.live_after_id is not None:
+            self.master.after_cancel(self.live_after_id)
+        self.live_after_id = self.master.after(delay, self.update_live_stats)
+
+    def update_live_stats(self):
+        """Muestra entropía y longitudes estimadas a partir de las frecuencias en vivo"""
+        self.live_after_id = None
+        counter = self.live_counter
+        if counter.total == 0:
+            self.live_stats_label.config(text="Sin texto")
+            return
 
-        if not self.huffman_results or not self.shannon_fano_results:
+        frequencies = counter.snapshot()
+        total = counter.total
+
+        # Las longitudes dependen de los conteos y no solo de su orden, así que
+        # se recalculan en cada actualización (ya agrupada por schedule_live_stats)
+        self.live_lengths = {
+            'Huffman': {char: len(code) for char, code in
+                        HuffmanCoding().build_codes(frequencies).items()},
+            'Shannon-Fano': {char: len(code) for char, code in
+                             ShannonFanoCoding().build_codes(frequencies).items()}
+        }
+
+        probabilities = FrequencyCalculator.calculate_probabilities(frequencies)
+        entropy = StatisticsCalculator.calculate_entropy(probabilities)
+
+        lines = [
+            f"Símbolos: {total}    Únicos: {len(frequencies)}",
+            f"Entropía: {entropy:.4f} bits/símbolo ({entropy * total:.0f} bits en total)"
+        ]
+        for algorithm, lengths in self.live_lengths.items():
+            bits = sum(freq * lengths[char] for char, freq in frequencies.items())
+            lines.append(f"{algorithm} estimado: {bits} bits ({bits / total:.4f} bits/símbolo)")
+        self.live_stats_label.config(text="\n".join(lines))
+
+    def export_pdf(self):
+        """Exporta el reporte PDF en segundo plano sin bloquear la interfaz"""
+        if not self.results:
+            messagebox.showwarning("Advertencia", "Primero procese un texto para exportar")
             return
 
-        # Estadísticas de Huffman
-        huffman_stats = ttk.LabelFrame(self.stats_frame, text="Huffman", padding="10")
-        huffman_stats.pack(fill="x", padx=10, pady=5)
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".pdf",
+            filetypes=[("Archivos PDF", "*.pdf")],
+            title="Guardar reporte"
+        )
+        if not filename:
+            return
 
-        ttk.Label(huffman_stats, text=f"Tamaño del texto original: {len(self.text_data) * 8} bits").pack()
-        ttk.Label(huffman_stats, text=f"Tamaño comprimido: {len(self.huffman_results['encoded_text'])} bits").pack()
-        compression_ratio = (len(self.text_data) * 8) / len(self.huffman_results['encoded_text'])
-        ttk.Label(huffman_stats, text=f"Ratio de compresión: {compression_ratio:.2f}").pack()
+        self.export_button.config(state=tk.DISABLED, text="Exportando...")
+        self.export_future = self.pdf_exporter.export_results_async(
+            filename, self.text_data, *self.results.values(), baselines=self.baseline_results
+        )
+        self.master.after(100, self.check_export)
 
-        # Estadísticas de Shannon-Fano
-        sf_stats = ttk.LabelFrame(self.stats_frame, text="Shannon-Fano", padding="10")
-        sf_stats.pack(fill="x", padx=10, pady=5)
+    def check_export(self):
+        """Consulta periódicamente el estado de la exportación en curso"""
+        if not self.export_future.done():
+            self.master.after(100, self.check_export)
+            return
 
-        ttk.Label(sf_stats, text=f"Tamaño del texto original: {len(self.text_data) * 8} bits").pack()
-        ttk.Label(sf_stats, text=f"Tamaño comprimido: {len(self.shannon_fano_results['encoded_text'])} bits").pack()
-        compression_ratio = (len(self.text_data) * 8) / len(self.shannon_fano_results['encoded_text'])
-        ttk.Label(sf_stats, text=f"Ratio de compresión: {compression_ratio:.2f}").pack()
+        self.export_button.config(state=tk.NORMAL, text="Exportar PDF")
+        error = self.export_future.exception()
+        self.export_future = None
+        if error:
+            messagebox.showerror("Error", f"Error al exportar el PDF: {str(error)}")
+        else:
+            self.timer.add(self.pdf_exporter.last_timings['phases'])
+            self.show_timings()
+            messagebox.showinfo("Éxito", "Reporte PDF exportado correctamente")
 
-    def update_info(self):
-        # Limpiar frame
-        for widget in self.info_frame.winfo_children():
+    def update_results(self):
+        with self.timer.phase('ui.update_stats'):
+            self.update_stats()
+        with self.timer.phase('ui.update_info'):
+            self.update_info()
+        with self.timer.phase('ui.update_encoded_messages'):
+            self.update_encoded_messages()
+        with self.timer.phase('ui.update_decoding_process'):
+            self.update_decoding_process()
+        with self.timer.phase('ui.update_trees'):
+            self.update_trees()
+        with self.timer.phase('ui.update_charts'):
+            self.update_charts()
+
+    def update_charts(self):
+        """
+        Actualiza la pestaña de gráficos
+
+        Los gráficos se muestran como una imagen ya renderizada (en caché según
+        la tabla de códigos), así que cambiar de pestaña o redimensionar la
+        ventana no vuelve a dibujarlos.
+        """
+        for widget in self.charts_frame.winfo_children():
             widget.destroy()
 
-        if not self.huffman_results or not self.shannon_fano_results:
+        if not self.results:
+            self.chart_image = None
+            self.chart_image_key = None
             return
 
-        # Información de Huffman
-        huffman_info = ttk.LabelFrame(self.info_frame, text="Huffman", padding="10")
-        huffman_info.pack(fill="x", padx=10, pady=5)
+        results_list = list(self.results.values())
+        key = self.data_visualizer.table_hash(*results_list)
+        if key != self.chart_image_key:
+            png = self.data_visualizer.render_comparison_image(*results_list)
+            self.chart_image = tk.PhotoImage(data=base64.b64encode(png))
+            self.chart_image_key = key
 
-        codes_text = scrolledtext.ScrolledText(huffman_info, height=10)
-        codes_text.pack(fill="both", expand=True)
+        ttk.Label(self.charts_frame, image=self.chart_image).pack(fill="both", expand=True)
 
-        codes_info = "Símbolo -> Código\n" + "-" * 20 + "\n"
-        for char, code in sorted(self.huffman_results['codes'].items()):
-            display_char = char
-            if char == ' ':
-                display_char = '[ESPACIO]'
-            elif char == '\n':
-                display_char = '[NUEVA_LÍNEA]'
-            elif char == '\t':
-                display_char = '[TAB]'
-            codes_info += f"'{display_char}' -> {code}\n"
+    def update_stats(self):
+        # Limpiar frame
+        for widget in self.stats_content.winfo_children():
+            widget.destroy()
 
-        codes_text.insert(1.0, codes_info)
-        codes_text.config(state=tk.DISABLED)
+        if not self.results:
+            return
 
-        # Información de Shannon-Fano
-        sf_info = ttk.LabelFrame(self.info_frame, text="Shannon-Fano", padding="10")
-        sf_info.pack(fill="x", padx=10, pady=5)
+        for results in self.results.values():
+            stats = results['statistics']
+            frame = ttk.LabelFrame(self.stats_content, text=results['algorithm'], padding="10")
+            frame.pack(fill="x", padx=10, pady=5)
+
+            ttk.Label(frame, text=f"Tamaño del texto original: {stats['original_bytes']} bytes "
+                                  f"(UTF-8, {stats['total_chars']} caracteres)").pack()
+            ttk.Label(frame, text=f"Datos comprimidos: {stats['payload_bytes']} bytes "
+                                  f"({stats['compressed_bits']} bits)").pack()
+            ttk.Label(frame, text=f"Tabla de códigos: {stats['table_bytes']} bytes    "
+                                  f"Cabecera: {stats['header_bytes']} bytes").pack()
+            ttk.Label(frame, text=f"Archivo comprimido: {stats['container_bytes']} bytes").pack()
+            ttk.Label(frame, text=f"Tasa de compresión: {stats['compression_ratio']:.2f}% "
+                                  f"(solo datos: {stats['payload_compression_ratio']:.2f}%)").pack()
+
+            # Ganancia de la transformación BWT -> MTF -> RLE, total y por bloque
+            if 'transform_blocks' in stats:
+                ttk.Label(frame, text=f"Entropía antes de la transformación: {stats['entropy_before']:.0f} bits    "
+                                      f"después: {stats['entropy_after']:.0f} bits").pack()
+                for index, block in enumerate(stats['transform_blocks'][:10]):
+                    gain = StatisticsCalculator.calculate_compression_ratio(block['entropy_before'],
+                                                                           block['entropy_after'])
+                    ttk.Label(frame, text=f"Bloque {index + 1}: {block['length']} -> {block['symbols']} "
+                                          f"símbolos, ganancia {gain:.2f}%").pack()
+
+        # Compresores de referencia sobre la misma entrada
+        if self.baseline_results:
+            baseline_frame = ttk.LabelFrame(self.stats_content, text="Referencia (zlib / bz2 / lzma)",
+                                            padding="10")
+            baseline_frame.pack(fill="x", padx=10, pady=5)
+            for name, baseline in self.baseline_results.items():
+                ttk.Label(baseline_frame,
+                          text=f"{name}: {baseline['bytes']} bytes, "
+                               f"tasa {baseline['compression_ratio']:.2f}% "
+                               f"({baseline['seconds'] * 1000:.1f} ms)").pack()
+
+        # Tiempos por fase (se completan al terminar el procesamiento)
+        self.timings_frame = ttk.LabelFrame(self.stats_content, text="Tiempos por fase", padding="10")
+        self.timings_frame.pack(fill="x", padx=10, pady=5)
+
+    def show_timings(self):
+        """Muestra en la pestaña de estadísticas los tiempos medidos por fase"""
+        if not getattr(self, 'timings_frame', None) or not self.timings_frame.winfo_exists():
+            return
 
-        codes_text = scrolledtext.ScrolledText(sf_info, height=10)
-        codes_text.pack(fill="both", expand=True)
+        for widget in self.timings_frame.winfo_children():
+            widget.destroy()
+
+        timings = self.timer.to_dict()
+        total = timings['total_seconds']
+        memory = timings.get('memory', {})
+        for name, seconds in timings['phases'].items():
+            share = (seconds / total * 100) if total > 0 else 0
+            text = f"{name}: {seconds * 1000:.2f} ms ({share:.1f}%)"
+            if name in memory:
+                text += (f" - pico {memory[name]['peak_bytes'] / 1024:.1f} KiB, "
+                         f"retenida {memory[name]['retained_bytes'] / 1024:.1f} KiB")
+            ttk.Label(self.timings_frame, text=text).pack(anchor="w")
+        ttk.Label(self.timings_frame, text=f"Total: {total * 1000:.2f} ms").pack(anchor="w", pady=(5, 0))
+        if 'memory_peak_bytes' in timings:
+            ttk.Label(self.timings_frame,
+                      text=f"Pico de memoria: {timings['memory_peak_bytes'] / 1024:.1f} KiB").pack(anchor="w")
+
+        ttk.Button(self.timings_frame, text="Exportar tiempos (JSON)",
+                   command=self.export_timings).pack(anchor="w", pady=(5, 0))
+
+    def export_timings(self):
+        """Guarda los tiempos por fase en un archivo JSON"""
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("Archivos JSON", "*.json")],
+            title="Guardar tiempos"
+        )
+        if not filename:
+            return
+        try:
+            self.timer.export_json(filename)
+        except OSError as e:
+            messagebox.showerror("Error", f"Error al guardar los tiempos: {str(e)}")
+
+    def update_info(self):
+        # Limpiar frame
+        for widget in self.info_frame.winfo_children():
+            widget.destroy()
 
+        # Tabla de códigos de cada algoritmo
+        for results in self.results.values():
+            if not results.get('codes'):
+                continue
+            info = ttk.LabelFrame(self.info_frame, text=self.codes_title(results), padding="10")
+            info.pack(fill="x", padx=10, pady=5)
+
+            codes_text = scrolledtext.ScrolledText(info, height=10)
+            codes_text.pack(fill="both", expand=True)
+            codes_text.insert(1.0, self.format_codes(results['codes']))
+            codes_text.config(state=tk.DISABLED)
+
+    @staticmethod
+    def codes_title(results):
+        """Título de la tabla de códigos (aclara si los símbolos son los transformados)"""
+        if StatisticsCalculator.describes_source(results):
+            return results['algorithm']
+        return f"{results['algorithm']} (símbolos MTF/RLE, no caracteres del texto)"
+
+    def format_codes(self, codes):
+        """Listado 'símbolo -> código' ordenado por símbolo"""
         codes_info = "Símbolo -> Código\n" + "-" * 20 + "\n"
-        for char, code in sorted(self.shannon_fano_results['codes'].items()):
+        for char, code in sorted(codes.items()):
             display_char = char
             if char == ' ':
                 display_char = '[ESPACIO]'
@@ -171,10 +403,10 @@ class MainWindow:
                 display_char = '[NUEVA_LÍNEA]'
             elif char == '\t':
                 display_char = '[TAB]'
+            elif not char.isprintable():
+                display_char = f'[U+{ord(char):04X}]'
             codes_info += f"'{display_char}' -> {code}\n"
-
-        codes_text.insert(1.0, codes_info)
-        codes_text.config(state=tk.DISABLED)
+        return codes_info
 
     def update_encoded_messages(self):
         """Actualiza la pestaña de mensajes codificados"""
@@ -182,7 +414,7 @@ class MainWindow:
         for widget in self.encoded_frame.winfo_children():
             widget.destroy()
         
-        if not self.huffman_results or not self.shannon_fano_results:
+        if not self.results:
             return
         
         # Frame principal con scroll
@@ -207,35 +439,21 @@ class MainWindow:
         original_text.insert(1.0, self.text_data)
         original_text.config(state=tk.DISABLED)
         
-        # Mensaje codificado Huffman
-        huffman_frame = ttk.LabelFrame(scrollable_frame, text="Mensaje Codificado - Huffman", padding="10")
-        huffman_frame.pack(fill="x", padx=10, pady=5)
-        
-        huffman_encoded = scrolledtext.ScrolledText(huffman_frame, height=8, width=100, wrap=tk.WORD)
-        huffman_encoded.pack(fill="both", expand=True)
-        huffman_encoded.insert(1.0, self.huffman_results['encoded_text'])
-        huffman_encoded.config(state=tk.DISABLED)
-        
-        # Información Huffman
-        huffman_info = ttk.Frame(huffman_frame)
-        huffman_info.pack(fill="x", pady=(5, 0))
-        ttk.Label(huffman_info, text=f"Longitud: {len(self.huffman_results['encoded_text'])} bits").pack(side="left")
-        ttk.Label(huffman_info, text=f"Tamaño original: {len(self.text_data) * 8} bits").pack(side="left", padx=(20, 0))
-        
-        # Mensaje codificado Shannon-Fano
-        sf_frame = ttk.LabelFrame(scrollable_frame, text="Mensaje Codificado - Shannon-Fano", padding="10")
-        sf_frame.pack(fill="x", padx=10, pady=5)
-        
-        sf_encoded = scrolledtext.ScrolledText(sf_frame, height=8, width=100, wrap=tk.WORD)
-        sf_encoded.pack(fill="both", expand=True)
-        sf_encoded.insert(1.0, self.shannon_fano_results['encoded_text'])
-        sf_encoded.config(state=tk.DISABLED)
-        
-        # Información Shannon-Fano
-        sf_info = ttk.Frame(sf_frame)
-        sf_info.pack(fill="x", pady=(5, 0))
-        ttk.Label(sf_info, text=f"Longitud: {len(self.shannon_fano_results['encoded_text'])} bits").pack(side="left")
-        ttk.Label(sf_info, text=f"Tamaño original: {len(self.text_data) * 8} bits").pack(side="left", padx=(20, 0))
+        # Mensaje codificado de cada algoritmo
+        for results in self.results.values():
+            frame = ttk.LabelFrame(scrollable_frame, text=f"Mensaje Codificado - {results['algorithm']}",
+                                   padding="10")
+            frame.pack(fill="x", padx=10, pady=5)
+            
+            encoded = scrolledtext.ScrolledText(frame, height=8, width=100, wrap=tk.WORD)
+            encoded.pack(fill="both", expand=True)
+            encoded.insert(1.0, results['encoded_text'])
+            encoded.config(state=tk.DISABLED)
+            
+            info = ttk.Frame(frame)
+            info.pack(fill="x", pady=(5, 0))
+            ttk.Label(info, text=f"Longitud: {results.bit_length} bits").pack(side="left")
+            ttk.Label(info, text=f"Tamaño original: {results['statistics']['original_bits']} bits").pack(side="left", padx=(20, 0))
         
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
@@ -246,22 +464,19 @@ class MainWindow:
         for widget in self.decoding_frame.winfo_children():
             widget.destroy()
         
-        if not self.huffman_results or not self.shannon_fano_results:
+        if not self.results:
             return
         
-        # Notebook para separar los procesos
+        # Notebook para separar los procesos (solo algoritmos con tabla de códigos)
         decoding_notebook = ttk.Notebook(self.decoding_frame)
         decoding_notebook.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Proceso Huffman
-        huffman_decode_frame = ttk.Frame(decoding_notebook)
-        decoding_notebook.add(huffman_decode_frame, text="Decodificación Huffman")
-        self.create_decoding_demo(huffman_decode_frame, self.huffman_results, "Huffman")
-        
-        # Proceso Shannon-Fano
-        sf_decode_frame = ttk.Frame(decoding_notebook)
-        decoding_notebook.add(sf_decode_frame, text="Decodificación Shannon-Fano")
-        self.create_decoding_demo(sf_decode_frame, self.shannon_fano_results, "Shannon-Fano")
+        for results in self.results.values():
+            if not results.get('codes'):
+                continue
+            decode_frame = ttk.Frame(decoding_notebook)
+            decoding_notebook.add(decode_frame, text=f"Decodificación {results['algorithm']}")
+            self.create_decoding_demo(decode_frame, results, results['algorithm'])
 
     def create_decoding_demo(self, parent, results, algorithm):
         """Crea una demostración del proceso de decodificación"""
@@ -279,24 +494,14 @@ class MainWindow:
         canvas.configure(yscrollcommand=scrollbar.set)
         
         # Tabla de códigos
-        codes_frame = ttk.LabelFrame(scrollable_frame, text=f"Tabla de Códigos - {algorithm}", padding="10")
+        codes_frame = ttk.LabelFrame(scrollable_frame, text=f"Tabla de Códigos - {self.codes_title(results)}",
+                                     padding="10")
         codes_frame.pack(fill="x", padx=10, pady=5)
         
         codes_text = scrolledtext.ScrolledText(codes_frame, height=8, width=80)
         codes_text.pack(fill="both", expand=True)
         
-        codes_info = "Símbolo -> Código\n" + "-" * 20 + "\n"
-        for char, code in sorted(results['codes'].items()):
-            display_char = char
-            if char == ' ':
-                display_char = '[ESPACIO]'
-            elif char == '\n':
-                display_char = '[NUEVA_LÍNEA]'
-            elif char == '\t':
-                display_char = '[TAB]'
-            codes_info += f"'{display_char}' -> {code}\n"
-        
-        codes_text.insert(1.0, codes_info)
+        codes_text.insert(1.0, self.format_codes(results['codes']))
         codes_text.config(state=tk.DISABLED)
         
         # Proceso de decodificación paso a paso
@@ -307,7 +512,7 @@ class MainWindow:
         process_text.pack(fill="both", expand=True)
         
         # Simular decodificación paso a paso
-        encoded = results['encoded_text'][:200]  # Limitar para demostración
+        encoded = results.encoded_prefix(200)  # Limitar para demostración
         decoded_demo = self.simulate_decoding_process(encoded, results['codes'], algorithm)
         
         process_text.insert(1.0, decoded_demo)
@@ -343,8 +548,10 @@ class MainWindow:
                     display_char = '[NL]'
                 elif char == '\t':
                     display_char = '[TAB]'
+                elif not char.isprintable():
+                    display_char = f'[U+{ord(char):04X}]'
                 
-                decoded_chars.append(char)
+                decoded_chars.append(char if char.isprintable() or char.isspace() else display_char)
                 process_text += f"Paso {step}: '{current_code}' -> '{display_char}'\n"
                 process_text += f"   Decodificado hasta ahora: {''.join(decoded_chars)}\n\n"
                 
@@ -361,67 +568,153 @@ class MainWindow:
         return process_text
 
     def update_trees(self):
-        """Actualiza la pestaña de árboles de codificación"""
+        """
+        Actualiza la pestaña de árboles de codificación
+
+        Si las tablas de códigos no cambiaron (por ejemplo, al volver a procesar
+        el mismo texto), se conservan los lienzos ya dibujados y solo se
+        actualizan los pasos de decodificación.
+        """
+        layouts = {}
+        for name, results in self.results.items():
+            codec = get_codec(name)
+            if codec.has_tree:
+                layouts[name] = codec.tree_layout(results)
+
+        current = {name: view['canvas'].layout['key'] for name, view in self.tree_views.items()}
+        if self.tree_views and current == {name: layout['key'] for name, layout in layouts.items()
+                                   if layout is not None}:
+            for name, view in self.tree_views.items():
+                self.set_tree_steps(view, self.results[name])
+            return
+
         # Limpiar frame
+        for view in self.tree_views.values():
+            plt.close(view['canvas'].figure)
+        self.tree_views = {}
         for widget in self.trees_frame.winfo_children():
             widget.destroy()
         
-        if not self.huffman_results or not self.shannon_fano_results:
+        if not layouts:
             return
         
         # Notebook para separar los árboles
         trees_notebook = ttk.Notebook(self.trees_frame)
         trees_notebook.pack(fill="both", expand=True, padx=10, pady=10)
         
-        # Árbol Huffman
-        huffman_tree_frame = ttk.Frame(trees_notebook)
-        trees_notebook.add(huffman_tree_frame, text="Árbol Huffman")
-        
-        # Árbol Shannon-Fano
-        sf_tree_frame = ttk.Frame(trees_notebook)
-        trees_notebook.add(sf_tree_frame, text="Árbol Shannon-Fano")
-        
-        # Crear visualizaciones
-        from utils.tree_visualizer import TreeVisualizer
-        tree_viz = TreeVisualizer()
-        
-        # Visualizar árbol Huffman
-        if 'tree' in self.huffman_results:
-            huffman_fig = tree_viz.visualize_huffman_tree(self.huffman_results['tree'])
-            huffman_canvas = FigureCanvasTkAgg(huffman_fig, huffman_tree_frame)
-            huffman_canvas.draw()
-            huffman_canvas.get_tk_widget().pack(fill="both", expand=True)
-        
-        # Visualizar árbol Shannon-Fano
-        sf_fig = tree_viz.visualize_shannon_fano_tree(self.shannon_fano_results)
-        sf_canvas = FigureCanvasTkAgg(sf_fig, sf_tree_frame)
-        sf_canvas.draw()
-        sf_canvas.get_tk_widget().pack(fill="both", expand=True)
+        for name, layout in layouts.items():
+            codec = get_codec(name)
+            tree_frame = ttk.Frame(trees_notebook)
+            trees_notebook.add(tree_frame, text=f"Árbol {codec.label}")
+            controls = ttk.Frame(tree_frame)
+            controls.pack(fill="x", padx=5, pady=5)
+            ttk.Button(controls, text="Exportar árbol (SVG/DOT)",
+                       command=lambda name=name: self.export_tree(name)).pack(side="right")
+            if layout is None:
+                continue
+
+            ttk.Label(controls, text="Paso de decodificación:").pack(side="left")
+            step_var = tk.IntVar(value=0)
+            spinbox = ttk.Spinbox(controls, from_=0, to=0, width=5, textvariable=step_var,
+                                  state="readonly")
+            spinbox.pack(side="left", padx=5)
+            step_label = ttk.Label(controls, text="")
+            step_label.pack(side="left")
+
+            tree_canvas = TreeCanvas(codec.tree_figure(self.results[name]), layout, tree_frame)
+            tree_canvas.draw()
+            tree_canvas.get_tk_widget().pack(fill="both", expand=True)
+
+            view = {'canvas': tree_canvas, 'step_var': step_var, 'spinbox': spinbox,
+                    'label': step_label, 'steps': []}
+            spinbox.configure(command=lambda view=view: self.show_tree_step(view))
+            self.tree_views[name] = view
+            self.set_tree_steps(view, self.results[name])
+
+    def set_tree_steps(self, view, results):
+        """Carga los primeros símbolos del mensaje como pasos de decodificación"""
+        view['steps'] = self.decoding_steps(results.encoded_prefix(200), results['codes'])
+        view['spinbox'].configure(to=len(view['steps']))
+        view['step_var'].set(0)
+        self.show_tree_step(view)
+
+    def show_tree_step(self, view):
+        """Resalta en el árbol el código del paso elegido (0: sin resaltado)"""
+        step = view['step_var'].get()
+        if 0 < step <= len(view['steps']):
+            char, code = view['steps'][step - 1]
+            display_char = {' ': '[ESPACIO]', '\n': '[NUEVA_LÍNEA]', '\t': '[TAB]'}.get(char, char)
+            view['label'].configure(text=f"Paso {step}: '{code}' -> '{display_char}'")
+            view['canvas'].highlight(code)
+        else:
+            view['label'].configure(text="")
+            view['canvas'].highlight("")
+
+    @staticmethod
+    def decoding_steps(encoded_text, codes, limit=20):
+        """Símbolos (carácter, código) que decodifican los primeros bits del mensaje"""
+        reverse_codes = {code: char for char, code in codes.items()}
+        steps = []
+        current_code = ""
+        for bit in encoded_text:
+            current_code += bit
+            if current_code in reverse_codes:
+                steps.append((reverse_codes[current_code], current_code))
+                current_code = ""
+                if len(steps) >= limit:
+                    break
+        return steps
+
+    def export_tree(self, name):
+        """Exporta un árbol a SVG o DOT para verlo en un navegador o en Graphviz"""
+        codec = get_codec(name)
+        filename = filedialog.asksaveasfilename(
+            defaultextension=".svg",
+            filetypes=[("SVG", "*.svg"), ("Graphviz DOT", "*.dot")],
+            title=f"Exportar árbol {codec.label}"
+        )
+        if not filename:
+            return
+
+        try:
+            codec.export_tree(self.results[name], filename)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Error al exportar el árbol: {str(e)}")
 
     def compress_text(self):
         self.process_text()
 
     def process_text(self):
-        """Procesa el texto con ambos algoritmos"""
+        """Procesa el texto con todos los algoritmos registrados"""
         self.text_data = self.text_area.get(1.0, tk.END).strip()
         
         if not self.text_data:
             messagebox.showwarning("Advertencia", "Por favor ingrese texto para procesar")
             return
             
+        detailed = self.profile_var.get()
+        self.timer = PhaseTimer(profile=detailed, trace_memory=detailed)
+        stats_calc = StatisticsCalculator()
+            
         try:
-            # Procesar con Huffman
-            huffman = HuffmanCoding()
-            self.huffman_results = huffman.encode(self.text_data)
+            self.timer.start()
+            
+            # Todos los algoritmos registrados, en paralelo y con la misma tabla de frecuencias;
+            # con textos grandes se usan procesos y los mensajes vuelven por memoria compartida
+            # (se libera al descartar los resultados, aunque una exportación en curso los retenga)
+            self.results = compare_codecs(self.text_data, timer=self.timer)
             
-            # Procesar con Shannon-Fano
-            shannon_fano = ShannonFanoCoding()
-            self.shannon_fano_results = shannon_fano.encode(self.text_data)
+            # Compresores de referencia
+            with self.timer.phase('baselines'):
+                self.baseline_results = stats_calc.calculate_baselines(self.text_data)
             
             # Actualizar interfaz
             self.update_results()
+            self.timer.stop()
+            self.show_timings()
             
             messagebox.showinfo("Éxito", "Texto procesado correctamente")
             
         except Exception as e:
+            self.timer.stop()
             messagebox.showerror("Error", f"Error al procesar el texto: {str(e)}")
@@ -0,0 +1,81 @@
+"""
+Lienzo de árboles de codificación con resaltado por blitting
+Reutiliza el árbol ya rasterizado y redibuja solo el camino resaltado
+"""
+
+from collections import OrderedDict
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import LineCollection
+
+from utils.tree_visualizer import TreeVisualizer
+
+
+class TreeCanvas(FigureCanvasTkAgg):
+    """
+    FigureCanvasTkAgg para una figura de TreeVisualizer.layout_figure()
+
+    El árbol se rasteriza completo una sola vez por tamaño de ventana: tras
+    cada dibujo completo se guarda el mapa de bits de fondo (todo salvo los
+    artistas animados del resaltado). Al volver a un tamaño ya visto o al
+    cambiar el resaltado se restaura ese fondo y solo se dibujan encima el
+    camino y los nodos resaltados.
+    """
+
+    BACKGROUND_CACHE_SIZE = 4
+
+    def __init__(self, figure, layout, master=None):
+        super().__init__(figure, master)
+        self.layout = layout
+        self.ax = figure.axes[0]
+        self._backgrounds = OrderedDict()
+
+        # Los artistas animados no forman parte del fondo guardado
+        self._path_edges = LineCollection([], colors='orange', linewidths=5, alpha=0.9,
+                                          zorder=5, animated=True)
+        self.ax.add_collection(self._path_edges)
+        self._path_nodes, = self.ax.plot([], [], 'o', markersize=22, markerfacecolor='none',
+                                         markeredgecolor='orange', markeredgewidth=3,
+                                         zorder=6, animated=True)
+        self.mpl_connect('draw_event', self._on_draw)
+
+    def _size_key(self):
+        bbox = self.figure.bbox
+        return int(bbox.width), int(bbox.height), self.figure.dpi
+
+    def draw(self):
+        """Dibuja el árbol, reutilizando el fondo si ya se rasterizó con este tamaño"""
+        background = self._backgrounds.get(self._size_key())
+        if background is None:
+            # El dibujo completo dispara draw_event, que guarda el fondo
+            super().draw()
+            return
+        self._backgrounds.move_to_end(self._size_key())
+        self._blit(background)
+
+    def _on_draw(self, event):
+        self._backgrounds[self._size_key()] = self.copy_from_bbox(self.figure.bbox)
+        if len(self._backgrounds) > self.BACKGROUND_CACHE_SIZE:
+            self._backgrounds.popitem(last=False)
+        self._draw_highlight()
+
+    def _draw_highlight(self):
+        self.ax.draw_artist(self._path_edges)
+        self.ax.draw_artist(self._path_nodes)
+
+    def _blit(self, background):
+        self.restore_region(background)
+        self._draw_highlight()
+        self.blit(self.figure.bbox)
+
+    def highlight(self, bits):
+        """Resalta el recorrido de unos bits desde la raíz ("" borra el resaltado)"""
+        segments, points = TreeVisualizer.path(self.layout, bits) if bits else ([], [])
+        self._path_edges.set_segments(segments)
+        self._path_nodes.set_data([x for x, _ in points], [y for _, y in points])
+
+        background = self._backgrounds.get(self._size_key())
+        if background is None:
+            self.draw_idle()
+        else:
+            self._blit(background)
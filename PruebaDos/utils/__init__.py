@@ -3,16 +3,29 @@ Paquete de utilidades
 Contiene herramientas para cálculos, visualización y exportación
 """
 
-from .frequency_calculator import FrequencyCalculator
+from .frequency_calculator import FrequencyCalculator, IncrementalFrequencyCounter
 from .statistics import StatisticsCalculator
 from .visualizer import DataVisualizer
 from .pdf_exporter import PDFExporter
 from .tree_visualizer import TreeVisualizer
+from .batch_processor import BatchProcessor
+from .profiler import PhaseTimer
+from .tree_exporter import TreeExporter
+from .roundtrip_fuzzer import RoundTripFuzzer
+from .shared_buffer import SharedBuffer
+from .checkpoint import CheckpointFile
 
 __all__ = [
     'FrequencyCalculator', 
+    'IncrementalFrequencyCounter',
     'StatisticsCalculator', 
     'DataVisualizer', 
     'PDFExporter',
-    'TreeVisualizer'
+    'TreeVisualizer',
+    'BatchProcessor',
+    'PhaseTimer',
+    'TreeExporter',
+    'RoundTripFuzzer',
+    'SharedBuffer',
+    'CheckpointFile'
 ]
@@ -0,0 +1,208 @@
+"""
+Utilidad para compresión por lotes
+Procesa todos los archivos de un directorio con ambos algoritmos y genera un reporte consolidado
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+ALGORITHMS = ('huffman', 'shannon_fano')
+BASELINES = ('zlib', 'bz2', 'lzma')
+
+
+def _process_file(path, encoding):
+    """
+    Comprime un archivo con ambos algoritmos (se ejecuta en un proceso de trabajo)
+
+    Solo devuelve estadísticas: ni el texto ni los mensajes codificados viajan
+    de vuelta al proceso principal.
+    """
+    from algorithms.huffman import HuffmanCoding
+    from algorithms.shannon_fano import ShannonFanoCoding
+    from utils.statistics import StatisticsCalculator
+
+    entry = {'path': path, 'status': 'ok', 'error': ''}
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        entry['size_bytes'] = len(raw)
+        text = raw.decode(encoding, errors='replace')
+        entry['chars'] = len(text)
+
+        if not text:
+            entry['status'] = 'skipped'
+            return entry
+
+        # Referencias sobre los bytes originales del archivo
+        stats_calc = StatisticsCalculator()
+        for name, baseline in stats_calc.calculate_baselines(raw).items():
+            entry[f'{name}_output_bytes'] = baseline['bytes']
+            entry[f'{name}_compression_ratio'] = baseline['compression_ratio']
+            entry[f'{name}_seconds'] = baseline['seconds']
+        del raw
+
+        engines = {'huffman': HuffmanCoding(), 'shannon_fano': ShannonFanoCoding()}
+        for name in ALGORITHMS:
+            start = time.perf_counter()
+            results = engines[name].encode(text)
+            elapsed = time.perf_counter() - start
+
+            stats = stats_calc.calculate_statistics(text, results['frequencies'], results['codes'],
+                                                    entry['size_bytes'])
+            entry['unique_symbols'] = len(results['frequencies'])
+            entry[f'{name}_compressed_bits'] = stats['compressed_bits']
+            entry[f'{name}_output_bytes'] = stats['container_bytes']
+            entry[f'{name}_avg_length'] = stats['avg_length']
+            entry[f'{name}_efficiency'] = stats['efficiency']
+            entry[f'{name}_compression_ratio'] = stats['compression_ratio']
+            entry[f'{name}_seconds'] = elapsed
+            entry[f'{name}_throughput_mb_s'] = (
+                entry['size_bytes'] / elapsed / 1e6 if elapsed > 0 else 0.0
+            )
+            entry['entropy'] = stats['total_entropy']
+            del results
+    except Exception as e:
+        entry['status'] = 'error'
+        entry['error'] = str(e)
+    return entry
+
+
+class BatchProcessor:
+    """Procesador de directorios completos con un pool de procesos"""
+
+    CSV_FIELDS = [
+        'path', 'status', 'error', 'size_bytes', 'chars', 'unique_symbols', 'entropy'
+    ] + [
+        f'{name}_{field}'
+        for name in ALGORITHMS
+        for field in ('compressed_bits', 'output_bytes', 'avg_length', 'efficiency',
+                      'compression_ratio', 'seconds', 'throughput_mb_s')
+    ] + [
+        f'{name}_{field}'
+        for name in BASELINES
+        for field in ('output_bytes', 'compression_ratio', 'seconds')
+    ]
+
+    def __init__(self, max_workers=None, recursive=True, encoding='utf-8', max_pending=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.recursive = recursive
+        self.encoding = encoding
+        # Limita las tareas en vuelo para no recorrer todo el directorio de golpe
+        self.max_pending = max_pending or self.max_workers * 4
+
+    def iter_files(self, directory):
+        """Recorre el directorio de forma perezosa devolviendo rutas de archivos"""
+        if self.recursive:
+            for dirpath, dirnames, filenames in os.walk(directory):
+                dirnames.sort()
+                for filename in sorted(filenames):
+                    yield os.path.join(dirpath, filename)
+        else:
+            for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+                if entry.is_file():
+                    yield entry.path
+
+    def iter_results(self, directory):
+        """Procesa los archivos en paralelo y devuelve cada resultado al completarse"""
+        files = self.iter_files(directory)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            for path in files:
+                pending.add(executor.submit(_process_file, path, self.encoding))
+                if len(pending) >= self.max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def process_directory(self, directory, csv_path=None, json_path=None, pdf_path=None,
+                          progress=None):
+        """
+        Procesa un directorio completo y genera el reporte consolidado
+
+        Args:
+            directory (str): Directorio a analizar
+            csv_path (str): Archivo CSV de salida (una fila por archivo, se escribe a medida que avanza)
+            json_path (str): Archivo JSON de salida con el reporte completo
+            pdf_path (str): Archivo PDF de salida (opcional, usa PDFExporter)
+            progress (callable): Se invoca con cada resultado por archivo
+
+        Returns:
+            dict: Reporte con 'directory', 'summary' y 'files'
+        """
+        start = time.perf_counter()
+        files = []
+
+        csv_file = open(csv_path, 'w', newline='', encoding='utf-8') if csv_path else None
+        try:
+            writer = None
+            if csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=self.CSV_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+
+            for entry in self.iter_results(directory):
+                files.append(entry)
+                if writer:
+                    writer.writerow(entry)
+                if progress:
+                    progress(entry)
+        finally:
+            if csv_file:
+                csv_file.close()
+
+        files.sort(key=lambda e: e['path'])
+        report = {
+            'directory': os.path.abspath(directory),
+            'summary': self.summarize(files, time.perf_counter() - start),
+            'files': files
+        }
+
+        if json_path:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        if pdf_path:
+            from utils.pdf_exporter import PDFExporter
+            PDFExporter().export_batch_report(pdf_path, report)
+
+        return report
+
+    def summarize(self, files, wall_seconds):
+        """Calcula las estadísticas agregadas del lote"""
+        processed = [e for e in files if e['status'] == 'ok']
+        total_bytes = sum(e['size_bytes'] for e in processed)
+        total_chars = sum(e['chars'] for e in processed)
+
+        summary = {
+            'files_total': len(files),
+            'files_ok': len(processed),
+            'files_skipped': sum(1 for e in files if e['status'] == 'skipped'),
+            'files_failed': sum(1 for e in files if e['status'] == 'error'),
+            'total_bytes': total_bytes,
+            'total_chars': total_chars,
+            'wall_seconds': wall_seconds,
+            'throughput_mb_s': total_bytes / wall_seconds / 1e6 if wall_seconds > 0 else 0.0,
+            'workers': self.max_workers
+        }
+
+        for name in ALGORITHMS + BASELINES:
+            output_bytes = sum(e[f'{name}_output_bytes'] for e in processed)
+            cpu_seconds = sum(e[f'{name}_seconds'] for e in processed)
+            if name in ALGORITHMS:
+                summary[f'{name}_compressed_bits'] = sum(e[f'{name}_compressed_bits']
+                                                         for e in processed)
+            summary[f'{name}_output_bytes'] = output_bytes
+            summary[f'{name}_compression_ratio'] = (
+                (total_bytes - output_bytes) / total_bytes * 100 if total_bytes else 0.0
+            )
+            summary[f'{name}_cpu_seconds'] = cpu_seconds
+            summary[f'{name}_throughput_mb_s'] = (
+                total_bytes / cpu_seconds / 1e6 if cpu_seconds > 0 else 0.0
+            )
+        return summary
@@ -0,0 +1,69 @@
+"""
+Utilidad de puntos de control
+Guarda el progreso de trabajos largos para poder reanudarlos tras una interrupción
+"""
+
+import json
+import os
+
+
+class CheckpointFile:
+    """
+    Punto de control en un archivo JSON junto a la salida de un trabajo
+
+    Cada save() reemplaza el archivo de forma atómica (se escribe una copia
+    temporal y se renombra), así que tras una caída queda el punto anterior o
+    el nuevo, nunca uno a medio escribir. El estado incluye una identidad del
+    trabajo (archivo de entrada, tamaño, fecha de modificación y opciones): si
+    al reanudar no coincide, el punto de control se descarta.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path):
+        self.path = path
+
+    @staticmethod
+    def identity(src, **options):
+        """Identidad de un trabajo: entrada (ruta, tamaño, fecha) y opciones"""
+        stat = os.stat(src)
+        return {
+            'src': os.path.abspath(src),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'options': options
+        }
+
+    def load(self, identity):
+        """
+        Lee el estado guardado para un trabajo
+
+        Returns:
+            dict | None: Estado de save(), o None si no hay punto de control
+                válido para esta identidad
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != self.VERSION or data.get('identity') != identity:
+            return None
+        return data.get('state')
+
+    def save(self, identity, state):
+        """Reemplaza el punto de control con un estado nuevo"""
+        temp = self.path + '.tmp'
+        with open(temp, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'identity': identity, 'state': state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.path)
+
+    def clear(self):
+        """Elimina el punto de control al terminar el trabajo"""
+        for path in (self.path, self.path + '.tmp'):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,287 @@
+"""
+Utilidad de servidor local de compresión
+Mantiene los compresores cargados y atiende solicitudes por socket con un protocolo simple
+"""
+
+import os
+import socket
+import socketserver
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from algorithms.file_codec import FileCodec
+
+# Protocolo: cada mensaje es un entero u32 big-endian con la longitud del cuerpo
+# seguido del cuerpo.
+#   Solicitud: operación (1 byte) | algoritmo (1 byte) | datos
+#   Respuesta: estado (1 byte: 0 = ok, 1 = error) | datos o mensaje de error
+FRAME = struct.Struct('>I')
+OP_COMPRESS = b'C'
+OP_DECOMPRESS = b'D'
+OP_PING = b'P'
+STATUS_OK = 0
+STATUS_ERROR = 1
+ALGORITHM_IDS = FileCodec.ALGORITHMS
+ALGORITHM_NAMES = {value: name for name, value in ALGORITHM_IDS.items()}
+
+_codecs = None
+
+
+def _init_codecs():
+    """Crea los compresores del proceso actual (una vez por proceso)"""
+    global _codecs
+    if _codecs is None:
+        _codecs = {name: FileCodec(algorithm=name) for name in ALGORITHM_IDS}
+    return _codecs
+
+
+def _execute(op, algorithm, data):
+    """Atiende una operación con los compresores ya cargados en el proceso"""
+    codecs = _init_codecs()
+    if op == OP_COMPRESS:
+        return codecs[algorithm].compress_bytes(data.decode('utf-8'))
+    if op == OP_DECOMPRESS:
+        return codecs[algorithm].decompress_bytes(data).encode('utf-8')
+    if op == OP_PING:
+        return b""
+    raise ValueError(f"Operación desconocida: {op!r}")
+
+
+def _recv_exact(sock_file, size):
+    """Lee exactamente size bytes (None si la conexión se cerró)"""
+    data = sock_file.read(size)
+    if len(data) < size:
+        return None
+    return data
+
+
+def parse_address(address):
+    """
+    Interpreta una dirección de servidor
+
+    'unix:/ruta/al/socket' usa un socket Unix; 'host:puerto' o 'puerto' usa TCP.
+
+    Returns:
+        tuple: (familia, dirección)
+
+    Raises:
+        ValueError: Si la dirección es 'unix:' y la plataforma no tiene sockets Unix
+    """
+    if address.startswith('unix:'):
+        if not hasattr(socket, 'AF_UNIX'):
+            raise ValueError(f"Esta plataforma no admite sockets Unix: {address!r}; "
+                             "use una dirección 'host:puerto'")
+        return socket.AF_UNIX, address[len('unix:'):]
+    host, _, port = address.rpartition(':')
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+# ThreadingUnixStreamServer solo existe donde hay sockets Unix (no en Windows)
+if hasattr(socket, 'AF_UNIX'):
+    class _ThreadingUnixStreamServer(socketserver.ThreadingUnixStreamServer):
+        allow_reuse_address = True
+        daemon_threads = True
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Atiende una conexión persistente; las respuestas salen en orden de llegada"""
+
+    def setup(self):
+        super().setup()
+        if self.server.address_family == socket.AF_INET:
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        while True:
+            header = _recv_exact(self.rfile, FRAME.size)
+            if header is None:
+                return
+            (length,) = FRAME.unpack(header)
+            body = _recv_exact(self.rfile, length)
+            if body is None or length < 2:
+                return
+
+            op = body[:1]
+            try:
+                algorithm = ALGORITHM_NAMES[body[1]]
+                data = body[2:]
+                if len(data) <= self.server.inline_limit or self.server.pool is None:
+                    result = _execute(op, algorithm, data)
+                else:
+                    result = self.server.pool.submit(_execute, op, algorithm, data).result()
+                response = bytes([STATUS_OK]) + result
+            except Exception as e:
+                response = bytes([STATUS_ERROR]) + str(e).encode('utf-8')
+
+            self.wfile.write(FRAME.pack(len(response)) + response)
+
+
+class CompressionServer:
+    """
+    Servidor local de compresión con procesos de trabajo persistentes
+
+    Los mensajes pequeños se atienden directamente en el hilo de la conexión
+    (los compresores ya están cargados); los grandes se envían al pool de
+    procesos para no competir por el GIL.
+    """
+
+    def __init__(self, address='127.0.0.1:8765', workers=None, inline_limit=64 * 1024):
+        family, self.address = parse_address(address)
+        if family == socket.AF_UNIX:
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            server_class = _ThreadingUnixStreamServer
+        else:
+            server_class = _ThreadingTCPServer
+
+        self._server = server_class(self.address, _RequestHandler)
+        self._server.inline_limit = inline_limit
+        self._server.pool = None
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        _init_codecs()
+
+    @property
+    def server_address(self):
+        """Dirección efectiva (útil si se pidió el puerto 0)"""
+        return self._server.server_address
+
+    def serve_forever(self):
+        """Inicia los procesos de trabajo y atiende solicitudes hasta shutdown()"""
+        if self.workers > 0:
+            self._server.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                    initializer=_init_codecs)
+            # Precalentar los procesos para que la primera solicitud no pague el arranque
+            for future in [self._server.pool.submit(_init_codecs) for _ in range(self.workers)]:
+                future.result()
+        try:
+            self._server.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self):
+        """Detiene el bucle de serve_forever() (llamar desde otro hilo)"""
+        self._server.shutdown()
+
+    def close(self):
+        """Libera el socket y los procesos de trabajo"""
+        self._server.server_close()
+        if self._server.pool is not None:
+            self._server.pool.shutdown()
+            self._server.pool = None
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+class CompressionClient:
+    """Cliente del servidor de compresión sobre una conexión persistente"""
+
+    def __init__(self, address='127.0.0.1:8765'):
+        family, target = parse_address(address)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        self._sock.connect(target)
+        if family == socket.AF_INET:
+            self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile('rb')
+
+    def _frame(self, op, algorithm, data):
+        body = op + bytes([ALGORITHM_IDS[algorithm]]) + data
+        return FRAME.pack(len(body)) + body
+
+    def _read_frame(self):
+        """Lee una respuesta completa y devuelve (estado, datos)"""
+        header = _recv_exact(self._file, FRAME.size)
+        if header is None:
+            raise ConnectionError("El servidor cerró la conexión")
+        (length,) = FRAME.unpack(header)
+        body = _recv_exact(self._file, length)
+        if body is None or length < 1:
+            raise ConnectionError("El servidor cerró la conexión")
+        return body[0], body[1:]
+
+    def _read_response(self):
+        status, data = self._read_frame()
+        if status != STATUS_OK:
+            raise ValueError(data.decode('utf-8', errors='replace'))
+        return data
+
+    def compress(self, text, algorithm='huffman'):
+        """Comprime un texto y devuelve el contenido comprimido"""
+        self._sock.sendall(self._frame(OP_COMPRESS, algorithm, text.encode('utf-8')))
+        return self._read_response()
+
+    def decompress(self, data):
+        """Descomprime un contenido generado por compress()"""
+        self._sock.sendall(self._frame(OP_DECOMPRESS, 'huffman', bytes(data)))
+        return self._read_response().decode('utf-8')
+
+    def ping(self):
+        """Comprueba que el servidor responde"""
+        self._sock.sendall(self._frame(OP_PING, 'huffman', b""))
+        self._read_response()
+
+    def _pipeline(self, frames, count):
+        """
+        Envía solicitudes encadenadas mientras lee las respuestas
+
+        El envío ocurre en otro hilo para que los búferes del socket no se
+        llenen en ambos sentidos a la vez con lotes grandes. Siempre se leen
+        las count respuestas, aunque alguna sea un error, para que el servidor
+        no se bloquee escribiendo y la conexión quede lista para la siguiente
+        llamada; los errores se informan al final. Si la conexión falla, el
+        socket se cierra antes de esperar al hilo de envío.
+        """
+        sender = threading.Thread(target=self._sock.sendall, args=(b"".join(frames),),
+                                  daemon=True)
+        sender.start()
+        results = []
+        errors = []
+        try:
+            for index in range(count):
+                status, data = self._read_frame()
+                if status != STATUS_OK:
+                    errors.append((index, data.decode('utf-8', errors='replace')))
+                results.append(data)
+        except BaseException:
+            self.close()
+            raise
+        finally:
+            sender.join()
+
+        if errors:
+            index, message = errors[0]
+            raise ValueError(f"{len(errors)} de {count} solicitudes fallaron; "
+                             f"primera (#{index}): {message}")
+        return results
+
+    def compress_many(self, texts, algorithm='huffman'):
+        """Comprime varios textos con solicitudes encadenadas en la misma conexión"""
+        texts = list(texts)
+        frames = [self._frame(OP_COMPRESS, algorithm, text.encode('utf-8')) for text in texts]
+        return self._pipeline(frames, len(texts))
+
+    def decompress_many(self, items):
+        """Versión en lote de decompress() con solicitudes encadenadas"""
+        items = list(items)
+        frames = [self._frame(OP_DECOMPRESS, 'huffman', bytes(data)) for data in items]
+        return [result.decode('utf-8') for result in self._pipeline(frames, len(items))]
+
+    def close(self):
+        """Cierra la conexión (desbloquea un envío en curso en otro hilo)"""
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
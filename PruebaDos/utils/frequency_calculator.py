@@ -3,6 +3,8 @@ Utilidad para calcular frecuencias de símbolos
 Proporciona funciones para analizar la distribución de caracteres en el texto
 """
 
+import os
+import random
 from collections import Counter
 
 class FrequencyCalculator:
@@ -39,6 +41,63 @@ class FrequencyCalculator:
             return []
         return sorted(frequencies.items(), key=lambda x: x[1], reverse=reverse)
     
+    @staticmethod
+    def sample_blocks(text, sample_size=65536, method='strided', block_size=256, seed=None):
+        """
+        Toma una muestra del texto dividida en bloques
+        
+        Args:
+            text (str): Texto completo
+            sample_size (int): Cantidad aproximada de símbolos a muestrear
+            method (str): 'strided' (bloques contiguos a intervalos regulares) o
+                'random' (símbolos elegidos al azar de manera uniforme sobre el
+                texto completo en memoria)
+            block_size (int): Símbolos por bloque; los bloques sirven para estimar
+                la variabilidad de la muestra
+            seed (int): Semilla para el método aleatorio
+            
+        Returns:
+            list: Textos de la muestra (uno por bloque)
+        """
+        n = len(text)
+        if n <= sample_size:
+            return [text[i:i + block_size] for i in range(0, n, block_size)]
+        
+        block_count = max(1, sample_size // block_size)
+        if method == 'strided':
+            stride = n // block_count
+            return [text[i * stride:i * stride + block_size] for i in range(block_count)]
+        if method == 'random':
+            rng = random.Random(seed)
+            positions = sorted(rng.sample(range(n), block_count * block_size))
+            chars = "".join([text[i] for i in positions])
+            return [chars[i:i + block_size] for i in range(0, len(chars), block_size)]
+        raise ValueError(f"Método de muestreo desconocido: {method}")
+    
+    @staticmethod
+    def sample_file_blocks(path, sample_bytes=1 << 20, block_size=4096, encoding='utf-8'):
+        """
+        Toma bloques de bytes a intervalos regulares de un archivo sin leerlo entero
+        
+        Returns:
+            tuple: (textos de la muestra, bytes leídos, tamaño del archivo)
+        """
+        size = os.path.getsize(path)
+        block_count = max(1, min(sample_bytes, size) // block_size)
+        stride = max(block_size, size // block_count)
+        blocks = []
+        bytes_read = 0
+        with open(path, 'rb') as f:
+            for i in range(block_count):
+                f.seek(i * stride)
+                raw = f.read(block_size)
+                if not raw:
+                    break
+                bytes_read += len(raw)
+                # Los bordes del bloque pueden cortar caracteres multibyte
+                blocks.append(raw.decode(encoding, errors='ignore'))
+        return blocks, bytes_read, size
+    
     @staticmethod
     def print_frequencies(frequencies):
         """Imprime las frecuencias (para debugging)"""
@@ -46,3 +105,39 @@ class FrequencyCalculator:
         for char, freq in sorted(frequencies.items(), key=lambda x: x[1], reverse=True):
             display_char = repr(char) if char in [' ', '\n', '\t'] else char
             print(f"  {display_char}: {freq}")
+
+
+class IncrementalFrequencyCounter:
+    """Frecuencias mantenidas con deltas de inserción y borrado, sin recontar el texto"""
+    
+    def __init__(self, text=""):
+        self.frequencies = Counter()
+        self.total = 0
+        self.add(text)
+        
+    def add(self, text):
+        """Suma los símbolos de un texto insertado"""
+        if text:
+            self.frequencies.update(text)
+            self.total += len(text)
+            
+    def remove(self, text):
+        """Resta los símbolos de un texto borrado"""
+        if not text:
+            return
+        self.frequencies.subtract(text)
+        self.total -= len(text)
+        # Solo pueden haber quedado en cero los símbolos del texto borrado
+        for char in set(text):
+            if self.frequencies[char] <= 0:
+                del self.frequencies[char]
+                
+    def reset(self, text=""):
+        """Reinicia el conteo con un texto completo"""
+        self.frequencies = Counter()
+        self.total = 0
+        self.add(text)
+        
+    def snapshot(self):
+        """Copia de las frecuencias actuales como diccionario"""
+        return dict(self.frequencies)
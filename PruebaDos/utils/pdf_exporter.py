@@ -8,15 +8,19 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.shapes import Drawing, String
 from reportlab.graphics.charts.barcharts import VerticalBarChart
 from reportlab.graphics.charts.legends import Legend
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import os
 from datetime import datetime
 
 from utils.statistics import StatisticsCalculator
-from utils.visualizer import DataVisualizer
+from utils.profiler import PhaseTimer
+
+# Colores de las series por algoritmo (se repiten si hay más algoritmos)
+SERIES_COLORS = [colors.lightblue, colors.lightgreen, colors.salmon, colors.khaki,
+                 colors.plum, colors.lightgrey]
 
 class PDFExporter:
     """Exportador de resultados a PDF"""
@@ -30,11 +34,54 @@ class PDFExporter:
             spaceAfter=30,
             alignment=1  # Center
         )
+        self.max_chart_symbols = 20
+        self._executor = None
+        self.last_timings = None
+        
+    def export_results_async(self, filename, original_text, *results_list, callback=None,
+                             baselines=None):
+        """
+        Genera el PDF en un hilo de trabajo sin bloquear al llamador
+        
+        Args:
+            callback (callable): Se invoca con el Future al terminar. Se ejecuta
+                en el hilo de trabajo, por lo que no debe tocar widgets de Tk.
+                
+        Returns:
+            Future: Se resuelve con el nombre del archivo generado
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='pdf-export')
+        future = self._executor.submit(
+            self.export_results, filename, original_text, *results_list, baselines=baselines
+        )
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
         
-    def export_results(self, filename, original_text, huffman_results, shannon_fano_results):
-        """Exporta todos los resultados a un archivo PDF"""
+    def shutdown(self, wait=True):
+        """Libera el hilo de trabajo de exportación"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        
+    def export_results(self, filename, original_text, *results_list, timer=None, baselines=None):
+        """
+        Exporta todos los resultados a un archivo PDF
+        
+        Args:
+            *results_list: Resultados de cada algoritmo a comparar (uno o más)
+            baselines (dict): Resultados de zlib/bz2/lzma para la misma entrada
+                (si no se indican, se calculan)
+        """
+        if timer is None:
+            timer = PhaseTimer()
         doc = SimpleDocTemplate(filename, pagesize=A4)
         story = []
+        labels = [results['algorithm'] for results in results_list]
+        frequencies = next((results['frequencies'] for results in results_list
+                            if StatisticsCalculator.describes_source(results)
+                            and results.get('frequencies')), {})
         
         # Título
         story.append(Paragraph("Reporte de Compresión de Datos", self.title_style))
@@ -46,7 +93,7 @@ class PDFExporter:
         story.append(Paragraph("Información del Texto Original", self.styles['Heading2']))
         text_info = [
             ['Longitud del texto:', str(len(original_text))],
-            ['Caracteres únicos:', str(len(set(original_text)))],
+            ['Caracteres únicos:', str(len(frequencies))],
             ['Primeros 200 caracteres:', original_text[:200] + ('...' if len(original_text) > 200 else '')]
         ]
         
@@ -67,84 +114,264 @@ class PDFExporter:
         # Estadísticas comparativas
         story.append(Paragraph("Comparación de Algoritmos", self.styles['Heading2']))
         stats_calc = StatisticsCalculator()
-        comparison = stats_calc.compare_algorithms(huffman_results, shannon_fano_results)
+        with timer.phase('pdf.statistics'):
+            comparison = stats_calc.compare_algorithms(*results_list)
+            stats_list = [stats_calc.get_statistics(results) for results in results_list]
         
-        comp_data = [['Métrica', 'Huffman', 'Shannon-Fano', 'Mejor']]
+        comp_data = [['Métrica'] + labels + ['Mejor']]
         for metric, values in comparison.items():
-            comp_data.append([
-                metric,
-                values['huffman'],
-                values['shannon_fano'],
-                'Huffman' if values['winner'] == 'huffman' else 'Shannon-Fano'
-            ])
+            comp_data.append([metric] + values['values'] + [values['winner']])
         
-        comp_table = Table(comp_data, colWidths=[2*inch, 1.5*inch, 1.5*inch, 1.5*inch])
+        value_width = 4.5 * inch / (len(labels) + 1)
+        comp_table = Table(comp_data, colWidths=[2*inch] + [value_width] * (len(labels) + 1))
         comp_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('FONTSIZE', (0, 0), (-1, 0), 12 if len(labels) <= 2 else 9),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
             ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
             ('GRID', (0, 0), (-1, -1), 1, colors.black)
         ]))
         story.append(comp_table)
-        story.append(PageBreak())
+        story.append(Spacer(1, 20))
         
-        # Tabla detallada de Huffman
-        story.append(Paragraph("Tabla Detallada - Algoritmo de Huffman", self.styles['Heading2']))
-        huffman_table_data = stats_calc.create_detailed_table(huffman_results)
-        huffman_headers = ['Símbolo', 'Freq.', 'Prob.', 'Código', 'Long.', 'Info.', 'Entropía', 'Bits', 'L.Prom.']
+        # Tamaños reales y compresores de referencia
+        story.append(Paragraph("Tamaño Almacenado", self.styles['Heading2']))
+        with timer.phase('pdf.statistics'):
+            if baselines is None:
+                baselines = stats_calc.calculate_baselines(original_text)
+            storage_data = self._storage_rows(list(zip(labels, stats_list)), baselines)
+        storage_table = Table(storage_data, colWidths=[1.4*inch, 1.2*inch, 1.2*inch, 1.4*inch, 1*inch])
+        storage_table.setStyle(self._table_style(9))
+        story.append(storage_table)
+        story.append(Spacer(1, 20))
         
-        huffman_full_data = [huffman_headers] + huffman_table_data[:15]  # Limitar a 15 filas
+        # Gráficos (dibujos vectoriales nativos de reportlab)
+        story.append(Paragraph("Gráficos", self.styles['Heading2']))
+        with timer.phase('pdf.charts'):
+            story.append(self._create_frequency_chart(frequencies))
+            story.append(Spacer(1, 10))
+            story.append(self._create_code_length_chart(frequencies, results_list))
+            story.append(Spacer(1, 10))
+            story.append(self._create_metrics_chart(labels, stats_list))
         
-        huffman_table = Table(huffman_full_data, colWidths=[0.7*inch] * 9)
-        huffman_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(huffman_table)
+        # Tabla detallada de cada algoritmo
+        headers = ['Símbolo', 'Freq.', 'Prob.', 'Código', 'Long.', 'Info.', 'Entropía', 'Bits', 'L.Prom.']
+        for label, results in zip(labels, results_list):
+            if not results.get('codes') or not StatisticsCalculator.describes_source(results):
+                continue
+            story.append(PageBreak())
+            story.append(Paragraph(f"Tabla Detallada - Algoritmo de {label}", self.styles['Heading2']))
+            with timer.phase('pdf.statistics'):
+                table_data = stats_calc.create_detailed_table(results)
+            
+            detail_table = Table([headers] + table_data[:15], colWidths=[0.7*inch] * 9)  # Limitar a 15 filas
+            detail_table.setStyle(self._table_style(8))
+            story.append(detail_table)
+        story.append(Spacer(1, 20))
+        
+        # Códigos generados
+        story.append(Paragraph("Códigos Generados", self.styles['Heading2']))
+        for label, results in zip(labels, results_list):
+            if not results.get('codes') or not StatisticsCalculator.describes_source(results):
+                continue
+            story.append(Paragraph(f"Códigos {label}:", self.styles['Heading3']))
+            codes_text = ", ".join([f"'{k}': {v}" for k, v in list(results['codes'].items())[:20]])
+            story.append(Paragraph(codes_text, self.styles['Normal']))
+            story.append(Spacer(1, 10))
+        
+        # Construir PDF
+        with timer.phase('pdf.build'):
+            doc.build(story)
+        self.last_timings = timer.to_dict()
+        return filename
+        
+    def export_batch_report(self, filename, report, max_files=100):
+        """
+        Exporta el reporte consolidado de un procesamiento por lotes
+        
+        Args:
+            filename (str): Archivo PDF de salida
+            report (dict): Reporte generado por BatchProcessor
+            max_files (int): Máximo de archivos listados (los más grandes);
+                el detalle completo queda en el CSV/JSON
+        """
+        doc = SimpleDocTemplate(filename, pagesize=A4)
+        summary = report['summary']
+        story = []
+        
+        story.append(Paragraph("Reporte de Compresión por Lotes", self.title_style))
+        story.append(Paragraph(f"Generado el: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", 
+                              self.styles['Normal']))
+        story.append(Paragraph(f"Directorio: {report['directory']}", self.styles['Normal']))
+        story.append(Spacer(1, 20))
+        
+        # Resumen general
+        story.append(Paragraph("Resumen", self.styles['Heading2']))
+        summary_data = [
+            ['Métrica', 'Valor'],
+            ['Archivos procesados', f"{summary['files_ok']} de {summary['files_total']}"],
+            ['Archivos omitidos / con error', f"{summary['files_skipped']} / {summary['files_failed']}"],
+            ['Tamaño total', f"{summary['total_bytes']} bytes"],
+            ['Tiempo total', f"{summary['wall_seconds']:.2f} s ({summary['workers']} procesos)"],
+            ['Rendimiento agregado', f"{summary['throughput_mb_s']:.2f} MB/s"],
+        ]
+        summary_table = Table(summary_data, colWidths=[2.5*inch, 3.5*inch])
+        summary_table.setStyle(self._table_style(10))
+        story.append(summary_table)
+        story.append(Spacer(1, 20))
+        
+        # Comparación por algoritmo
+        story.append(Paragraph("Resultados por Algoritmo", self.styles['Heading2']))
+        algo_data = [['Algoritmo', 'Bytes totales', 'Tasa (%)', 'CPU (s)', 'MB/s']]
+        for key, name in (('huffman', 'Huffman'), ('shannon_fano', 'Shannon-Fano'),
+                          ('zlib', 'zlib'), ('bz2', 'bz2'), ('lzma', 'lzma')):
+            algo_data.append([
+                name,
+                str(summary[f'{key}_output_bytes']),
+                f"{summary[f'{key}_compression_ratio']:.2f}",
+                f"{summary[f'{key}_cpu_seconds']:.2f}",
+                f"{summary[f'{key}_throughput_mb_s']:.2f}"
+            ])
+        algo_table = Table(algo_data, colWidths=[1.4*inch, 1.4*inch, 1*inch, 1*inch, 1*inch])
+        algo_table.setStyle(self._table_style(10))
+        story.append(algo_table)
         story.append(PageBreak())
         
-        # Tabla detallada de Shannon-Fano
-        story.append(Paragraph("Tabla Detallada - Algoritmo de Shannon-Fano", self.styles['Heading2']))
-        sf_table_data = stats_calc.create_detailed_table(shannon_fano_results)
-        sf_full_data = [huffman_headers] + sf_table_data[:15]  # Usar los mismos headers
+        # Detalle de los archivos más grandes
+        processed = [e for e in report['files'] if e['status'] == 'ok']
+        largest = sorted(processed, key=lambda e: e['size_bytes'], reverse=True)[:max_files]
+        story.append(Paragraph(f"Detalle por Archivo (los {len(largest)} más grandes)",
+                               self.styles['Heading2']))
+        file_data = [['Archivo', 'Bytes', 'Huffman (%)', 'S-F (%)', 'lzma (%)']]
+        for entry in largest:
+            name = os.path.relpath(entry['path'], report['directory'])
+            file_data.append([
+                name if len(name) <= 45 else '...' + name[-42:],
+                str(entry['size_bytes']),
+                f"{entry['huffman_compression_ratio']:.2f}",
+                f"{entry['shannon_fano_compression_ratio']:.2f}",
+                f"{entry['lzma_compression_ratio']:.2f}"
+            ])
+        file_table = Table(file_data, colWidths=[2.8*inch, 0.9*inch, 0.9*inch, 0.8*inch, 1*inch],
+                           repeatRows=1)
+        file_table.setStyle(self._table_style(7))
+        story.append(file_table)
+        
+        doc.build(story)
+        return filename
+        
+    def _storage_rows(self, labeled_stats, baselines):
+        """Filas de la tabla de tamaños reales: algoritmos propios y de referencia"""
+        rows = [['Compresor', 'Original (B)', 'Datos (B)', 'Tabla+cab. (B)', 'Tasa (%)']]
+        for name, stats in labeled_stats:
+            rows.append([
+                name,
+                str(stats['original_bytes']),
+                str(stats['payload_bytes']),
+                str(stats['overhead_bytes']),
+                f"{stats['compression_ratio']:.2f}"
+            ])
+        original_bytes = labeled_stats[0][1]['original_bytes'] if labeled_stats else 0
+        for name, baseline in baselines.items():
+            rows.append([
+                name,
+                str(original_bytes),
+                str(baseline['bytes']),
+                '-',
+                f"{baseline['compression_ratio']:.2f}"
+            ])
+        return rows
         
-        sf_table = Table(sf_full_data, colWidths=[0.7*inch] * 9)
-        sf_table.setStyle(TableStyle([
+    def _table_style(self, font_size):
+        """Estilo común de las tablas del reporte"""
+        return TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
             ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
             ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('FONTSIZE', (0, 0), (-1, -1), font_size),
             ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
             ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
             ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(sf_table)
-        story.append(Spacer(1, 20))
+        ])
         
-        # Códigos generados
-        story.append(Paragraph("Códigos Generados", self.styles['Heading2']))
+    def _display_char(self, char):
+        """Representación legible de un símbolo para los ejes"""
+        return {' ': 'ESP', '\n': 'NL', '\t': 'TAB'}.get(char, char)
         
-        # Huffman codes
-        story.append(Paragraph("Códigos Huffman:", self.styles['Heading3']))
-        huffman_codes_text = ", ".join([f"'{k}': {v}" for k, v in list(huffman_results['codes'].items())[:20]])
-        story.append(Paragraph(huffman_codes_text, self.styles['Normal']))
-        story.append(Spacer(1, 10))
+    def _create_bar_drawing(self, title, categories, series, series_names, bar_colors):
+        """Crea un gráfico de barras vertical como Drawing de reportlab"""
+        drawing = Drawing(450, 230)
+        drawing.add(String(225, 215, title, fontName='Helvetica-Bold', fontSize=11,
+                           textAnchor='middle'))
         
-        # Shannon-Fano codes
-        story.append(Paragraph("Códigos Shannon-Fano:", self.styles['Heading3']))
-        sf_codes_text = ", ".join([f"'{k}': {v}" for k, v in list(shannon_fano_results['codes'].items())[:20]])
-        story.append(Paragraph(sf_codes_text, self.styles['Normal']))
+        chart = VerticalBarChart()
+        chart.x = 45
+        chart.y = 40
+        chart.width = 300
+        chart.height = 160
+        chart.data = series
+        chart.categoryAxis.categoryNames = categories
+        chart.categoryAxis.labels.fontSize = 7
+        chart.categoryAxis.labels.angle = 45 if len(categories) > 8 else 0
+        chart.categoryAxis.labels.boxAnchor = 'ne' if len(categories) > 8 else 'n'
+        chart.valueAxis.valueMin = 0
+        chart.valueAxis.labels.fontSize = 7
+        chart.barSpacing = 1
+        for i, color in enumerate(bar_colors):
+            chart.bars[i].fillColor = color
+        drawing.add(chart)
         
-        # Construir PDF
-        doc.build(story)
+        if len(series) > 1:
+            legend = Legend()
+            legend.x = 360
+            legend.y = 190
+            legend.fontSize = 8
+            legend.alignment = 'right'
+            legend.colorNamePairs = list(zip(bar_colors, series_names))
+            drawing.add(legend)
+        return drawing
+        
+    def _create_frequency_chart(self, frequencies):
+        """Gráfico de frecuencias de los símbolos más frecuentes"""
+        top = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)[:self.max_chart_symbols]
+        return self._create_bar_drawing(
+            f"Frecuencias (top {len(top)})",
+            [self._display_char(char) for char, _ in top],
+            [[freq for _, freq in top]],
+            ['Frecuencia'],
+            [colors.skyblue]
+        )
+        
+    def _create_code_length_chart(self, frequencies, results_list):
+        """Gráfico comparativo de longitudes de código por símbolo del texto original"""
+        top = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)[:self.max_chart_symbols]
+        chars = [char for char, _ in top]
+        with_codes = [results for results in results_list
+                      if results.get('codes') and StatisticsCalculator.describes_source(results)]
+        return self._create_bar_drawing(
+            "Longitudes de código",
+            [self._display_char(char) for char in chars],
+            [[len(results['codes'].get(char, '')) for char in chars] for results in with_codes],
+            [results['algorithm'] for results in with_codes],
+            self._series_colors(len(with_codes))
+        )
+        
+    def _create_metrics_chart(self, labels, stats_list):
+        """Gráfico comparativo de longitud promedio, entropía y eficiencia (None queda sin barra)"""
+        keys = ['avg_length', 'total_entropy', 'efficiency']
+        return self._create_bar_drawing(
+            "Comparación de estadísticas",
+            ['Longitud promedio', 'Entropía', 'Eficiencia'],
+            [[stats[k] for k in keys] for stats in stats_list],
+            labels,
+            self._series_colors(len(stats_list))
+        )
+        
+    @staticmethod
+    def _series_colors(count):
+        """Colores para count series"""
+        return [SERIES_COLORS[i % len(SERIES_COLORS)] for i in range(count)]
@@ -0,0 +1,213 @@
+"""
+Utilidad para medir el tiempo de cada fase del procesamiento
+Usa temporizadores monotónicos y, opcionalmente, cProfile y tracemalloc
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Fases con memoria en curso (de todos los temporizadores del proceso). Cada
+# marco guarda la memoria al entrar y el pico visto; como reset_peak() es
+# global, al salir de una fase su pico se propaga a la que la contiene.
+_memory_frames = []
+
+
+def _enter_memory_frame():
+    current, peak = tracemalloc.get_traced_memory()
+    if _memory_frames:
+        _memory_frames[-1]['peak'] = max(_memory_frames[-1]['peak'], peak)
+    tracemalloc.reset_peak()
+    frame = {'start': current, 'peak': current}
+    _memory_frames.append(frame)
+    return frame
+
+
+def _exit_memory_frame(frame):
+    """Devuelve (pico absoluto, memoria al salir) de la fase"""
+    current, peak = tracemalloc.get_traced_memory()
+    peak = max(frame['peak'], peak)
+    for index in range(len(_memory_frames) - 1, -1, -1):
+        if _memory_frames[index] is frame:
+            del _memory_frames[index]
+            break
+    if _memory_frames:
+        _memory_frames[-1]['peak'] = max(_memory_frames[-1]['peak'], peak)
+    return peak, current
+
+
+class PhaseTimer:
+    """Registro de tiempos por fase con perfilado opcional"""
+
+    def __init__(self, profile=False, trace_memory=False):
+        """
+        Args:
+            profile (bool): Captura un perfil cProfile entre start() y stop()
+            trace_memory (bool): Registra con tracemalloc el pico de memoria entre start() y
+                stop() y, por fase, el pico y la memoria retenida
+        """
+        self.phases = {}
+        self.memory = {}
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.profile_report = ""
+        self.memory_peak = None
+        self._profiler = None
+        self._started_tracemalloc = False
+        self._run_frame = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Mide el tiempo de un bloque; las fases repetidas se acumulan
+
+        Con trace_memory y tracemalloc activo también registra, en bytes, el
+        pico por encima de la memoria al entrar (el máximo entre repeticiones) y
+        la memoria retenida al salir (la suma de las repeticiones). Las fases
+        anidadas se miden bien; las de hilos concurrentes se mezclan.
+        """
+        frame = _enter_memory_frame() if self.trace_memory and tracemalloc.is_tracing() else None
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start)
+            if frame is not None:
+                peak, current = _exit_memory_frame(frame)
+                self.add_memory(name, peak - frame['start'], current - frame['start'])
+
+    def add_memory(self, name, peak_bytes, retained_bytes):
+        """Registra la memoria de una fase (también para mediciones hechas en otro proceso)"""
+        entry = self.memory.setdefault(name, {'peak_bytes': 0, 'retained_bytes': 0})
+        entry['peak_bytes'] = max(entry['peak_bytes'], peak_bytes)
+        entry['retained_bytes'] += retained_bytes
+
+    def add(self, phases, prefix="", memory=None):
+        """Incorpora tiempos (y memoria) medidos en otro lugar, como los de un resultado"""
+        for name, seconds in phases.items():
+            key = f"{prefix}{name}"
+            self.phases[key] = self.phases.get(key, 0.0) + seconds
+        for name, entry in (memory or {}).items():
+            self.add_memory(f"{prefix}{name}", entry['peak_bytes'], entry['retained_bytes'])
+
+    def start(self):
+        """Inicia la captura opcional de perfil y memoria"""
+        if self.trace_memory:
+            self._started_tracemalloc = not tracemalloc.is_tracing()
+            if self._started_tracemalloc:
+                tracemalloc.start()
+            self._run_frame = _enter_memory_frame()
+        if self.profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self, top=25):
+        """Detiene la captura opcional y guarda sus resultados"""
+        if self._profiler is not None:
+            self._profiler.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=stream)
+            stats.sort_stats('cumulative').print_stats(top)
+            self.profile_report = stream.getvalue()
+            self._profiler = None
+        if self._run_frame is not None and tracemalloc.is_tracing():
+            self.memory_peak = _exit_memory_frame(self._run_frame)[0]
+            self._run_frame = None
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    @property
+    def total(self):
+        """Suma de todas las fases medidas"""
+        return sum(self.phases.values())
+
+    def to_dict(self):
+        """Representación serializable de las mediciones"""
+        data = {
+            'phases': dict(self.phases),
+            'total_seconds': self.total
+        }
+        if self.memory_peak is not None:
+            data['memory_peak_bytes'] = self.memory_peak
+        if self.memory:
+            data['memory'] = {name: dict(entry) for name, entry in self.memory.items()}
+        if self.profile_report:
+            data['profile'] = self.profile_report
+        return data
+
+    def to_json(self, indent=2):
+        """Mediciones en formato JSON"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
+
+    def export_json(self, filename):
+        """Guarda las mediciones en un archivo JSON"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.to_json())
+
+
+def profile_pipeline(text, names=None, pdf_path=None, use_processes=False):
+    """
+    Mide tiempo y memoria de cada fase del procesamiento completo de un texto
+
+    Codifica con los codificadores indicados (con sus estadísticas),
+    decodifica cada resultado, dibuja los gráficos de comparación y los
+    árboles y exporta el PDF. Los resultados por fase permiten fijar
+    presupuestos de memoria en función del tamaño de la entrada.
+
+    Args:
+        text (str): Texto a procesar
+        names (list): Codificadores (por defecto, todos los registrados)
+        pdf_path (str): Archivo del reporte PDF (por defecto, uno temporal que se borra)
+        use_processes (bool): Codificar en procesos de trabajo (su memoria se mide
+            en cada proceso)
+
+    Returns:
+        dict: Mediciones de PhaseTimer.to_dict() más input_bytes, input_chars y,
+              en 'memory', peak_per_input_byte de cada fase
+    """
+    # Evita un import circular: los algoritmos usan utils
+    from algorithms.registry import compare_codecs, get_codec
+    from utils.pdf_exporter import PDFExporter
+    from utils.visualizer import DataVisualizer
+
+    timer = PhaseTimer(trace_memory=True)
+    timer.start()
+    try:
+        results = compare_codecs(text, names, timer=timer, use_processes=use_processes)
+        for name, item in results.items():
+            codec = get_codec(name)
+            with timer.phase(f'{name}.decode'):
+                codec.decode(item)
+            if codec.has_tree:
+                with timer.phase(f'{name}.tree_figure'):
+                    codec.tree_figure(item)
+
+        with timer.phase('charts'):
+            DataVisualizer().render_comparison_image(*results.values())
+
+        remove_pdf = pdf_path is None
+        if remove_pdf:
+            handle, pdf_path = tempfile.mkstemp(suffix='.pdf')
+            os.close(handle)
+        try:
+            PDFExporter().export_results(pdf_path, text, *results.values(), timer=timer)
+        finally:
+            if remove_pdf:
+                os.remove(pdf_path)
+    finally:
+        timer.stop()
+
+    report = timer.to_dict()
+    input_bytes = len(text.encode('utf-8', 'surrogatepass'))
+    report['input_bytes'] = input_bytes
+    report['input_chars'] = len(text)
+    for entry in report.get('memory', {}).values():
+        entry['peak_per_input_byte'] = entry['peak_bytes'] / input_bytes if input_bytes else 0.0
+    return report
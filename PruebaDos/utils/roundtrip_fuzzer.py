@@ -0,0 +1,178 @@
+"""
+Utilidad de verificación por ida y vuelta
+Genera textos aleatorios y comprueba que cada codificador recupere el original
+"""
+
+import random
+import time
+import zlib
+
+# Distribuciones de símbolos que se prueban
+DISTRIBUTIONS = ('single', 'uniform', 'skewed', 'zipf', 'fibonacci')
+
+# Rangos de puntos de código para los alfabetos (sin sustitutos UTF-16)
+CODE_POINT_RANGES = (
+    (0x20, 0x7E),      # ASCII imprimible
+    (0x00, 0x1F),      # controles, incluidos '\n' y '\t'
+    (0xA0, 0x24F),     # latín extendido
+    (0x3040, 0x30FF),  # kana
+    (0x1F300, 0x1F5FF) # fuera del plano básico
+)
+
+
+def _checksum(text):
+    return zlib.crc32(text.encode('utf-8', 'surrogatepass'))
+
+
+class RoundTripFuzzer:
+    """
+    Pruebas de ida y vuelta con entradas aleatorias
+
+    Cada caso se genera a partir de su propia semilla, de modo que un fallo
+    se reproduce con run_case(semilla). Se cubren alfabetos de un solo
+    símbolo, distribuciones muy sesgadas y frecuencias de Fibonacci (árboles
+    de profundidad máxima), además de bloques pequeños para ejercitar los
+    bordes entre bloques de FileCodec.
+    """
+
+    def __init__(self, seed=None, max_size=4096, max_alphabet=64):
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.max_size = max_size
+        self.max_alphabet = max_alphabet
+
+    def generate(self, rng):
+        """
+        Genera un texto de prueba
+
+        Returns:
+            tuple: (texto, descripción del caso)
+        """
+        distribution = rng.choice(DISTRIBUTIONS)
+        low, high = rng.choice(CODE_POINT_RANGES)
+        if distribution == 'single':
+            alphabet_size = 1
+        elif distribution == 'fibonacci':
+            # Con más de ~30 símbolos los pesos superan cualquier tamaño razonable
+            alphabet_size = rng.randint(2, min(20, self.max_alphabet))
+        else:
+            alphabet_size = rng.randint(2, self.max_alphabet)
+        alphabet_size = min(alphabet_size, high - low + 1)
+        alphabet = [chr(code) for code in rng.sample(range(low, high + 1), alphabet_size)]
+
+        if distribution in ('single', 'uniform'):
+            weights = [1] * alphabet_size
+        elif distribution == 'skewed':
+            weights = [1000] + [1] * (alphabet_size - 1)
+        elif distribution == 'zipf':
+            weights = [1 / rank for rank in range(1, alphabet_size + 1)]
+        else:
+            weights = [1, 1]
+            while len(weights) < alphabet_size:
+                weights.append(weights[-1] + weights[-2])
+            weights = weights[:alphabet_size]
+
+        size = rng.randint(1, self.max_size)
+        text = "".join(rng.choices(alphabet, weights=weights, k=size))
+        if distribution == 'fibonacci':
+            # Asegurar que todos los símbolos aparezcan para forzar la profundidad máxima
+            text += "".join(alphabet)
+        return text, {'distribution': distribution, 'alphabet': alphabet_size, 'size': len(text)}
+
+    def _checks(self, text, rng):
+        """Comprobaciones de ida y vuelta: (nombre, función que devuelve el texto recuperado)"""
+        from algorithms.file_codec import FileCodec
+        from algorithms.huffman import HuffmanCoding
+        from algorithms.lz77 import LZ77Coding
+        from algorithms.range_coder import RangeCoding
+        from algorithms.shannon_fano import ShannonFanoCoding
+        from algorithms.transforms import BlockTransform
+
+        def huffman():
+            coder = HuffmanCoding()
+            return coder.decode(coder.encode(text)['encoded_text'])
+
+        def shannon_fano():
+            coder = ShannonFanoCoding()
+            return coder.decode(coder.encode(text)['encoded_text'])
+
+        def range_coder(adaptive):
+            def run():
+                coder = RangeCoding(adaptive)
+                return RangeCoding.from_bytes(coder.to_bytes(coder.encode(text)))
+            return run
+
+        def block_transform():
+            transform = BlockTransform(block_size=chunk_size)
+            return transform.inverse(*transform.forward(text))
+
+        def lz77():
+            coder = LZ77Coding(level=rng.randint(1, 9), window_size=rng.randint(1, 4096))
+            return LZ77Coding.from_bytes(coder.to_bytes(coder.encode(text)))
+
+        def file_codec(algorithm, streams=1):
+            def run():
+                codec = FileCodec(algorithm=algorithm, chunk_size=chunk_size, verify_rate=1.0,
+                                  streams=streams)
+                return codec.decompress_bytes(codec.compress_bytes(text))
+            return run
+
+        chunk_size = rng.randint(1, 256)
+        return [
+            ('huffman', huffman),
+            ('shannon_fano', shannon_fano),
+            ('range', range_coder(False)),
+            ('range_adaptive', range_coder(True)),
+            ('bwt_mtf_rle', block_transform),
+            ('lz77', lz77),
+            ('file_codec.huffman', file_codec('huffman')),
+            ('file_codec.shannon_fano', file_codec('shannon_fano')),
+            ('file_codec.multistream', file_codec('huffman', rng.randint(2, 8))),
+        ]
+
+    def run_case(self, case_seed):
+        """
+        Ejecuta un caso a partir de su semilla
+
+        Returns:
+            list: Fallos del caso (vacía si todo coincide)
+        """
+        rng = random.Random(case_seed)
+        text, case = self.generate(rng)
+        expected = _checksum(text)
+        failures = []
+        for name, check in self._checks(text, rng):
+            try:
+                result = check()
+                error = None if _checksum(result) == expected and result == text else \
+                    f"el texto recuperado no coincide ({len(result)} de {len(text)} símbolos)"
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            if error:
+                failures.append({'seed': case_seed, 'check': name, 'error': error, **case})
+        return failures
+
+    def run(self, cases=100, progress=None):
+        """
+        Ejecuta varios casos aleatorios
+
+        Args:
+            cases (int): Cantidad de casos
+            progress (callable): Se llama con (índice, fallos del caso) al terminar cada uno
+
+        Returns:
+            dict: seed, cases, failures y seconds
+        """
+        rng = random.Random(self.seed)
+        failures = []
+        start = time.perf_counter()
+        for index in range(cases):
+            case_failures = self.run_case(rng.randrange(1 << 32))
+            failures.extend(case_failures)
+            if progress:
+                progress(index, case_failures)
+        return {
+            'seed': self.seed,
+            'cases': cases,
+            'failures': failures,
+            'seconds': time.perf_counter() - start
+        }
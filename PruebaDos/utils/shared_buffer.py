@@ -0,0 +1,103 @@
+"""
+Utilidad de memoria compartida entre procesos
+Pasa textos y mensajes comprimidos a procesos de trabajo sin serializarlos
+"""
+
+from multiprocessing import shared_memory
+
+
+class SharedBuffer:
+    """
+    Bloque de multiprocessing.shared_memory con su tamaño útil
+
+    Solo el nombre y el tamaño viajan entre procesos (descriptor()); cada
+    proceso mapea el mismo bloque con attach() y lo lee o escribe en el lugar.
+    El proceso que crea el bloque es responsable de liberarlo con unlink()
+    (o saliendo del bloque with), salvo que se lo pase a otro proceso.
+
+    La vida del bloque depende del sistema. En POSIX el nombre existe hasta
+    unlink(), aunque nadie lo tenga abierto. En Windows no hay unlink (es una
+    operación vacía): el bloque desaparece cuando se cierra su último handle.
+    Por eso quien lo crea debe mantenerlo abierto hasta que el proceso que lo
+    recibe haya llamado a attach().
+    """
+
+    def __init__(self, shm, size):
+        self._shm = shm
+        self.size = size
+        self._views = []
+
+    @classmethod
+    def create(cls, data):
+        """Crea un bloque nuevo con una copia de data (bytes o memoryview)"""
+        size = len(data)
+        # El sistema no admite bloques de tamaño 0
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shm.buf[:size] = data
+        return cls(shm, size)
+
+    @classmethod
+    def from_text(cls, text, encoding='utf-8'):
+        """Crea un bloque con el texto codificado"""
+        return cls.create(text.encode(encoding, 'surrogatepass'))
+
+    @classmethod
+    def attach(cls, name, size):
+        """Mapea un bloque creado por otro proceso"""
+        return cls(shared_memory.SharedMemory(name=name), size)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def descriptor(self):
+        """(nombre, tamaño): lo único que hace falta enviar a otro proceso"""
+        return self._shm.name, self.size
+
+    def view(self):
+        """memoryview de los bytes útiles, sin copiarlos"""
+        view = self._shm.buf[:self.size]
+        self._views.append(view)
+        return view
+
+    def read_text(self, encoding='utf-8'):
+        """Decodifica el contenido directamente desde la memoria compartida"""
+        view = self._shm.buf[:self.size]
+        try:
+            return str(view, encoding, 'surrogatepass')
+        finally:
+            view.release()
+
+    def close(self):
+        """Libera las vistas entregadas y el mapeo de este proceso"""
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._shm.close()
+
+    def __del__(self):
+        # Sin close() explícito, las vistas entregadas se liberan junto con el bloque
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+    def unlink(self):
+        """
+        Elimina el nombre del bloque
+
+        La memoria se libera cuando el último proceso cierra su mapeo, así que
+        se puede llamar apenas todos los procesos lo hayan abierto. En Windows
+        no hace nada: basta con que todos los procesos cierren el bloque.
+        """
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        self.unlink()
@@ -3,7 +3,21 @@ Utilidad para cálculos estadísticos
 Calcula métricas de compresión, entropía y eficiencia
 """
 
+import bz2
+import lzma
 import math
+import time
+import zlib
+from statistics import NormalDist, fmean, stdev
+
+from utils.frequency_calculator import FrequencyCalculator
+
+# Compresores de referencia de la biblioteca estándar (niveles por defecto)
+BASELINES = {
+    'zlib': zlib.compress,
+    'bz2': bz2.compress,
+    'lzma': lzma.compress
+}
 
 class StatisticsCalculator:
     """Calculadora de estadísticas de compresión"""
@@ -49,8 +63,8 @@ class StatisticsCalculator:
         Calcula la tasa de compresión
         
         Args:
-            original_bits (int): Bits del texto original
-            compressed_bits (int): Bits del texto comprimido
+            original_bits (int): Tamaño del texto original
+            compressed_bits (int): Tamaño comprimido (en la misma unidad)
             
         Returns:
             float: Tasa de compresión como porcentaje
@@ -75,42 +89,311 @@ class StatisticsCalculator:
             return 0
         return entropy / avg_length
         
-    def calculate_statistics(self, text, frequencies, codes):
+    @staticmethod
+    def describes_source(results):
+        """
+        Indica si las frecuencias y los códigos de un resultado son de los símbolos
+        del texto original (no lo son si se codificó una transformación, como
+        BWT -> MTF -> RLE, así que no sirven para tablas o gráficos por símbolo)
+        """
+        return 'transform_blocks' not in results
+        
+    @staticmethod
+    def encoded_size(text):
+        """Tamaño real del texto en bytes UTF-8"""
+        return len(text.encode('utf-8', 'surrogatepass'))
+        
+    def calculate_statistics(self, text, frequencies, codes, original_bytes=None):
         """
         Calcula todas las estadísticas de compresión
         
+        Los tamaños corresponden al formato de archivo comprimido (FileCodec):
+        datos empaquetados a byte, tabla de códigos serializada y cabecera fija.
+        Las tasas se calculan contra el tamaño UTF-8 real del texto.
+        
         Args:
             text (str): Texto original
             frequencies (dict): Frecuencias de símbolos
             codes (dict): Códigos de símbolos
+            original_bytes (int): Tamaño real de la entrada en bytes (por defecto, el
+                del texto en UTF-8)
             
         Returns:
             dict: Diccionario con todas las estadísticas
         """
-        total_chars = len(text)
+        # Evita un import circular: los algoritmos usan utils
+        from algorithms.file_codec import FileCodec
+        
+        probabilities = self._probabilities(text, frequencies)
+        avg_length = self.calculate_average_length(probabilities, codes)
+        compressed_bits = sum(len(codes[char]) * freq for char, freq in frequencies.items())
+        
+        return self._build_statistics(text, probabilities, avg_length, compressed_bits,
+                                      FileCodec.table_size(codes), FileCodec.HEADER.size,
+                                      original_bytes)
         
-        # Calcular probabilidades
-        probabilities = {}
-        for char, freq in frequencies.items():
-            probabilities[char] = freq / total_chars
+    def calculate_stream_statistics(self, text, frequencies, compressed_bits, table_bytes,
+                                    header_bytes, original_bytes=None, per_symbol=True):
+        """
+        Calcula las estadísticas de un codificador sin tabla de códigos
+        
+        Para codificadores que no asignan un código por símbolo (por ejemplo,
+        el codificador por rango) la longitud promedio es el tamaño real del
+        mensaje dividido por la cantidad de símbolos. Si además el codificador
+        no codifica símbolo a símbolo con un modelo fijo (LZ77 o el rango
+        adaptativo), esa longitud puede quedar por debajo de la entropía de
+        orden cero y la eficiencia no tiene sentido: se informa como None.
+        
+        Args:
+            text (str): Texto original
+            frequencies (dict): Frecuencias de símbolos
+            compressed_bits (int): Tamaño del mensaje codificado en bits
+            table_bytes (int): Bytes del modelo serializado
+            header_bytes (int): Bytes de la cabecera fija
+            original_bytes (int): Tamaño real de la entrada en bytes
+            per_symbol (bool): False si la eficiencia no es comparable (queda en None)
             
-        # Calcular métricas
+        Returns:
+            dict: Las mismas claves que calculate_statistics
+        """
+        probabilities = self._probabilities(text, frequencies)
+        avg_length = compressed_bits / len(text) if text else 0
+        stats = self._build_statistics(text, probabilities, avg_length, compressed_bits,
+                                       table_bytes, header_bytes, original_bytes)
+        if not per_symbol:
+            stats['efficiency'] = None
+        return stats
+        
+    @staticmethod
+    def _probabilities(text, frequencies):
+        total_chars = len(text)
+        return {char: freq / total_chars for char, freq in frequencies.items()}
+        
+    def _build_statistics(self, text, probabilities, avg_length, compressed_bits, table_bytes,
+                          header_bytes, original_bytes):
+        total_chars = len(text)
         entropy = self.calculate_entropy(probabilities)
-        avg_length = self.calculate_average_length(probabilities, codes)
         
-        # Calcular bits
-        original_bits = total_chars * 8  # Asumiendo ASCII
-        compressed_bits = sum(len(codes[char]) * freq for char, freq in frequencies.items())
+        # Tamaños reales
+        if original_bytes is None:
+            original_bytes = self.encoded_size(text)
+        original_bits = original_bytes * 8
+        payload_bytes = (compressed_bits + 7) // 8
+        container_bytes = header_bytes + table_bytes + payload_bytes
         
-        compression_ratio = self.calculate_compression_ratio(original_bits, compressed_bits)
+        compression_ratio = self.calculate_compression_ratio(original_bytes, container_bytes)
         efficiency = self.calculate_efficiency(entropy, avg_length)
         
         return {
             'total_entropy': entropy,
             'avg_length': avg_length,
+            'original_bytes': original_bytes,
             'original_bits': original_bits,
             'compressed_bits': compressed_bits,
+            'payload_bytes': payload_bytes,
+            'table_bytes': table_bytes,
+            'header_bytes': header_bytes,
+            'overhead_bytes': header_bytes + table_bytes,
+            'container_bytes': container_bytes,
             'compression_ratio': compression_ratio,
+            'payload_compression_ratio': self.calculate_compression_ratio(original_bits,
+                                                                          compressed_bits),
             'efficiency': efficiency,
             'total_chars': total_chars
-        }
\ No newline at end of file
+        }
+        
+    def calculate_baselines(self, data):
+        """
+        Comprime la misma entrada con zlib, bz2 y lzma como referencia
+        
+        Args:
+            data (str | bytes): Texto (se codifica en UTF-8) o bytes originales
+            
+        Returns:
+            dict: Nombre -> {'bytes', 'compression_ratio', 'seconds'}
+        """
+        if isinstance(data, str):
+            data = data.encode('utf-8', 'surrogatepass')
+        baselines = {}
+        for name, compress in BASELINES.items():
+            start = time.perf_counter()
+            size = len(compress(data))
+            baselines[name] = {
+                'bytes': size,
+                'compression_ratio': self.calculate_compression_ratio(len(data), size),
+                'seconds': time.perf_counter() - start
+            }
+        return baselines
+        
+    def get_statistics(self, results):
+        """Obtiene las estadísticas de un resultado, calculándolas si no existen"""
+        if results.get('statistics'):
+            return results['statistics']
+        return self.calculate_statistics(
+            results['original_text'], results['frequencies'], results['codes']
+        )
+        
+    def compare_algorithms(self, *results_list):
+        """
+        Compara las métricas principales de varios algoritmos
+        
+        Args:
+            *results_list: Resultados de cada algoritmo (con 'algorithm')
+            
+        Returns:
+            dict: Métrica -> {'values': [valor formateado por resultado],
+                  'winner': nombre del mejor algoritmo}; los valores None (métrica
+                  que no aplica al algoritmo) se muestran como 'N/A' y no compiten
+        """
+        stats_list = [self.get_statistics(results) for results in results_list]
+        labels = [results['algorithm'] for results in results_list]
+        
+        # (nombre, clave, mayor es mejor, formato)
+        metrics = [
+            ('Longitud promedio', 'avg_length', False, '{:.4f}'),
+            ('Eficiencia', 'efficiency', True, '{:.4f}'),
+            ('Bits comprimidos', 'compressed_bits', False, '{}'),
+            ('Bytes totales (con tabla)', 'container_bytes', False, '{}'),
+            ('Tasa de compresión (%)', 'compression_ratio', True, '{:.2f}'),
+        ]
+        
+        comparison = {}
+        for name, key, higher_is_better, fmt in metrics:
+            values = [stats[key] for stats in stats_list]
+            candidates = [value for value in values if value is not None]
+            if candidates:
+                best = max(candidates) if higher_is_better else min(candidates)
+                winner = labels[values.index(best)]
+            else:
+                winner = 'N/A'
+            comparison[name] = {
+                'values': ['N/A' if value is None else fmt.format(value) for value in values],
+                'winner': winner
+            }
+        return comparison
+        
+    def create_detailed_table(self, results):
+        """
+        Crea la tabla detallada por símbolo de un resultado
+        
+        Args:
+            results (dict): Resultados de un algoritmo
+            
+        Returns:
+            list: Filas [símbolo, freq, prob, código, long, info, entropía, bits, l.prom]
+                  ordenadas por frecuencia descendente
+        """
+        frequencies = results['frequencies']
+        codes = results['codes']
+        total = sum(frequencies.values())
+        if total == 0:
+            return []
+        
+        rows = []
+        for char, freq in sorted(frequencies.items(), key=lambda x: x[1], reverse=True):
+            prob = freq / total
+            code = codes.get(char, '')
+            information = math.log2(1 / prob)
+            display_char = {' ': 'ESP', '\n': 'NL', '\t': 'TAB'}.get(char, char)
+            rows.append([
+                display_char,
+                str(freq),
+                f"{prob:.4f}",
+                code,
+                str(len(code)),
+                f"{information:.3f}",
+                f"{prob * information:.4f}",
+                str(freq * len(code)),
+                f"{prob * len(code):.4f}"
+            ])
+        return rows
+        
+    def estimate_statistics(self, text=None, path=None, sample_size=65536, method='strided',
+                            seed=None, confidence=0.95, min_gain=5.0):
+        """
+        Estima entropía y longitudes promedio a partir de una muestra
+        
+        Los intervalos de confianza se calculan con medias por bloque, lo que
+        tiene en cuenta que los símbolos de un mismo bloque están correlacionados.
+        
+        Args:
+            text (str): Texto a estimar (o bien path)
+            path (str): Archivo a estimar; se leen bloques sin cargarlo entero
+            sample_size (int): Símbolos (o bytes, para archivos) a muestrear
+            method (str): 'strided' o 'random' (solo para texto)
+            seed (int): Semilla del muestreo aleatorio
+            confidence (float): Nivel de confianza de los intervalos
+            min_gain (float): Ganancia mínima (%) para considerar que vale la pena comprimir
+            
+        Returns:
+            dict: Estimaciones con intervalos, algoritmo ganador y recomendación
+        """
+        # Evita un import circular: los algoritmos usan utils
+        from algorithms.huffman import HuffmanCoding
+        from algorithms.shannon_fano import ShannonFanoCoding
+        
+        start = time.perf_counter()
+        if path is not None:
+            blocks, sampled_bytes, total_bytes = FrequencyCalculator.sample_file_blocks(
+                path, sample_bytes=sample_size
+            )
+        else:
+            blocks = FrequencyCalculator.sample_blocks(text, sample_size, method, seed=seed)
+            sampled_bytes = sum(len(block.encode('utf-8')) for block in blocks)
+            total_bytes = None
+        
+        blocks = [block for block in blocks if block]
+        frequencies = {}
+        for block in blocks:
+            for char, freq in FrequencyCalculator.calculate_frequencies(block).items():
+                frequencies[char] = frequencies.get(char, 0) + freq
+        sampled_symbols = sum(frequencies.values())
+        if sampled_symbols == 0:
+            return None
+        
+        # Costo por símbolo de cada medida: información y longitud de código
+        probabilities = FrequencyCalculator.calculate_probabilities(frequencies)
+        costs = {
+            'entropy': {char: -math.log2(p) for char, p in probabilities.items()},
+            'huffman_avg_length': {char: len(code) for char, code in
+                                   HuffmanCoding().build_codes(frequencies).items()},
+            'shannon_fano_avg_length': {char: len(code) for char, code in
+                                        ShannonFanoCoding().build_codes(frequencies).items()}
+        }
+        
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        bits_per_symbol = 8 * sampled_bytes / sampled_symbols
+        estimate = {
+            'sampled_symbols': sampled_symbols,
+            'sampled_bytes': sampled_bytes,
+            'blocks': len(blocks),
+            'unique_symbols': len(frequencies),
+            'original_bits_per_symbol': bits_per_symbol,
+            'confidence': confidence
+        }
+        if total_bytes is not None:
+            estimate['total_bytes'] = total_bytes
+            estimate['estimated_symbols'] = round(total_bytes / bits_per_symbol * 8)
+        
+        for name, cost in costs.items():
+            # Media ponderada global y dispersión de las medias por bloque
+            value = sum(cost[char] * freq for char, freq in frequencies.items()) / sampled_symbols
+            block_means = [fmean(cost[char] for char in block) for block in blocks]
+            margin = z * stdev(block_means) / math.sqrt(len(block_means)) if len(block_means) > 1 else 0.0
+            estimate[name] = {'estimate': value, 'low': max(0.0, value - margin), 'high': value + margin}
+        
+        for algorithm in ('huffman', 'shannon_fano'):
+            avg = estimate[f'{algorithm}_avg_length']
+            estimate[f'{algorithm}_compression_ratio'] = {
+                'estimate': self.calculate_compression_ratio(bits_per_symbol, avg['estimate']),
+                'low': self.calculate_compression_ratio(bits_per_symbol, avg['high']),
+                'high': self.calculate_compression_ratio(bits_per_symbol, avg['low'])
+            }
+        
+        winner = ('huffman' if estimate['huffman_avg_length']['estimate'] <=
+                  estimate['shannon_fano_avg_length']['estimate'] else 'shannon_fano')
+        estimate['winner'] = winner
+        # Solo se recomienda comprimir si incluso el extremo pesimista supera la ganancia mínima
+        estimate['worth_compressing'] = estimate[f'{winner}_compression_ratio']['low'] >= min_gain
+        estimate['seconds'] = time.perf_counter() - start
+        return estimate
@@ -0,0 +1,170 @@
+"""
+Utilidad para exportar árboles de codificación
+Escribe los árboles Huffman y Shannon-Fano en formato DOT (Graphviz) o SVG sin usar matplotlib
+"""
+
+from xml.sax.saxutils import escape
+
+
+def _display_char(char):
+    """Representación legible de un símbolo"""
+    return {' ': 'ESP', '\n': 'NL', '\t': 'TAB', '\r': 'CR'}.get(char, char)
+
+
+class TreeExporter:
+    """
+    Exportador de árboles a DOT y SVG
+
+    Los árboles se recorren de forma iterativa como una secuencia de nodos en
+    preorden (diccionarios con id, parent, depth, path, char, freq e is_leaf)
+    y cada nodo se escribe en cuanto se conoce, así que la memoria usada solo
+    depende de la profundidad del árbol y no de su cantidad de nodos.
+    """
+
+    def __init__(self, node_spacing=40, level_height=70, margin=30):
+        self.node_spacing = node_spacing
+        self.level_height = level_height
+        self.margin = margin
+
+    @staticmethod
+    def iter_huffman_nodes(results):
+        """Nodos del árbol Huffman de un resultado, en preorden"""
+        # Importación diferida: algorithms.huffman importa el paquete utils
+        from algorithms.huffman import HuffmanCoding
+        return HuffmanCoding().iter_tree_info(results['tree'])
+
+    @staticmethod
+    def iter_shannon_fano_nodes(results):
+        """Nodos de tree_structure de un resultado Shannon-Fano, en preorden"""
+        frequencies = results.get('frequencies') or {}
+        next_id = 0
+        stack = [(results['tree_structure'], -1, 0, "")]
+        while stack:
+            node, parent, depth, path = stack.pop()
+            node_id = next_id
+            next_id += 1
+            children = node['children']
+            char = node['char']
+            yield {
+                'depth': depth,
+                'char': char,
+                'freq': frequencies.get(char) if char is not None else None,
+                'is_leaf': char is not None and not children,
+                'id': node_id,
+                'parent': parent,
+                'path': path,
+                'child_count': len(children)
+            }
+            for bit in sorted(children, reverse=True):
+                stack.append((children[bit], node_id, depth + 1, path + bit))
+
+    def _node_label(self, info):
+        if info['is_leaf']:
+            label = _display_char(info['char'])
+            if info['freq'] is not None:
+                label += f" ({info['freq']})"
+            return label
+        return str(info['freq']) if info['freq'] is not None else ""
+
+    def export_dot(self, nodes, filename, title="Árbol"):
+        """Escribe un árbol en formato DOT de Graphviz"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f'digraph "{title}" {{\n')
+            f.write('  node [shape=circle, style=filled, fontname="Helvetica"];\n')
+            for info in nodes:
+                label = self._node_label(info).replace('\\', '\\\\').replace('"', '\\"')
+                color = 'lightgreen' if info['is_leaf'] else 'lightblue'
+                f.write(f'  n{info["id"]} [label="{label}", fillcolor={color}];\n')
+                if info['parent'] >= 0:
+                    bit = info['path'][-1]
+                    edge_color = 'red' if bit == '0' else 'blue'
+                    f.write(f'  n{info["parent"]} -> n{info["id"]} '
+                            f'[label="{bit}", color={edge_color}];\n')
+            f.write('}\n')
+
+    def export_svg(self, make_nodes, filename, title="Árbol"):
+        """
+        Escribe un árbol en formato SVG
+
+        Las hojas se ubican de izquierda a derecha en el orden del recorrido y
+        cada nodo interno queda centrado sobre sus hijos. Un nodo interno se
+        escribe cuando se completan sus hijos, por lo que solo se mantiene en
+        memoria la rama que se está recorriendo.
+
+        Args:
+            make_nodes (callable): Devuelve un iterador nuevo de nodos en preorden;
+                se recorre dos veces (dimensiones y dibujo)
+        """
+        leaves = 0
+        max_depth = 0
+        for info in make_nodes():
+            max_depth = max(max_depth, info['depth'])
+            if self._child_count(info) == 0:
+                leaves += 1
+
+        width = 2 * self.margin + max(leaves - 1, 0) * self.node_spacing
+        height = 2 * self.margin + max_depth * self.level_height + 20
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                    f'font-family="Helvetica" font-size="10" text-anchor="middle">\n')
+            f.write(f'<title>{escape(title)}</title>\n')
+
+            # Pila de nodos internos abiertos: [info, [(x, y, bit), ...]]
+            stack = []
+            next_leaf = 0
+            for info in make_nodes():
+                y = self.margin + info['depth'] * self.level_height
+                if self._child_count(info) > 0:
+                    stack.append([info, []])
+                    continue
+
+                x = self.margin + next_leaf * self.node_spacing
+                next_leaf += 1
+                self._write_node(f, info, x, y)
+                finished = (x, y, info['path'][-1:] if info['path'] else "")
+
+                # Cerrar los nodos internos cuyos hijos ya están todos escritos
+                while stack:
+                    stack[-1][1].append(finished)
+                    parent, children = stack[-1]
+                    if len(children) < self._child_count(parent):
+                        break
+                    stack.pop()
+                    px = sum(child[0] for child in children) / len(children)
+                    py = self.margin + parent['depth'] * self.level_height
+                    for cx, cy, bit in children:
+                        color = 'red' if bit == '0' else 'blue'
+                        f.write(f'<line x1="{px:.1f}" y1="{py}" x2="{cx:.1f}" y2="{cy}" '
+                                f'stroke="{color}"/>\n')
+                        f.write(f'<text x="{(px + cx) / 2:.1f}" y="{(py + cy) / 2:.1f}" '
+                                f'fill="{color}">{bit}</text>\n')
+                    self._write_node(f, parent, px, py)
+                    finished = (px, py, parent['path'][-1:] if parent['path'] else "")
+            f.write('</svg>\n')
+
+    def _child_count(self, info):
+        return info.get('child_count', 0 if info['is_leaf'] else 2)
+
+    def _write_node(self, f, info, x, y):
+        color = 'lightgreen' if info['is_leaf'] else 'lightblue'
+        f.write(f'<circle cx="{x:.1f}" cy="{y}" r="12" fill="{color}" stroke="black"/>\n')
+        label = self._node_label(info)
+        if label:
+            f.write(f'<text x="{x:.1f}" y="{y + 24}">{escape(label)}</text>\n')
+
+    def export_huffman(self, results, filename):
+        """Exporta el árbol Huffman; el formato se elige por la extensión (.dot o .svg)"""
+        if filename.lower().endswith('.svg'):
+            self.export_svg(lambda: self.iter_huffman_nodes(results), filename, "Árbol de Huffman")
+        else:
+            self.export_dot(self.iter_huffman_nodes(results), filename, "Árbol de Huffman")
+
+    def export_shannon_fano(self, results, filename):
+        """Exporta el árbol Shannon-Fano; el formato se elige por la extensión (.dot o .svg)"""
+        if filename.lower().endswith('.svg'):
+            self.export_svg(lambda: self.iter_shannon_fano_nodes(results), filename,
+                            "Árbol de Shannon-Fano")
+        else:
+            self.export_dot(self.iter_shannon_fano_nodes(results), filename,
+                            "Árbol de Shannon-Fano")
@@ -3,202 +3,255 @@ Utilidad para visualización de árboles de codificación
 Crea representaciones gráficas de los árboles Huffman y Shannon-Fano
 """
 
+import hashlib
+from collections import OrderedDict
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from matplotlib.figure import Figure
 import numpy as np
 
 class TreeVisualizer:
-    """Visualizador de árboles de codificación"""
-    
+    """
+    Visualizador de árboles de codificación
+
+    La disposición de cada árbol (posiciones, etiquetas y aristas) se guarda en
+    una caché compartida según la huella de su tabla de códigos, así que volver
+    a procesar el mismo texto o redibujar la pestaña no la recalcula.
+    """
+
+    LAYOUT_CACHE_SIZE = 16
+    _layout_cache = OrderedDict()
+
     def __init__(self):
         self.node_radius = 0.3
         self.level_height = 1.5
         self.node_spacing = 1.0
-        
-    def visualize_huffman_tree(self, root):
-        """Visualiza el árbol de Huffman"""
-        if not root:
-            fig, ax = plt.subplots(figsize=(10, 8))
-            ax.text(0.5, 0.5, 'No hay árbol para visualizar', 
-                   ha='center', va='center', transform=ax.transAxes)
-            return fig
-            
-        # Calcular posiciones de nodos
-        positions = {}
-        self._calculate_positions_huffman(root, positions, 0, 0, 8)
-        
-        # Crear figura
+
+    @staticmethod
+    def _display_char(char):
+        """Nombre visible de los caracteres en blanco"""
+        return {' ': 'ESP', '\n': 'NL', '\t': 'TAB'}.get(char, char)
+
+    @staticmethod
+    def huffman_hash(tree):
+        """Huella de un HuffmanTree (estructura, símbolos y frecuencias)"""
+        digest = hashlib.sha1(b'huffman\0')
+        for values in (tree.left, tree.right, tree.symbol, tree.freq):
+            digest.update(values.tobytes())
+        digest.update("\0".join(tree.alphabet).encode('utf-8', 'surrogatepass'))
+        digest.update(str(tree.root).encode('ascii'))
+        return digest.hexdigest()
+
+    @staticmethod
+    def codes_hash(codes):
+        """Huella de una tabla de códigos"""
+        digest = hashlib.sha1(b'codes\0')
+        for char, code in sorted(codes.items()):
+            digest.update(f"{char}\0{code}\0".encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    @classmethod
+    def _cached_layout(cls, key, build):
+        """Devuelve la disposición de key, calculándola con build() si no está en caché"""
+        cache = cls._layout_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+        layout = build()
+        layout['key'] = key
+        cache[key] = layout
+        if len(cache) > cls.LAYOUT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return layout
+
+    def huffman_layout(self, tree):
+        """
+        Disposición del árbol de Huffman (forma compacta HuffmanTree)
+
+        Returns:
+            dict: nodes [(x, y, etiqueta, color)], edges [(x0, y0, x1, y1, bit)],
+                  children {nodo: {bit: (hijo, arista)}} con la raíz en el nodo 0,
+                  title, internal_color y key (huella de la tabla)
+        """
+        return self._cached_layout(self.huffman_hash(tree),
+                                   lambda: self._build_huffman_layout(tree))
+
+    def _build_huffman_layout(self, tree):
+        positions = self._calculate_positions_huffman(tree, 0, 0, 8)
+        layout = self._empty_layout('Árbol de Huffman', 'lightblue')
+        stack = [(tree.root, None, None)]
+        while stack:
+            node, parent, bit = stack.pop()
+            x, y = positions[node]
+            char = tree.char(node)
+            if char is not None:
+                label, color = f"{self._display_char(char)}\n({tree.freq[node]})", 'lightgreen'
+            else:
+                label, color = f"{tree.freq[node]}", layout['internal_color']
+            index = self._add_node(layout, x, y, label, color, parent, bit)
+            if not tree.is_leaf(node):
+                stack.append((tree.right[node], index, '1'))
+                stack.append((tree.left[node], index, '0'))
+        return layout
+
+    def shannon_fano_layout(self, codes):
+        """Disposición del árbol de Shannon-Fano a partir de sus códigos (ver huffman_layout)"""
+        return self._cached_layout(self.codes_hash(codes),
+                                   lambda: self._build_shannon_fano_layout(codes))
+
+    def _build_shannon_fano_layout(self, codes):
+        layout = self._empty_layout('Árbol de Shannon-Fano', 'lightcoral')
+        stack = [(self._build_tree_from_codes(codes), 0, 0, 8, None, None)]
+        while stack:
+            node, x, y, width, parent, bit = stack.pop()
+            char = node['char']
+            if char is not None:
+                label, color = self._display_char(char), 'lightgreen'
+            else:
+                label, color = "", layout['internal_color']
+            index = self._add_node(layout, x, y, label, color, parent, bit)
+            child_width = width / 2
+            for child_bit in sorted(node['children'], reverse=True):
+                offset = -child_width / 2 if child_bit == '0' else child_width / 2
+                stack.append((node['children'][child_bit], x + offset, y - self.level_height,
+                              child_width, index, child_bit))
+        return layout
+
+    @staticmethod
+    def _empty_layout(title, internal_color):
+        return {'nodes': [], 'edges': [], 'children': {}, 'title': title,
+                'internal_color': internal_color}
+
+    @staticmethod
+    def _add_node(layout, x, y, label, color, parent, bit):
+        """Agrega un nodo y la arista desde su padre; devuelve el índice del nodo"""
+        index = len(layout['nodes'])
+        layout['nodes'].append((x, y, label, color))
+        if parent is not None:
+            px, py = layout['nodes'][parent][:2]
+            layout['children'].setdefault(parent, {})[bit] = (index, len(layout['edges']))
+            layout['edges'].append((px, py, x, y, bit))
+        return index
+
+    @staticmethod
+    def path(layout, bits):
+        """
+        Recorrido de unos bits desde la raíz
+
+        Returns:
+            tuple: (segmentos [((x0, y0), (x1, y1))], puntos [(x, y)] de los nodos
+                   visitados, incluida la raíz). Se detiene si los bits salen del árbol.
+        """
+        nodes = layout['nodes']
+        if not nodes:
+            return [], []
+        node = 0
+        points = [nodes[0][:2]]
+        segments = []
+        for bit in bits:
+            child = layout['children'].get(node, {}).get(bit)
+            if child is None:
+                break
+            node = child[0]
+            segments.append((points[-1], nodes[node][:2]))
+            points.append(nodes[node][:2])
+        return segments, points
+
+    def layout_figure(self, layout):
+        """Dibuja una disposición de huffman_layout() o shannon_fano_layout()"""
         fig, ax = plt.subplots(figsize=(14, 10))
-        
+
         # Dibujar conexiones primero
-        self._draw_connections_huffman(ax, root, positions)
-        
+        self._draw_edges(ax, layout)
+
         # Dibujar nodos
-        self._draw_nodes_huffman(ax, root, positions)
-        
+        self._draw_nodes(ax, layout)
+
         # Configurar ejes
         ax.set_xlim(-10, 10)
         ax.set_ylim(-8, 2)
         ax.set_aspect('equal')
         ax.axis('off')
-        ax.set_title('Árbol de Huffman', fontsize=16, fontweight='bold', pad=20)
-        
+        ax.set_title(layout['title'], fontsize=16, fontweight='bold', pad=20)
+
         # Agregar leyenda
+        internal_color = layout['internal_color']
         legend_elements = [
-            plt.Line2D([0], [0], marker='o', color='lightblue', 
-                      markerfacecolor='lightblue', markersize=10, 
+            plt.Line2D([0], [0], marker='o', color=internal_color,
+                      markerfacecolor=internal_color, markersize=10,
                       label='Nodo interno', linestyle='None'),
-            plt.Line2D([0], [0], marker='o', color='lightgreen', 
-                      markerfacecolor='lightgreen', markersize=10, 
+            plt.Line2D([0], [0], marker='o', color='lightgreen',
+                      markerfacecolor='lightgreen', markersize=10,
                       label='Nodo hoja (símbolo)', linestyle='None'),
-            plt.Line2D([0], [0], color='red', linewidth=2, 
+            plt.Line2D([0], [0], color='red', linewidth=2,
                       label='Enlace "0"'),
-            plt.Line2D([0], [0], color='blue', linewidth=2, 
+            plt.Line2D([0], [0], color='blue', linewidth=2,
                       label='Enlace "1"')
         ]
         ax.legend(handles=legend_elements, loc='upper right')
-        
+
         plt.tight_layout()
         return fig
-    
-    def _calculate_positions_huffman(self, node, positions, x, y, width):
-        """Calcula las posiciones de los nodos del árbol Huffman"""
-        if not node:
-            return
-            
-        positions[id(node)] = (x, y)
-        
-        if node.left or node.right:
-            child_width = width / 2
-            if node.left:
-                self._calculate_positions_huffman(
-                    node.left, positions, x - child_width/2, y - self.level_height, child_width
-                )
-            if node.right:
-                self._calculate_positions_huffman(
-                    node.right, positions, x + child_width/2, y - self.level_height, child_width
-                )
-    
-    def _draw_connections_huffman(self, ax, node, positions):
-        """Dibuja las conexiones del árbol Huffman"""
-        if not node or id(node) not in positions:
-            return
-            
-        x, y = positions[id(node)]
-        
-        if node.left and id(node.left) in positions:
-            x_left, y_left = positions[id(node.left)]
-            ax.plot([x, x_left], [y, y_left], 'r-', linewidth=2, alpha=0.7)
-            # Etiqueta "0"
-            mid_x, mid_y = (x + x_left) / 2, (y + y_left) / 2
-            ax.text(mid_x - 0.1, mid_y + 0.1, '0', fontsize=12, fontweight='bold', 
-                   color='red', ha='center', va='center',
-                   bbox=dict(boxstyle="round,pad=0.1", facecolor='white', alpha=0.8))
-            self._draw_connections_huffman(ax, node.left, positions)
-            
-        if node.right and id(node.right) in positions:
-            x_right, y_right = positions[id(node.right)]
-            ax.plot([x, x_right], [y, y_right], 'b-', linewidth=2, alpha=0.7)
-            # Etiqueta "1"
-            mid_x, mid_y = (x + x_right) / 2, (y + y_right) / 2
-            ax.text(mid_x + 0.1, mid_y + 0.1, '1', fontsize=12, fontweight='bold', 
-                   color='blue', ha='center', va='center',
+
+    def _empty_figure(self, message):
+        fig, ax = plt.subplots(figsize=(10, 8))
+        ax.text(0.5, 0.5, message,
+               ha='center', va='center', transform=ax.transAxes)
+        return fig
+
+    def visualize_huffman_tree(self, tree):
+        """Visualiza el árbol de Huffman (forma compacta HuffmanTree)"""
+        if not tree:
+            return self._empty_figure('No hay árbol para visualizar')
+        return self.layout_figure(self.huffman_layout(tree))
+
+    def _calculate_positions_huffman(self, tree, x, y, width):
+        """Calcula las posiciones de los nodos del árbol Huffman (una por índice de nodo)"""
+        positions = [None] * len(tree)
+        stack = [(tree.root, x, y, width)]
+        while stack:
+            node, x, y, width = stack.pop()
+            positions[node] = (x, y)
+
+            if not tree.is_leaf(node):
+                child_width = width / 2
+                child_y = y - self.level_height
+                stack.append((tree.left[node], x - child_width/2, child_y, child_width))
+                stack.append((tree.right[node], x + child_width/2, child_y, child_width))
+        return positions
+
+    def _draw_edges(self, ax, layout):
+        """Dibuja las aristas con la etiqueta de su bit"""
+        for x, y, x_child, y_child, bit in layout['edges']:
+            color = 'red' if bit == '0' else 'blue'
+            ax.plot([x, x_child], [y, y_child], color=color, linewidth=2, alpha=0.7)
+            mid_x, mid_y = (x + x_child) / 2, (y + y_child) / 2
+            shift = -0.1 if bit == '0' else 0.1
+            ax.text(mid_x + shift, mid_y + 0.1, bit, fontsize=12, fontweight='bold',
+                   color=color, ha='center', va='center',
                    bbox=dict(boxstyle="round,pad=0.1", facecolor='white', alpha=0.8))
-            self._draw_connections_huffman(ax, node.right, positions)
-    
-    def _draw_nodes_huffman(self, ax, node, positions):
-        """Dibuja los nodos del árbol Huffman"""
-        if not node or id(node) not in positions:
-            return
-            
-        x, y = positions[id(node)]
-        
-        # Determinar color y etiqueta
-        if node.char is not None:
-            # Nodo hoja
-            color = 'lightgreen'
-            display_char = node.char
-            if node.char == ' ':
-                display_char = 'ESP'
-            elif node.char == '\n':
-                display_char = 'NL'
-            elif node.char == '\t':
-                display_char = 'TAB'
-            label = f"{display_char}\n({node.freq})"
-        else:
-            # Nodo interno
-            color = 'lightblue'
-            label = f"{node.freq}"
-        
-        # Dibujar círculo
-        circle = plt.Circle((x, y), self.node_radius, color=color, 
-                          ec='black', linewidth=2, zorder=3)
-        ax.add_patch(circle)
-        
-        # Agregar texto
-        ax.text(x, y, label, ha='center', va='center', fontsize=10, 
-               fontweight='bold', zorder=4)
-        
-        # Recursión para hijos
-        if node.left:
-            self._draw_nodes_huffman(ax, node.left, positions)
-        if node.right:
-            self._draw_nodes_huffman(ax, node.right, positions)
-    
+
+    def _draw_nodes(self, ax, layout):
+        """Dibuja los nodos con su etiqueta"""
+        for x, y, label, color in layout['nodes']:
+            circle = plt.Circle((x, y), self.node_radius, color=color,
+                              ec='black', linewidth=2, zorder=3)
+            ax.add_patch(circle)
+            if label:
+                ax.text(x, y, label, ha='center', va='center', fontsize=10,
+                       fontweight='bold', zorder=4)
+
     def visualize_shannon_fano_tree(self, results):
         """Visualiza el árbol de Shannon-Fano"""
         if not results or 'codes' not in results:
-            fig, ax = plt.subplots(figsize=(10, 8))
-            ax.text(0.5, 0.5, 'No hay datos para visualizar', 
-                   ha='center', va='center', transform=ax.transAxes)
-            return fig
-        
-        # Construir árbol a partir de los códigos
-        tree_structure = self._build_tree_from_codes(results['codes'])
-        
-        # Crear figura
-        fig, ax = plt.subplots(figsize=(14, 10))
-        
-        # Calcular posiciones
-        positions = {}
-        self._calculate_positions_sf(tree_structure, positions, 0, 0, 8, 0)
-        
-        # Dibujar conexiones
-        self._draw_connections_sf(ax, tree_structure, positions)
-        
-        # Dibujar nodos
-        self._draw_nodes_sf(ax, tree_structure, positions)
-        
-        # Configurar ejes
-        ax.set_xlim(-10, 10)
-        ax.set_ylim(-8, 2)
-        ax.set_aspect('equal')
-        ax.axis('off')
-        ax.set_title('Árbol de Shannon-Fano', fontsize=16, fontweight='bold', pad=20)
-        
-        # Agregar leyenda
-        legend_elements = [
-            plt.Line2D([0], [0], marker='o', color='lightcoral', 
-                      markerfacecolor='lightcoral', markersize=10, 
-                      label='Nodo interno', linestyle='None'),
-            plt.Line2D([0], [0], marker='o', color='lightgreen', 
-                      markerfacecolor='lightgreen', markersize=10, 
-                      label='Nodo hoja (símbolo)', linestyle='None'),
-            plt.Line2D([0], [0], color='red', linewidth=2, 
-                      label='Enlace "0"'),
-            plt.Line2D([0], [0], color='blue', linewidth=2, 
-                      label='Enlace "1"')
-        ]
-        ax.legend(handles=legend_elements, loc='upper right')
-        
-        plt.tight_layout()
-        return fig
-    
+            return self._empty_figure('No hay datos para visualizar')
+        return self.layout_figure(self.shannon_fano_layout(results['codes']))
+
     def _build_tree_from_codes(self, codes):
         """Construye un árbol a partir de los códigos de Shannon-Fano"""
         root = {'char': None, 'children': {}}
-        
+
         for char, code in codes.items():
             current = root
             for bit in code:
@@ -206,86 +259,5 @@ class TreeVisualizer:
                     current['children'][bit] = {'char': None, 'children': {}}
                 current = current['children'][bit]
             current['char'] = char
-            
+
         return root
-    
-    def _calculate_positions_sf(self, node, positions, x, y, width, node_id):
-        """Calcula las posiciones de los nodos del árbol Shannon-Fano"""
-        positions[node_id] = (x, y, node)
-        
-        children = list(node['children'].items())
-        if len(children) == 2:
-            child_width = width / 2
-            left_bit, left_child = children[0]
-            right_bit, right_child = children[1]
-            
-            left_id = node_id * 2 + 1
-            right_id = node_id * 2 + 2
-            
-            self._calculate_positions_sf(
-                left_child, positions, x - child_width/2, y - self.level_height, 
-                child_width, left_id
-            )
-            self._calculate_positions_sf(
-                right_child, positions, x + child_width/2, y - self.level_height, 
-                child_width, right_id
-            )
-    
-    def _draw_connections_sf(self, ax, node, positions):
-        """Dibuja las conexiones del árbol Shannon-Fano"""
-        for node_id, (x, y, current_node) in positions.items():
-            children = list(current_node['children'].items())
-            
-            if len(children) >= 1:
-                left_bit, left_child = children[0]
-                left_id = node_id * 2 + 1
-                if left_id in positions:
-                    x_left, y_left, _ = positions[left_id]
-                    ax.plot([x, x_left], [y, y_left], 'r-', linewidth=2, alpha=0.7)
-                    # Etiqueta
-                    mid_x, mid_y = (x + x_left) / 2, (y + y_left) / 2
-                    ax.text(mid_x - 0.1, mid_y + 0.1, left_bit, fontsize=12, 
-                           fontweight='bold', color='red', ha='center', va='center',
-                           bbox=dict(boxstyle="round,pad=0.1", facecolor='white', alpha=0.8))
-            
-            if len(children) >= 2:
-                right_bit, right_child = children[1]
-                right_id = node_id * 2 + 2
-                if right_id in positions:
-                    x_right, y_right, _ = positions[right_id]
-                    ax.plot([x, x_right], [y, y_right], 'b-', linewidth=2, alpha=0.7)
-                    # Etiqueta
-                    mid_x, mid_y = (x + x_right) / 2, (y + y_right) / 2
-                    ax.text(mid_x + 0.1, mid_y + 0.1, right_bit, fontsize=12, 
-                           fontweight='bold', color='blue', ha='center', va='center',
-                           bbox=dict(boxstyle="round,pad=0.1", facecolor='white', alpha=0.8))
-    
-    def _draw_nodes_sf(self, ax, node, positions):
-        """Dibuja los nodos del árbol Shannon-Fano"""
-        for node_id, (x, y, current_node) in positions.items():
-            # Determinar color y etiqueta
-            if current_node['char'] is not None:
-                # Nodo hoja
-                color = 'lightgreen'
-                display_char = current_node['char']
-                if current_node['char'] == ' ':
-                    display_char = 'ESP'
-                elif current_node['char'] == '\n':
-                    display_char = 'NL'
-                elif current_node['char'] == '\t':
-                    display_char = 'TAB'
-                label = display_char
-            else:
-                # Nodo interno
-                color = 'lightcoral'
-                label = ""
-            
-            # Dibujar círculo
-            circle = plt.Circle((x, y), self.node_radius, color=color, 
-                              ec='black', linewidth=2, zorder=3)
-            ax.add_patch(circle)
-            
-            # Agregar texto
-            if label:
-                ax.text(x, y, label, ha='center', va='center', fontsize=10, 
-                       fontweight='bold', zorder=4)
@@ -3,69 +3,152 @@ Utilidad para visualización de datos
 Genera gráficos usando matplotlib para mostrar resultados de compresión
 """
 
+import hashlib
+import io
+import math
+from collections import OrderedDict
+
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.figure import Figure
 
+from utils.statistics import StatisticsCalculator
+
+# Colores por algoritmo (se repiten si hay más algoritmos)
+SERIES_COLORS = ['lightblue', 'lightgreen', 'salmon', 'khaki', 'plum', 'lightgrey']
+
 class DataVisualizer:
     """Generador de visualizaciones para datos de compresión"""
     
-    def __init__(self):
+    def __init__(self, top_k=20, label_threshold=30, cache_size=8):
+        """
+        Args:
+            top_k (int): Símbolos mostrados individualmente; el resto se agrupa en "Otros"
+            label_threshold (int): Máximo de barras para dibujar etiquetas de valor
+            cache_size (int): Cantidad de imágenes renderizadas que se conservan
+        """
         plt.style.use('default')
+        self.top_k = top_k
+        self.label_threshold = label_threshold
+        self.cache_size = cache_size
+        self._image_cache = OrderedDict()
+        
+    @staticmethod
+    def table_hash(*results_list):
+        """Huella de las frecuencias y tablas de códigos de uno o más resultados"""
+        digest = hashlib.sha1()
+        for results in results_list:
+            digest.update(results['algorithm'].encode('utf-8'))
+            frequencies = results.get('frequencies') or {}
+            for char, code in sorted((results.get('codes') or {}).items()):
+                digest.update(f"{char}\0{code}\0{frequencies.get(char, 0)}\0".encode('utf-8'))
+            statistics = results.get('statistics')
+            if statistics:
+                digest.update(repr(statistics.get('compressed_bits')).encode('utf-8'))
+        return digest.hexdigest()
+        
+    def render_comparison_image(self, *results_list, dpi=80):
+        """
+        Devuelve los gráficos de comparación como imagen PNG
+        
+        La imagen se guarda en caché según la huella de las tablas de códigos,
+        de modo que volver a mostrarla (cambio de pestaña, redimensionado o un
+        nuevo procesamiento del mismo texto) no vuelve a dibujar los gráficos.
+        
+        Returns:
+            bytes: Imagen PNG
+        """
+        key = (self.table_hash(*results_list), dpi)
+        if key in self._image_cache:
+            self._image_cache.move_to_end(key)
+            return self._image_cache[key]
+        
+        fig = self.create_comparison_charts(*results_list)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi)
+        image = buffer.getvalue()
         
-    def create_comparison_charts(self, huffman_results, shannon_results):
+        self._image_cache[key] = image
+        if len(self._image_cache) > self.cache_size:
+            self._image_cache.popitem(last=False)
+        return image
+        
+    def _label_bars(self, ax, bars, values, fmt='{}'):
+        """Agrega etiquetas de valor solo si la cantidad de barras es legible"""
+        if len(bars) > self.label_threshold:
+            return
+        for bar, value in zip(bars, values):
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height,
+                   fmt.format(value), ha='center', va='bottom')
+        
+    def create_comparison_charts(self, *results_list):
         """
-        Crea gráficos de comparación entre Huffman y Shannon-Fano
+        Crea gráficos de comparación entre varios algoritmos
+        
+        Incluye las frecuencias, las longitudes de código de cada algoritmo que
+        tenga tabla de códigos y tres gráficos comparativos de estadísticas.
         
         Args:
-            huffman_results (dict): Resultados de Huffman
-            shannon_results (dict): Resultados de Shannon-Fano
+            *results_list: Resultados de cada algoritmo (con 'statistics')
             
         Returns:
             Figure: Figura de matplotlib con los gráficos
         """
-        fig = Figure(figsize=(15, 10))
-        
-        # Gráfico 1: Comparación de frecuencias
-        ax1 = fig.add_subplot(2, 3, 1)
-        self.plot_frequencies(ax1, huffman_results['frequencies'])
-        ax1.set_title('Frecuencias de Símbolos')
-        
-        # Gráfico 2: Longitudes de código Huffman
-        ax2 = fig.add_subplot(2, 3, 2)
-        self.plot_code_lengths(ax2, huffman_results['codes'], 'Huffman')
-        ax2.set_title('Longitudes de Código - Huffman')
-        
-        # Gráfico 3: Longitudes de código Shannon-Fano
-        ax3 = fig.add_subplot(2, 3, 3)
-        self.plot_code_lengths(ax3, shannon_results['codes'], 'Shannon-Fano')
-        ax3.set_title('Longitudes de Código - Shannon-Fano')
-        
-        # Gráfico 4: Comparación de estadísticas
-        ax4 = fig.add_subplot(2, 3, 4)
-        self.plot_statistics_comparison(ax4, huffman_results['statistics'], shannon_results['statistics'])
-        ax4.set_title('Comparación de Estadísticas')
-        
-        # Gráfico 5: Eficiencia vs Entropía
-        ax5 = fig.add_subplot(2, 3, 5)
-        self.plot_efficiency_entropy(ax5, huffman_results['statistics'], shannon_results['statistics'])
-        ax5.set_title('Eficiencia vs Entropía')
-        
-        # Gráfico 6: Tasa de compresión
-        ax6 = fig.add_subplot(2, 3, 6)
-        self.plot_compression_ratio(ax6, huffman_results['statistics'], shannon_results['statistics'])
-        ax6.set_title('Tasa de Compresión')
+        # Las longitudes por símbolo solo se comparan sobre los símbolos del texto original
+        source_results = [results for results in results_list
+                          if StatisticsCalculator.describes_source(results)]
+        with_codes = [results for results in source_results if results.get('codes')]
+        frequencies = next((results['frequencies'] for results in source_results
+                            if results.get('frequencies')), {})
+        stats_by_label = {results['algorithm']: results['statistics'] for results in results_list}
+        
+        columns = 3
+        rows = math.ceil((4 + len(with_codes)) / columns)
+        fig = Figure(figsize=(15, 5 * rows))
+        position = iter(range(1, rows * columns + 1))
+        
+        # Frecuencias de símbolos
+        ax = fig.add_subplot(rows, columns, next(position))
+        self.plot_frequencies(ax, frequencies)
+        ax.set_title('Frecuencias de Símbolos')
+        
+        # Longitudes de código por algoritmo
+        for results in with_codes:
+            ax = fig.add_subplot(rows, columns, next(position))
+            self.plot_code_lengths(ax, results['codes'], results['algorithm'], frequencies)
+            ax.set_title(f"Longitudes de Código - {results['algorithm']}")
+        
+        # Comparación de estadísticas
+        ax = fig.add_subplot(rows, columns, next(position))
+        self.plot_statistics_comparison(ax, stats_by_label)
+        ax.set_title('Comparación de Estadísticas')
+        
+        # Eficiencia vs Entropía
+        ax = fig.add_subplot(rows, columns, next(position))
+        self.plot_efficiency_entropy(ax, stats_by_label)
+        ax.set_title('Eficiencia vs Entropía')
+        
+        # Tasa de compresión
+        ax = fig.add_subplot(rows, columns, next(position))
+        self.plot_compression_ratio(ax, stats_by_label)
+        ax.set_title('Tasa de Compresión')
         
         fig.tight_layout()
         return fig
         
     def plot_frequencies(self, ax, frequencies):
-        """Gráfico de barras de frecuencias"""
-        chars = list(frequencies.keys())
-        freqs = list(frequencies.values())
+        """Gráfico de barras de los top-K símbolos más un grupo "Otros" """
+        top = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
+        others = sum(freq for _, freq in top[self.top_k:])
+        top = top[:self.top_k]
         
         # Reemplazar espacios para mejor visualización
-        display_chars = [char if char != ' ' else 'ESP' for char in chars]
+        display_chars = [char if char != ' ' else 'ESP' for char, _ in top]
+        freqs = [freq for _, freq in top]
+        if others:
+            display_chars.append('Otros')
+            freqs.append(others)
         
         bars = ax.bar(display_chars, freqs, color='skyblue', edgecolor='navy')
         ax.set_xlabel('Símbolos')
@@ -73,15 +156,33 @@ class DataVisualizer:
         ax.tick_params(axis='x', rotation=45)
         
         # Agregar valores en las barras
-        for bar, freq in zip(bars, freqs):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{freq}', ha='center', va='bottom')
+        self._label_bars(ax, bars, freqs)
                    
-    def plot_code_lengths(self, ax, codes, algorithm_name):
-        """Gráfico de longitudes de código"""
+    def plot_code_lengths(self, ax, codes, algorithm_name, frequencies=None):
+        """
+        Gráfico de longitudes de código
+        
+        Con alfabetos de hasta top_k símbolos se muestra una barra por símbolo;
+        con más, un histograma de cuántos símbolos tienen cada longitud.
+        """
+        if len(codes) > self.top_k:
+            histogram = {}
+            for code in codes.values():
+                histogram[len(code)] = histogram.get(len(code), 0) + 1
+            lengths = sorted(histogram)
+            counts = [histogram[length] for length in lengths]
+            
+            bars = ax.bar([str(length) for length in lengths], counts,
+                          color='lightcoral', edgecolor='darkred')
+            ax.set_xlabel('Longitud del Código (bits)')
+            ax.set_ylabel('Cantidad de símbolos')
+            self._label_bars(ax, bars, counts)
+            return
+        
         chars = list(codes.keys())
-        lengths = [len(code) for code in codes.values()]
+        if frequencies:
+            chars.sort(key=lambda char: frequencies.get(char, 0), reverse=True)
+        lengths = [len(codes[char]) for char in chars]
         
         display_chars = [char if char != ' ' else 'ESP' for char in chars]
         
@@ -91,51 +192,47 @@ class DataVisualizer:
         ax.tick_params(axis='x', rotation=45)
         
         # Agregar valores en las barras
-        for bar, length in zip(bars, lengths):
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{length}', ha='center', va='bottom')
+        self._label_bars(ax, bars, lengths)
                    
-    def plot_statistics_comparison(self, ax, huffman_stats, shannon_stats):
-        """Gráfico de comparación de estadísticas"""
+    def plot_statistics_comparison(self, ax, stats_by_label):
+        """Gráfico de comparación de estadísticas (una serie por algoritmo)"""
         metrics = ['Longitud\nPromedio', 'Entropía\nTotal', 'Eficiencia']
-        huffman_values = [
-            huffman_stats['avg_length'],
-            huffman_stats['total_entropy'],
-            huffman_stats['efficiency']
-        ]
-        shannon_values = [
-            shannon_stats['avg_length'],
-            shannon_stats['total_entropy'],
-            shannon_stats['efficiency']
-        ]
+        keys = ['avg_length', 'total_entropy', 'efficiency']
         
         x = np.arange(len(metrics))
-        width = 0.35
+        width = 0.7 / max(len(stats_by_label), 1)
         
-        bars1 = ax.bar(x - width/2, huffman_values, width, label='Huffman', color='lightblue')
-        bars2 = ax.bar(x + width/2, shannon_values, width, label='Shannon-Fano', color='lightgreen')
+        for i, (label, stats) in enumerate(stats_by_label.items()):
+            # Las métricas que no aplican (None) quedan sin barra
+            values = [np.nan if stats[key] is None else stats[key] for key in keys]
+            offset = (i - (len(stats_by_label) - 1) / 2) * width
+            bars = ax.bar(x + offset, values, width, label=label,
+                          color=SERIES_COLORS[i % len(SERIES_COLORS)])
+            # Agregar valores en las barras
+            for bar, value in zip(bars, values):
+                if np.isnan(value):
+                    continue
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height,
+                       f'{height:.3f}', ha='center', va='bottom', fontsize=8)
         
         ax.set_xlabel('Métricas')
         ax.set_ylabel('Valores')
         ax.set_xticks(x)
         ax.set_xticklabels(metrics)
         ax.legend()
-        
-        # Agregar valores en las barras
-        for bars in [bars1, bars2]:
-            for bar in bars:
-                height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height,
-                       f'{height:.3f}', ha='center', va='bottom', fontsize=8)
                        
-    def plot_efficiency_entropy(self, ax, huffman_stats, shannon_stats):
-        """Gráfico de eficiencia vs entropía"""
-        algorithms = ['Huffman', 'Shannon-Fano']
-        efficiencies = [huffman_stats['efficiency'], shannon_stats['efficiency']]
-        entropies = [huffman_stats['total_entropy'], shannon_stats['total_entropy']]
+    def plot_efficiency_entropy(self, ax, stats_by_label):
+        """Gráfico de eficiencia vs entropía (sin los algoritmos sin eficiencia comparable)"""
+        points = [(i, label, stats) for i, (label, stats) in enumerate(stats_by_label.items())
+                  if stats['efficiency'] is not None]
+        algorithms = [label for _, label, _ in points]
+        efficiencies = [stats['efficiency'] for _, _, stats in points]
+        entropies = [stats['total_entropy'] for _, _, stats in points]
         
-        ax.scatter(entropies, efficiencies, s=100, c=['blue', 'green'], alpha=0.7)
+        ax.scatter(entropies, efficiencies, s=100, alpha=0.7,
+                   c=[SERIES_COLORS[i % len(SERIES_COLORS)] for i, _, _ in points],
+                   edgecolors='black')
         
         for i, alg in enumerate(algorithms):
             ax.annotate(alg, (entropies[i], efficiencies[i]), 
@@ -145,16 +242,17 @@ class DataVisualizer:
         ax.set_ylabel('Eficiencia')
         ax.grid(True, alpha=0.3)
         
-    def plot_compression_ratio(self, ax, huffman_stats, shannon_stats):
+    def plot_compression_ratio(self, ax, stats_by_label):
         """Gráfico de tasa de compresión"""
-        algorithms = ['Huffman', 'Shannon-Fano']
-        ratios = [huffman_stats['compression_ratio'], shannon_stats['compression_ratio']]
+        algorithms = list(stats_by_label)
+        ratios = [stats['compression_ratio'] for stats in stats_by_label.values()]
         
-        bars = ax.bar(algorithms, ratios, color=['gold', 'orange'], edgecolor='darkorange')
+        bars = ax.bar(algorithms, ratios, edgecolor='darkorange',
+                      color=[SERIES_COLORS[i % len(SERIES_COLORS)] for i in range(len(algorithms))])
         ax.set_ylabel('Tasa de Compresión (%)')
         
         # Agregar valores en las barras
         for bar, ratio in zip(bars, ratios):
             height = bar.get_height()
             ax.text(bar.get_x() + bar.get_width()/2., height,
-                   f'{ratio:.2f}%', ha='center', va='bottom')
\ No newline at end of file
+                   f'{ratio:.2f}%', ha='center', va='bottom')